@@ -16,21 +16,34 @@
 #    Jemison High School - Huntsville Alabama                              #
 # ------------------------------------------------------------------------ #
 
+from util.startup import startup_timer  # First, so that module import time is accounted for
+
+import signal
 import sys
 import time
 import traceback
 from commands2 import TimedCommandRobot, CommandScheduler
 from commands2.command import Command
-from robot2025.service import RobotService
+from robot2026.service import RobotService
 from typing import Optional
 
 import asyncio
-from robot2025.asyncio_wrapper import initialize, shutdown
-from robot2025.robotcontainer import RobotContainer
+from robot2026 import constants
+from robot2026.asyncio_wrapper import control_thread_settings, initialize, shutdown
+from robot2026.datalog import RobotDataRecorder
+from robot2026.robotcontainer import RobotContainer
+from robot2026.vision import make_config
+from util.command_watchdog import CommandWatchdog
+from util.gc_scheduler import GCScheduler, gc_scheduler
 from util.logging import init_logging
+from util.metrics import histogram
+from util.profiler import LoopProfiler
+from util.telemetry import global_tracer, root_context
+from util.worker_pool import worker_pool
 
 # Setup Logging
 logger = init_logging()
+startup_timer.mark("module import")
 
 """
 The VM is configured to automatically run this class, and to call the functions corresponding to
@@ -53,6 +66,12 @@ class MyRobot(TimedCommandRobot):
         self.container: Optional[RobotContainer] = None
         self.autonomousCommand: Optional[Command] = None
         self.service: Optional[RobotService] = None
+        self.gc: Optional[GCScheduler] = None
+        self.profiler: Optional[LoopProfiler] = None
+        self.watchdog: Optional[CommandWatchdog] = None
+        self.tracer = None
+        self.recorder: Optional[RobotDataRecorder] = None
+        self.loop_time = histogram("robot.loop_time", unit="ms", description="CommandScheduler run time per loop")
 
     # Handle signals to shut down the service
     def handle_signals(self, sig: int, frame) -> None:
@@ -76,7 +95,60 @@ class MyRobot(TimedCommandRobot):
 
         # Instantiate our RobotContainer.  This will perform all our button bindings, and put our
         # autonomous chooser on the dashboard.
-        self.container = RobotContainer()
+        with startup_timer.phase("RobotContainer construction"):
+            args = self.service.args
+            vision = make_config(args.vision, fps=args.vision_fps) if args.vision else None
+            self.container = RobotContainer(sensor_rate=args.sensor_rate, arm_tables=args.arm_tables, vision=vision,
+                                            parallel=args.parallel_tick)
+
+        # AprilTag detection processes, with results delivered on the service's event loop
+        if self.container.robot_vision:
+            self.container.robot_vision.start(self.service.event_loop)
+
+        # Autonomous trajectories are generated (or loaded from cache) on the service thread
+        self.service.submit(self.container.autos.prepare())
+
+        # Optional per-item timing of everything the command scheduler runs
+        if self.service.args.profile:
+            self.profiler = LoopProfiler(capacity=self.service.args.profile_samples)
+            self.profiler.enable(CommandScheduler.getInstance())
+            self.profiler.instrument(self.container.robot_arm, "useOutput")
+            self.profiler.instrument(self.container.robot_arm, "getMeasurement")
+
+            # Subsystem periodic() work moved out of the scheduler is timed by ParallelTick
+            self.container.tick.profile(self.profiler)
+
+            # Dump the profile on demand with 'kill -USR1 <pid>'
+            if hasattr(signal, "SIGUSR1"):
+                signal.signal(signal.SIGUSR1, lambda _sig, _frame: self.profiler.dump(logger.info))
+
+        # Per-command execution budgets
+        if self.service.args.command_watchdog:
+            self.watchdog = CommandWatchdog(constants.CommandConstants.kDefaultBudgetMs,
+                                            strikes=constants.CommandConstants.kStrikes,
+                                            throttle=self.service.args.command_throttle)
+            self.watchdog.enable(CommandScheduler.getInstance())
+
+        # Binary per-loop data log
+        if self.service.args.datalog:
+            self.recorder = RobotDataRecorder(self.container, self.service.args.datalog)
+
+        # Everything created so far lives for the life of the robot
+        self.gc = gc_scheduler()
+        self.gc.freeze()
+
+        # Garbage collection only happens in whatever is left of each loop's time budget. It is its
+        # own callback so that it runs after the whole loop function, including the SmartDashboard
+        # and LiveWindow updates that follow robotPeriodic, and after the scheduler callback
+        self.addPeriodic(self.gc.collect_in_slack, self.getPeriod(), self.kSchedulerOffset + 0.001)
+
+        # Each scheduler tick is its own trace when tracing is enabled
+        self.tracer = global_tracer()
+
+        # Background threads and processes are all started, move the control loop to its own CPUs
+        worker_pool().pin_current("Control", control_thread_settings(self.service.args))
+
+        startup_timer.report(logger.info)
 
     def robotPeriodic(self) -> None:
         """This function is called every 20 ms, no matter the mode. Use this for items like diagnostics
@@ -89,18 +161,50 @@ class MyRobot(TimedCommandRobot):
         # commands, running already-scheduled commands, removing finished or interrupted commands,
         # and running subsystem periodic() methods.  This must be called from the robot's periodic
         # block in order for anything in the Command-based framework to work.
-        CommandScheduler.getInstance().run()
+        self.gc.loop_start()
+        start = time.perf_counter()
+        self.container.captureSensors()
+        if self.tracer:
+            with self.tracer.start_as_current_span("robotPeriodic", context=root_context()):
+                self.container.runSubsystemWork()
+                CommandScheduler.getInstance().run()
+        else:
+            self.container.runSubsystemWork()
+            CommandScheduler.getInstance().run()
+        self.loop_time.record((time.perf_counter() - start) * 1000.0)
+
+        # All motor outputs for this loop go out together
+        self.container.flushOutputs()
+
+        if self.recorder:
+            self.recorder.record()
 
     def disabledInit(self) -> None:
         """This function is called once each time the robot enters Disabled mode."""
         self.container.disablePIDSubsystems()
+        self.gc.on_disabled()
+        logger.info(f"Motor outputs: {self.container.outputs.stats()}")
+        logger.info(f"Thread CPU time: {worker_pool().report()}")
+        if self.container.tick.parallel:
+            logger.info(f"Parallel tick work: {self.container.tick.stats()}")
+
+        # End of a match (or enabled period), get everything recorded onto disk
+        if self.recorder:
+            self.recorder.flush()
+
+        if self.profiler and self.profiler.enabled:
+            self.profiler.dump(logger.info)
+
+        if self.watchdog:
+            self.watchdog.dump(logger.info)
 
     def disabledPeriodic(self) -> None:
         """This function is called periodically when disabled"""
-        pass
+        self.gc.collect_full()
 
     def autonomousInit(self) -> None:
         """This autonomous runs the autonomous command selected by your RobotContainer class."""
+        self.gc.on_enabled()
         self.autonomousCommand = self.container.getAutonomousCommand()
 
         if self.autonomousCommand:
@@ -111,6 +215,8 @@ class MyRobot(TimedCommandRobot):
         pass
 
     def teleopInit(self) -> None:
+        self.gc.on_enabled()
+
         # This makes sure that the autonomous stops running when
         # teleop starts running. If you want the autonomous to
         # continue until interrupted by another command, remove
@@ -123,6 +229,8 @@ class MyRobot(TimedCommandRobot):
         pass
 
     def testInit(self) -> None:
+        self.gc.on_enabled()
+
         # Cancels all running commands at the start of test mode
         CommandScheduler.getInstance().cancelAll()
 
@@ -160,6 +268,10 @@ if __name__ == '__main__':
         sys.exit(1)
 
     finally:
+        if robot.recorder:
+            robot.recorder.close()
+        if robot.container and robot.container.robot_vision:
+            robot.container.robot_vision.close()
         shutdown(robot.service)
 
     sys.exit(0)
@@ -0,0 +1,167 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Lookup tables for the arm's feedforward and motion profiles.
+#
+#   The tables are built once with NumPy and then converted to plain lists. A lookup
+#   is then a few float operations in Python, with no call across to C++ and no
+#   NumPy scalar boxing. The *_many() methods are vectorized versions used to check
+#   the tables against the exact calculations (tests/arm_tables_benchmark_test.py).
+#
+#   FeedforwardTable: ArmFeedforward.calculate(position, velocity) is
+#       kS * sgn(v) + kG * cos(position) + kV * v
+#   Only the gravity term is nonlinear, so only that term is tabulated (over
+#   position). The static and velocity terms are linear and computed exactly.
+#   A 2-D table over velocity would add interpolation error without saving any
+#   work, and could not represent the sgn(v) step at zero velocity.
+#
+#   ProfileTable: the rest-to-rest trapezoidal profile between two positions,
+#   sampled every 'step' seconds and linearly interpolated in time.
+#
+import math
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from wpimath.trajectory import TrapezoidProfile
+
+
+class FeedforwardTable:
+    """ Arm feedforward with the gravity term looked up by position """
+
+    def __init__(self, ks: float, kg: float, kv: float, size: int = 1024,
+                 low: float = -math.pi, high: float = math.pi):
+        self.ks = ks
+        self.kg = kg
+        self.kv = kv
+        self.low = low
+        self.high = high
+
+        self._positions = np.linspace(low, high, size)
+        self._gravity_array = kg * np.cos(self._positions)
+
+        self._gravity = self._gravity_array.tolist()
+        self._scale = (size - 1) / (high - low)
+        self._last = size - 1
+
+    def calculate(self, position: float, velocity: float) -> float:
+        """ Feedforward voltage for a position (radians) and velocity (radians/second) """
+        index = (position - self.low) * self._scale
+        if 0.0 <= index < self._last:
+            i = int(index)
+            g0 = self._gravity[i]
+            gravity = g0 + (self._gravity[i + 1] - g0) * (index - i)
+        else:
+            gravity = self.kg * math.cos(position)
+
+        if velocity > 0.0:
+            static = self.ks
+        elif velocity < 0.0:
+            static = -self.ks
+        else:
+            static = 0.0
+
+        return static + gravity + self.kv * velocity
+
+    def calculate_many(self, positions: np.ndarray, velocities: np.ndarray) -> np.ndarray:
+        """ Vectorized calculate() """
+        positions = np.asarray(positions, dtype=np.float64)
+        velocities = np.asarray(velocities, dtype=np.float64)
+
+        inside = (positions >= self.low) & (positions <= self.high)
+        gravity = np.where(inside,
+                           np.interp(positions, self._positions, self._gravity_array),
+                           self.kg * np.cos(positions))
+
+        return self.ks * np.sign(velocities) + gravity + self.kv * velocities
+
+
+class ProfileTable:
+    """ A rest-to-rest trapezoidal profile from 'start' to 'goal', sampled every 'step' seconds """
+
+    def __init__(self, constraints: TrapezoidProfile.Constraints, start: float, goal: float,
+                 step: float = 0.001):
+        self.start = start
+        self.goal = goal
+        self.step = step
+
+        self._times, positions, velocities = self.generate(constraints.maxVelocity, constraints.maxAcceleration,
+                                                           start, goal, step)
+        self._positions_array = positions
+        self._velocities_array = velocities
+
+        self._positions = positions.tolist()
+        self._velocities = velocities.tolist()
+        self._scale = 1.0 / step
+        self._last = len(self._positions) - 1
+        self.duration = float(self._times[-1])
+
+    @staticmethod
+    def generate(max_velocity: float, max_acceleration: float, start: float, goal: float,
+                 step: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """ Times, positions and velocities of the profile, evaluated in closed form """
+        distance = abs(goal - start)
+        direction = 1.0 if goal >= start else -1.0
+
+        # Triangular when there is not room to reach full speed
+        accel_time = max_velocity / max_acceleration
+        if distance < max_velocity * accel_time:
+            accel_time = math.sqrt(distance / max_acceleration)
+        peak = max_acceleration * accel_time
+        cruise_time = (distance - peak * accel_time) / peak if peak > 0.0 else 0.0
+        total = 2.0 * accel_time + cruise_time
+
+        # Evenly spaced, with the last sample at or just beyond the end of the profile
+        times = np.arange(math.ceil(total / step) + 1) * step
+        t = np.minimum(times, total)
+        decel = np.clip(t - accel_time - cruise_time, 0.0, accel_time)
+        accel = np.minimum(t, accel_time)
+        cruise = np.clip(t - accel_time, 0.0, cruise_time)
+
+        positions = (0.5 * max_acceleration * accel * accel + peak * cruise
+                     + peak * decel - 0.5 * max_acceleration * decel * decel)
+        velocities = max_acceleration * accel - max_acceleration * decel
+
+        return times, start + direction * positions, direction * velocities
+
+    def sample(self, t: float) -> Tuple[float, float]:
+        """ (position, velocity) at 't' seconds into the profile. Holds the goal once complete """
+        index = t * self._scale
+        if index >= self._last:
+            return self.goal, 0.0
+        if index <= 0.0:
+            return self.start, 0.0
+
+        i = int(index)
+        frac = index - i
+        p0 = self._positions[i]
+        v0 = self._velocities[i]
+        return (p0 + (self._positions[i + 1] - p0) * frac,
+                v0 + (self._velocities[i + 1] - v0) * frac)
+
+    def sample_many(self, times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """ Vectorized sample() """
+        times = np.asarray(times, dtype=np.float64)
+        return (np.interp(times, self._times, self._positions_array, left=self.start, right=self.goal),
+                np.interp(times, self._times, self._velocities_array, left=0.0, right=0.0))
+
+
+def build_profile_tables(constraints: TrapezoidProfile.Constraints, goals: Sequence[float],
+                         step: float = 0.001) -> Sequence[ProfileTable]:
+    """ A profile table for every move between each pair of goals """
+    return [ProfileTable(constraints, start, goal, step)
+            for start in goals for goal in goals if start != goal]
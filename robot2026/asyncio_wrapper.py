@@ -21,19 +21,37 @@ import socket
 import sys
 import threading
 import time
-from robot2025.service import RobotService
-from typing import Optional
+from robot2026.service import RobotService
+from typing import Optional, Tuple
 from wpilib import RobotBase
 
 import asyncio
 import logging
+from robot2026 import constants
+from util.asyncio import EVENT_LOOPS, event_loop_init, new_event_loop
 from util.debug import debug_enable
-from util.logging import init_logging
+from util.gc_scheduler import GC_MODES, gc_init
+from util.parallel import PARALLEL_MODES
+from util.logging import init_logging, start_log_queue, stop_log_queue
+from util.startup import startup_timer
+from util.telemetry import telemetry_init
+from util.worker_pool import worker_pool_init
+from util.worker_thread import ThreadSettings, parse_cpus
 from version import VERSION
 
 # Setup Logging
 logger = init_logging()
 
+SERVICE_START_TIMEOUT = 10.0        # Seconds
+
+def cpu_list(spec: str) -> Optional[Tuple[int, ...]]:
+    """ argparse type for CPU lists such as '1' or '0,2-3' """
+    try:
+        return parse_cpus(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"invalid CPU list '{spec}': {e}")
+
+
 def parse_configuration() -> argparse.Namespace:
     parser = argparse.ArgumentParser(add_help=True, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
 
@@ -44,11 +62,90 @@ def parse_configuration() -> argparse.Namespace:
                         help="Output additional information to console")
 
     parser.add_argument("--OpenTelemetry", dest="opentelemetry", required=False, default="",
-                        help="Enable OpenTelemetry. Parameter is OLTP exporter 'hostname:port' such as 'http://localhost:4317'")
+                        help="Enable OpenTelemetry. Parameter is OLTP exporter 'hostname:port' such as 'http://localhost:4317' "
+                             "or 'file:<directory>' to store spans locally for later replay")
 
     parser.add_argument("--sample-rate", dest="sample_rate", required=False, default=1.0, action="store", type=float,
                         help="OpenTelemetry sampling rate. [0.0, 1.0] or 1.0 to specify environment or default always-on sampler. Default: always-on")
 
+    parser.add_argument("--profile", dest="profile", required=False, action="store_true",
+                        help="Profile each subsystem, command and button poll in the scheduler loop")
+
+    parser.add_argument("--profile-samples", dest="profile_samples", required=False, default=1024, type=int,
+                        help="Number of loop-profile samples to keep per profiled item")
+
+    parser.add_argument("--tail-sampling", dest="tail_percentile", required=False, default=0.0, type=float,
+                        help="OpenTelemetry tail sampling. Only export scheduler ticks that overrun, fail or are "
+                             "slower than this latency percentile (e.g. 99.0). 0 disables tail sampling")
+
+    parser.add_argument("--metrics", dest="metrics", required=False, action="store_true",
+                        help="Enable metrics export. Exporters are selected by OTEL_METRICS_EXPORTER "
+                             "('console', 'otlp' and/or 'file:<path>')")
+
+    parser.add_argument("--metrics-interval", dest="metrics_interval", required=False, default=1.0, type=float,
+                        help="Seconds between metrics exports")
+
+    parser.add_argument("--log-queue", dest="log_queue", required=False, action="store_true",
+                        help="Queue log records and format/output them on the RobotService thread instead "
+                             "of the calling thread")
+
+    parser.add_argument("--log-queue-size", dest="log_queue_size", required=False, default=4096, type=int,
+                        help="Queued log records held before new records are dropped")
+
+    parser.add_argument("--datalog", dest="datalog", required=False, default="",
+                        help="Directory to record drive/arm sensors, setpoints and outputs to every loop")
+
+    parser.add_argument("--sensor-rate", dest="sensor_rate", required=False, default=0.0, type=float,
+                        help="Sample the drive and arm encoders at this rate (Hz, e.g. 200) on a separate thread. "
+                             "0 reads them directly from the control loop")
+
+    parser.add_argument("--command-watchdog", dest="command_watchdog", required=False, action="store_true",
+                        help="Time each command's initialize/execute/end against its execution budget and "
+                             "report per-command cost histograms")
+
+    parser.add_argument("--command-throttle", dest="command_throttle", required=False, default=0, type=int,
+                        help="With --command-watchdog, only run a repeat offender's execute() every N ticks "
+                             "until it is back within budget. 0 only reports offenders")
+
+    parser.add_argument("--arm-tables", dest="arm_tables", required=False, action="store_true",
+                        help="Use precomputed lookup tables for the arm feedforward and motion profiles")
+
+    parser.add_argument("--vision", dest="vision", required=False, default="", type=str,
+                        help="AprilTag vision source: 'camera:<device>' or a directory of recorded .pgm frames")
+
+    parser.add_argument("--vision-fps", dest="vision_fps", required=False, default=30.0, type=float,
+                        help="Camera frame rate, or the rate recorded frames are played back at")
+
+    parser.add_argument("--event-loop", dest="event_loop", required=False,
+                        default=os.environ.get("ROBOT_EVENT_LOOP", "auto"), choices=EVENT_LOOPS,
+                        help="Event loop implementation for the service threads. 'auto' uses uvloop if it is "
+                             "installed. May also be set with the ROBOT_EVENT_LOOP environment variable")
+
+    parser.add_argument("--control-cpus", dest="control_cpus", required=False, type=cpu_list,
+                        default=os.environ.get("ROBOT_CONTROL_CPUS", ""),
+                        help="CPUs (e.g. '0') the control loop running the CommandScheduler is pinned to once "
+                             "robotInit completes. Empty returns it to the CPUs the robot started with")
+
+    parser.add_argument("--control-priority", dest="control_priority", required=False, default=0, type=int,
+                        help="SCHED_FIFO real-time priority (1-99) for the control loop. 0 keeps normal scheduling")
+
+    parser.add_argument("--service-cpus", dest="service_cpus", required=False, type=cpu_list,
+                        default=os.environ.get("ROBOT_SERVICE_CPUS", ""),
+                        help="CPUs (e.g. '1') for RobotService and everything started during initialization: "
+                             "log output, telemetry export and vision processes. Empty leaves it to the OS")
+
+    parser.add_argument("--service-nice", dest="service_nice", required=False, default=None, type=int,
+                        help="Nice value for the RobotService thread, e.g. 5 to yield to the control loop")
+
+    parser.add_argument("--parallel-tick", dest="parallel_tick", required=False, default="auto",
+                        choices=PARALLEL_MODES,
+                        help="Run drive odometry and the arm controller in parallel each tick. 'auto' enables "
+                             "it only when running free-threaded Python with the GIL disabled")
+
+    parser.add_argument("--gc-mode", dest="gc_mode", required=False, default="auto", choices=GC_MODES,
+                        help="Garbage collection mode. 'deterministic' freezes startup objects and only collects "
+                             "in spare loop time or while disabled")
+
     cli_args, unknown_args = parser.parse_known_args()
 
     # Pull out simulation from command line and/or base class
@@ -92,18 +189,51 @@ def determine_capabilities(cli_args: argparse.Namespace) -> None:
     print(f"python Just-In-Time compilation is {'enabled, if python executable supports it' if jit else 'disabled'}")
 
 
+def control_thread_settings(args: argparse.Namespace) -> ThreadSettings:
+    """ Affinity and priority for the thread running the CommandScheduler """
+    return ThreadSettings(cpus=args.control_cpus, realtime=args.control_priority or None)
+
+
+def service_thread_settings(args: argparse.Namespace) -> ThreadSettings:
+    """ Affinity and priority for RobotService and other background work """
+    return ThreadSettings(cpus=args.service_cpus, nice=args.service_nice)
+
+
 def initialize() -> RobotService:
     # If environment and appropriate python modules install, support remote debug sessions
     debug_enable()
 
     # Process command line
-    args = parse_configuration()
+    with startup_timer.phase("parse_configuration"):
+        args = parse_configuration()
+        determine_capabilities(args)
+        args.parallel_tick = args.fre_threading if args.parallel_tick == "auto" else args.parallel_tick == "on"
 
     if args.verbose:
         logger.setLevel(logging.INFO)
 
+    # Threads and processes inherit the affinity of the thread that starts them. Until robotInit
+    # completes, the control thread runs on the service CPUs so that the telemetry exporter, sensor
+    # sampler and vision processes started during initialization stay off the control loop's CPUs.
+    service_settings = service_thread_settings(args)
+    worker_pool_init().pin_startup(service_settings.cpus)
+
+    # From here on, logging calls only enqueue. RobotService drains the queue
+    if args.log_queue:
+        start_log_queue(args.log_queue_size)
+
+    # OpenTelemetry (and its gRPC/protobuf dependencies) is only loaded when requested
+    if args.opentelemetry:
+        with startup_timer.phase("telemetry_init"):
+            telemetry_init(args.opentelemetry, sample_rate=args.sample_rate,
+                           service_name=constants.OTEL_SERVICE_NAME, tail_percentile=args.tail_percentile)
+
+    # Garbage collection management. The robot calls into this during its loop
+    gc_init(args.gc_mode)
+
     # Asyncio and worker-thread support
-    loop = asyncio.new_event_loop()
+    event_loop_init(args.event_loop)
+    loop = new_event_loop()
     asyncio.set_event_loop(loop)
 
     # Debugging of asyncio & threading
@@ -120,9 +250,14 @@ def initialize() -> RobotService:
 
     # Start up a background thread that we can run asyncio tasks on
     global worker_thread
-    worker_thread = RobotService(args)
-    worker_thread.start()
-    time.sleep(0)
+    with startup_timer.phase("RobotService start"):
+        worker_thread = RobotService(args, settings=service_settings)
+        worker_pool_init().add(worker_thread)
+        worker_thread.start()
+
+        # The event loop, and everything on_run() sets up, must be there before anyone submits to it
+        if not worker_thread.wait_ready(timeout=SERVICE_START_TIMEOUT):
+            raise RuntimeError("RobotService did not start")
     return worker_thread
 
 
@@ -145,4 +280,7 @@ def shutdown(worker: RobotService) -> None:
             if all(name not in thread.name.lower() for name in allowed_threads):
                 logger.info(f"Thread '{thread.name}' is still running")
 
+    # Output anything still queued directly
+    stop_log_queue()
+
     sys.exit(0)
\ No newline at end of file
@@ -0,0 +1,245 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Autonomous routine registry with a disk cache of generated trajectories.
+#
+#   Trajectory generation is far too slow to do when autonomous starts, so every
+#   registered routine is generated once at robotInit from the RobotService worker
+#   thread (see AutoRoutines.prepare()). Generation and the cache file I/O run in the
+#   loop's default executor so they never block the service event loop. Each result is written to the cache
+#   directory under a hash of its waypoints and the DriveConstants/AutoConstants
+#   constraints, so later boots only have to memory-map the file back in. Changing
+#   any waypoint or constraint changes the hash and the routine is regenerated.
+#
+#   Cache file layout (little endian):
+#       8s  magic    'RBTRAJ01'
+#       Q   count    number of states
+#       count * 7 doubles: t, velocity, acceleration, x, y, heading (radians), curvature
+#
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import commands2
+from wpilib import Timer
+from wpimath.controller import RamseteController
+from wpimath.geometry import Pose2d, Rotation2d, Translation2d
+from wpimath.kinematics import DifferentialDriveKinematics
+from wpimath.trajectory import Trajectory, TrajectoryConfig, TrajectoryGenerator
+
+from robot2026.constants import AutoConstants, DriveConstants
+from robot2026.subsystems.drivesubsystem import DriveSubsystem
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+CACHE_MAGIC = b"RBTRAJ01"
+CACHE_SUFFIX = ".traj"
+
+_HEADER = struct.Struct("<8sQ")
+_STATE_FIELDS = 7
+
+Waypoint = Tuple[float, float, float]       # x (m), y (m), heading (degrees)
+
+
+class AutoRoutine:
+    """ A named path for the drive to follow in autonomous """
+
+    def __init__(self, name: str, start: Waypoint, interior: Sequence[Tuple[float, float]],
+                 end: Waypoint, reversed: bool = False):
+        self.name = name
+        self.start = tuple(start)
+        self.interior = [tuple(point) for point in interior]
+        self.end = tuple(end)
+        self.reversed = reversed
+
+        # Set by AutoRoutines.prepare()
+        self.trajectory: Optional[Trajectory] = None
+
+    def cache_key(self) -> str:
+        """ Hash of everything the generated trajectory depends on """
+        description = {
+            "version": CACHE_VERSION,
+            "start": self.start,
+            "interior": self.interior,
+            "end": self.end,
+            "reversed": self.reversed,
+            "max_speed": AutoConstants.kMaxSpeedMetersPerSecond,
+            "max_acceleration": AutoConstants.kMaxAccelerationMetersPerSecondSquared,
+            "track_width": DriveConstants.kTrackWidthMeters,
+        }
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def generate(self) -> Trajectory:
+        config = TrajectoryConfig(AutoConstants.kMaxSpeedMetersPerSecond,
+                                  AutoConstants.kMaxAccelerationMetersPerSecondSquared)
+        config.setKinematics(DifferentialDriveKinematics(DriveConstants.kTrackWidthMeters))
+        config.setReversed(self.reversed)
+
+        return TrajectoryGenerator.generateTrajectory(
+            Pose2d(self.start[0], self.start[1], Rotation2d.fromDegrees(self.start[2])),
+            [Translation2d(x, y) for x, y in self.interior],
+            Pose2d(self.end[0], self.end[1], Rotation2d.fromDegrees(self.end[2])),
+            config,
+        )
+
+
+def write_trajectory(path: str, trajectory: Trajectory) -> None:
+    """ Write a trajectory cache file. The file is renamed into place once complete """
+    states = trajectory.states()
+    values = []
+    for state in states:
+        pose = state.pose
+        values.extend((state.t, state.velocity, state.acceleration,
+                       pose.X(), pose.Y(), pose.rotation().radians(), state.curvature))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(CACHE_MAGIC, len(states)))
+        f.write(struct.pack(f"<{len(values)}d", *values))
+
+    os.replace(tmp_path, path)
+
+
+def read_trajectory(path: str) -> Trajectory:
+    """ Read a trajectory cache file through a read-only memory map """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, count = _HEADER.unpack_from(mm, 0)
+        if magic != CACHE_MAGIC:
+            raise ValueError(f"{path}: not a trajectory cache file")
+
+        size = _HEADER.size + count * _STATE_FIELDS * 8
+        if len(mm) != size:
+            raise ValueError(f"{path}: expected {size} bytes, found {len(mm)}")
+
+        view = memoryview(mm)[_HEADER.size:].cast("d")
+        try:
+            states = [
+                Trajectory.State(t=view[i], velocity=view[i + 1], acceleration=view[i + 2],
+                                 pose=Pose2d(view[i + 3], view[i + 4], Rotation2d(view[i + 5])),
+                                 curvature=view[i + 6])
+                for i in range(0, count * _STATE_FIELDS, _STATE_FIELDS)
+            ]
+        finally:
+            view.release()
+
+    return Trajectory(states)
+
+
+class FollowTrajectory(commands2.Command):
+    """ Follows a trajectory with a Ramsete controller, starting from its initial pose """
+
+    def __init__(self, drive: DriveSubsystem, trajectory: Trajectory):
+        super().__init__()
+        self.drive = drive
+        self.trajectory = trajectory
+        self.controller = RamseteController(AutoConstants.kRamseteB, AutoConstants.kRamseteZeta)
+        self.kinematics = DifferentialDriveKinematics(DriveConstants.kTrackWidthMeters)
+        self.timer = Timer()
+        self.addRequirements(drive)
+
+    def initialize(self) -> None:
+        self.drive.resetOdometry(self.trajectory.initialPose())
+        self.timer.restart()
+
+    def execute(self) -> None:
+        goal = self.trajectory.sample(self.timer.get())
+        speeds = self.kinematics.toWheelSpeeds(self.controller.calculate(self.drive.getPose(), goal))
+
+        self.drive.tankDrive(speeds.left / AutoConstants.kMaxSpeedMetersPerSecond,
+                             speeds.right / AutoConstants.kMaxSpeedMetersPerSecond)
+
+    def end(self, interrupted: bool) -> None:
+        self.drive.tankDrive(0.0, 0.0)
+
+    def isFinished(self) -> bool:
+        return self.timer.hasElapsed(self.trajectory.totalTime())
+
+
+class AutoRoutines:
+    """ The autonomous routines and their (cached) trajectories """
+
+    def __init__(self, drive: DriveSubsystem, cache_dir: str = AutoConstants.kTrajectoryCacheDir):
+        self._drive = drive
+        self._cache_dir = cache_dir
+        self._routines: Dict[str, AutoRoutine] = {}
+
+    def add(self, routine: AutoRoutine) -> AutoRoutine:
+        self._routines[routine.name] = routine
+        return routine
+
+    def names(self) -> List[str]:
+        return list(self._routines)
+
+    def load(self, routine: AutoRoutine) -> Trajectory:
+        """ Load a routine's trajectory from the cache, generating (and caching) it on a miss """
+        path = os.path.join(self._cache_dir, routine.cache_key() + CACHE_SUFFIX)
+        start = time.perf_counter()
+
+        if os.path.exists(path):
+            try:
+                trajectory = read_trajectory(path)
+                logger.info(f"Auto '{routine.name}': loaded {path} in {(time.perf_counter() - start) * 1000.0:.1f} ms")
+                return trajectory
+
+            except (OSError, ValueError) as e:
+                logger.warning(f"Auto '{routine.name}': discarding unreadable cache file: {e}")
+
+        trajectory = routine.generate()
+        logger.info(f"Auto '{routine.name}': generated in {(time.perf_counter() - start) * 1000.0:.1f} ms")
+
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            write_trajectory(path, trajectory)
+
+        except OSError as e:
+            logger.warning(f"Auto '{routine.name}': unable to cache trajectory: {e}")
+
+        return trajectory
+
+    async def prepare(self) -> None:
+        """
+        Load or generate every routine's trajectory. Run this on the RobotService event loop
+        at robotInit; each load runs in the loop's default executor so log draining, metrics
+        and vision delivery keep running while trajectories are generated.
+        """
+        loop = asyncio.get_running_loop()
+
+        for routine in list(self._routines.values()):
+            try:
+                routine.trajectory = await loop.run_in_executor(None, self.load, routine)
+
+            except Exception as e:  # pylint: disable=broad-except
+                logger.error(f"Auto '{routine.name}': trajectory generation failed: {e}")
+
+    def getCommand(self, name: str) -> commands2.Command:
+        """
+        Get the command that follows the named routine. If its trajectory is not ready
+        yet, nothing is run rather than stalling the control loop to generate it.
+        """
+        routine = self._routines.get(name)
+        if routine is None or routine.trajectory is None:
+            logger.warning(f"Auto '{name}': no trajectory available, autonomous will do nothing")
+            return commands2.cmd.none()
+
+        return FollowTrajectory(self._drive, routine.trajectory)
@@ -59,6 +59,16 @@ class DriveConstants:
     # Assumes the encoders are directly mounted on the wheel shafts
     kEncoderDistancePerPulse = (kWheelDiameterInches * math.pi) / kEncoderCPR
 
+    # Odometry works in meters, the encoders report inches
+    kInchesToMeters = 0.0254
+    kTrackWidthMeters = 0.69
+
+    # Joystick deadband, the same as DifferentialDrive's default
+    kDeadband = 0.02
+
+    # Pose history kept for latency compensation (~5 seconds at 200 Hz)
+    kPoseHistorySize = 1024
+
 
 class ArmConstants:
     # NOTE: Please do NOT use these values on your robot.
@@ -80,11 +90,79 @@ class ArmConstants:
     # measured from the horizontal
     kArmOffsetRads = 0.5
 
+    # Lookup tables (--arm-tables)
+    kFeedforwardTableSize = 1024
+    kProfileTableStepSeconds = 0.001
+    kProfileTableToleranceRads = 0.05     # Max distance from a table's start position to use it
+
 
 class AutoConstants:
     kAutoTimeoutSeconds = 12
     kAutoShootTimeSeconds = 7
 
+    # Trajectory constraints
+    kMaxSpeedMetersPerSecond = 3.0
+    kMaxAccelerationMetersPerSecondSquared = 1.5
+
+    # Ramsete follower gains, in units of meters and seconds
+    kRamseteB = 2.0
+    kRamseteZeta = 0.7
+
+    # Generated trajectories are cached here between boots
+    kTrajectoryCacheDir = os.getenv(
+        "ROBOT_TRAJECTORY_CACHE", default=os.path.expanduser("~/.cache/cyberjagzz/trajectories")
+    )
+
+
+class VisionConstants:
+    # Camera, 8-bit grayscale frames
+    kCameraWidth = 640
+    kCameraHeight = 480
+    kCameraFps = 30.0
+
+    # Camera intrinsics, in pixels. NOTE: Calibrate these for the actual camera
+    kCameraFx = 554.0
+    kCameraFy = 554.0
+    kCameraCx = 320.0
+    kCameraCy = 240.0
+
+    # AprilTags
+    kTagFamily = "tag36h11"
+    kTagSizeMeters = 0.1651
+    kPoseIterations = 50
+
+    # Shared-memory frame ring slots and detector threads
+    kFrameSlots = 4
+    kDetectorThreads = 2
+
+    # Frames of detections kept by the vision subsystem
+    kDetectionHistory = 64
+
+    # Camera mounting relative to the robot center, meters and radians (WPILib
+    # conventions: +x forward, +y left, +yaw counterclockwise, -pitch tilted up)
+    kRobotToCameraX = 0.30
+    kRobotToCameraY = 0.0
+    kRobotToCameraYawRadians = 0.0
+    kCameraPitchRadians = 0.0
+
+    # Detections used for pose estimation
+    kMaxHamming = 0
+    kMaxAmbiguity = 0.2
+
+    # Pose estimator trust in odometry vs vision (x, y standard deviations, meters)
+    # and the number of vision updates kept for late measurements
+    kStateStdDevs = (0.05, 0.05)
+    kVisionStdDevs = (0.5, 0.5)
+    kVisionUpdates = 32
+
+
+class CommandConstants:
+    # Execution budgets, milliseconds per initialize()/execute()/end() call
+    kDefaultBudgetMs = 2.0
+    kDriveBudgetMs = 1.0
+    kArmBudgetMs = 0.5
+    kStrikes = 5            # Consecutive overruns before a command is a repeat offender
+
 
 class OIConstants:
     kDriverControllerPort = 0
@@ -0,0 +1,103 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Per-loop recording of driver inputs, drive and arm sensors, setpoints and outputs
+# for post-match analysis and replay (robot2026.replay). The RobotContainer configuration
+# is stored in the log header metadata under 'container'. Load a log with
+# util.datalog.read_datalog().
+#
+from wpilib import DriverStation
+
+from robot2026 import constants
+from robot2026.robotcontainer import RobotContainer
+from util.datalog import DataLogger, LogSchema
+
+# Driver controller axes recorded for replay (XboxController axis numbers)
+LEFT_Y_AXIS = 1
+RIGHT_TRIGGER_AXIS = 3
+RIGHT_X_AXIS = 4
+
+ROBOT_SCHEMA = LogSchema([
+    ("timestamp", "d"),                 # FPGA time the tick's sensors were captured, seconds
+    ("enabled", "?"),                   # Driver station state
+    ("autonomous", "?"),
+    ("test", "?"),
+    ("driver_left_y", "d"),             # Driver controller
+    ("driver_right_x", "d"),
+    ("driver_right_trigger", "d"),
+    ("driver_buttons", "I"),            # Button bitmask, button 1 is bit 0
+    ("left_distance", "d"),             # Drive encoders, as captured for the tick
+    ("right_distance", "d"),
+    ("left_rate", "d"),
+    ("right_rate", "d"),
+    ("arm_measurement", "d"),           # ArmSubsystem.getMeasurement() for the tick, radians
+    ("arm_setpoint_position", "d"),     # Profiled setpoint passed to useOutput()
+    ("arm_setpoint_velocity", "d"),
+    ("arm_voltage", "d"),               # Voltage commanded by useOutput()
+    ("arm_enabled", "?"),
+    ("left_output", "d"),               # Drive motor outputs [-1, 1]
+    ("right_output", "d"),
+])
+
+
+class RobotDataRecorder:
+    """ Records one ROBOT_SCHEMA record per call to record() """
+
+    def __init__(self, container: RobotContainer, directory: str):
+        self._drive = container.robot_drive
+        self._arm = container.robot_arm
+        self._snapshot = container.snapshot
+        self._logger = DataLogger(directory, ROBOT_SCHEMA, prefix="robot",
+                                  metadata={"container": container.config})
+
+    def record(self) -> None:
+        drive = self._drive
+        arm = self._arm
+        port = constants.OIConstants.kDriverControllerPort
+
+        # Sensors as captured at the start of the tick, the values the controllers used,
+        # so that a replay sees the same inputs as the live loop
+        snapshot = self._snapshot
+        values = snapshot.values
+
+        self._logger.record(
+            snapshot.timestamp,
+            DriverStation.isEnabled(),
+            DriverStation.isAutonomous(),
+            DriverStation.isTest(),
+            DriverStation.getStickAxis(port, LEFT_Y_AXIS),
+            DriverStation.getStickAxis(port, RIGHT_X_AXIS),
+            DriverStation.getStickAxis(port, RIGHT_TRIGGER_AXIS),
+            DriverStation.getStickButtons(port),
+            values[drive.left_distance_channel],
+            values[drive.right_distance_channel],
+            values[drive.left_rate_channel],
+            values[drive.right_rate_channel],
+            values[arm.position_channel] + constants.ArmConstants.kArmOffsetRads,
+            arm.setpoint_position,
+            arm.setpoint_velocity,
+            arm.output_voltage,
+            arm.isEnabled(),
+            drive.left1.get(),
+            drive.right1.get(),
+        )
+
+    def flush(self) -> None:
+        self._logger.flush()
+
+    def close(self) -> None:
+        self._logger.close()
@@ -0,0 +1,94 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Differential-drive odometry with a time-indexed pose history.
+#
+#   Poses are integrated from the left/right wheel distances alone (there is no gyro),
+#   so the heading is continuous and never wraps. Every update is appended to a
+#   SampleRing of (x, y, heading, left, right) so that any consumer can ask for the
+#   pose at an earlier timestamp in O(log n), interpolated between updates, without
+#   recomputing anything.
+#
+#   update() must only be called from one thread (the sensor sampler thread, or the
+#   control loop when there is no sampler). reset() is applied by that thread on its
+#   next update.
+#
+import math
+from typing import Optional
+
+from wpimath.geometry import Pose2d, Rotation2d
+
+from util.sampling import SampleRing
+
+X, Y, HEADING, LEFT, RIGHT = range(5)
+
+
+class DifferentialOdometry:
+    """ Pose tracking from the two drive encoders """
+
+    def __init__(self, track_width: float, capacity: int = 1024):
+        self._track_width = track_width
+        self._x = 0.0
+        self._y = 0.0
+        self._heading = 0.0
+        self._left: Optional[float] = None
+        self._right = 0.0
+        self._pending_reset: Optional[Pose2d] = None
+        self.reset_timestamp = -math.inf        # Time the last reset was applied, history before it is discontinuous
+        self.history = SampleRing("pose", 5, capacity)
+
+    def reset(self, pose: Pose2d = Pose2d()) -> None:
+        """ Restart odometry from 'pose' at the next update """
+        self._pending_reset = pose
+
+    def update(self, timestamp: float, left: float, right: float) -> None:
+        """ Integrate new wheel distances (meters) """
+        if self._pending_reset is not None or self._left is None:
+            pose, self._pending_reset = self._pending_reset or Pose2d(), None
+            self._x, self._y, self._heading = pose.X(), pose.Y(), pose.rotation().radians()
+            self.reset_timestamp = timestamp
+
+        elif left != self._left or right != self._right:
+            delta_left = left - self._left
+            delta_right = right - self._right
+            distance = (delta_left + delta_right) / 2.0
+            delta_heading = (delta_right - delta_left) / self._track_width
+
+            # Second order (midpoint heading) integration of the arc driven since the last update
+            midpoint = self._heading + delta_heading / 2.0
+            self._x += distance * math.cos(midpoint)
+            self._y += distance * math.sin(midpoint)
+            self._heading += delta_heading
+
+        self._left = left
+        self._right = right
+        self.history.append(timestamp, (self._x, self._y, self._heading, left, right))
+
+    def pose(self) -> Pose2d:
+        """ Most recent pose """
+        sample = self.history.latest()
+        if sample is None:
+            return Pose2d()
+        x, y, heading = sample[1][:3]
+        return Pose2d(x, y, Rotation2d(heading))
+
+    def pose_at(self, timestamp: float) -> Optional[Pose2d]:
+        """ Pose at 'timestamp', interpolated from the history. None before the first update """
+        values = self.history.sample_at(timestamp)
+        if values is None:
+            return None
+        return Pose2d(values[X], values[Y], Rotation2d(values[HEADING]))
@@ -0,0 +1,244 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Fuses late vision measurements into the wheel odometry pose.
+#
+#   The odometry keeps its own pose history (DifferentialOdometry.history) and is
+#   never modified. The estimator keeps a short, time-ordered list of vision updates,
+#   each holding the odometry pose and the corrected (estimated) pose at the
+#   measurement's capture time. Any later estimate is the nearest earlier update's
+#   corrected pose with the odometry motion since then applied on top. That motion
+#   (all the odometry deltas in between) comes from two history lookups and one
+#   composition, no matter how many odometry updates there were.
+#
+#   A measurement that arrives late is inserted at its capture timestamp:
+#     - the estimate at that time is found as above and blended with the measurement
+#     - only the vision updates after it (normally none, one at most) are re-applied
+#       on top of the new one
+#   Each update costs O(log n) history lookups plus the few later updates, never a
+#   recomputation from the start.
+#
+#   Vision only corrects x and y. Heading is taken from odometry, which over the
+#   history window is much better than a single tag's rotation estimate.
+#
+#   The newest update from before the odometry history window is kept as an anchor,
+#   it carries its own odometry and estimated poses so it needs no history lookup.
+#   Sightings further apart than the history window therefore still build on the
+#   accumulated correction. Only an odometry reset discards the anchor.
+#
+#   add_vision_measurement() and add_detections() must be called from one thread
+#   (the RobotService event loop). The timestamps and updates are published
+#   together as one tuple, so pose() and pose_at() may be called from any thread.
+#
+import bisect
+import math
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+from wpimath.geometry import Pose2d, Rotation2d
+
+from robot2026.constants import VisionConstants
+from robot2026.odometry import DifferentialOdometry, HEADING, X, Y
+from robot2026.vision import TagDetection
+
+Pose = Tuple[float, float, float]       # x, y (meters), heading (radians)
+
+
+class VisionUpdate(NamedTuple):
+    timestamp: float
+    odometry: Pose              # Odometry pose at 'timestamp'
+    estimate: Pose              # Estimated pose at 'timestamp', with this measurement applied
+    x: float                    # The measurement
+    y: float
+
+
+def _relative(start: Pose, end: Pose) -> Pose:
+    """ Motion from 'start' to 'end', in start's frame """
+    dx = end[0] - start[0]
+    dy = end[1] - start[1]
+    c = math.cos(start[2])
+    s = math.sin(start[2])
+    return c * dx + s * dy, -s * dx + c * dy, end[2] - start[2]
+
+
+def _apply(pose: Pose, motion: Pose) -> Pose:
+    """ 'pose' moved by 'motion' (in pose's frame) """
+    c = math.cos(pose[2])
+    s = math.sin(pose[2])
+    return (pose[0] + c * motion[0] - s * motion[1],
+            pose[1] + s * motion[0] + c * motion[1],
+            pose[2] + motion[2])
+
+
+def _gain(state_std: float, vision_std: float) -> float:
+    """ Steady state Kalman gain for one axis, as used by the WPILib pose estimators """
+    q = state_std * state_std
+    r = vision_std * vision_std
+    return q / (q + math.sqrt(q * r)) if q > 0.0 else 0.0
+
+
+def load_field_tags() -> Dict[int, Tuple[float, float]]:
+    """ Field (x, y) of each AprilTag on this season's field """
+    from robotpy_apriltag import AprilTagField, AprilTagFieldLayout
+
+    layout = AprilTagFieldLayout.loadField(AprilTagField.kDefaultField)
+    return {tag.ID: (tag.pose.X(), tag.pose.Y()) for tag in layout.getTags()}
+
+
+class PoseEstimator:
+    """ Odometry pose with latency compensated vision corrections """
+
+    def __init__(self, odometry: DifferentialOdometry, capacity: int = VisionConstants.kVisionUpdates,
+                 state_std: Tuple[float, float] = VisionConstants.kStateStdDevs,
+                 vision_std: Tuple[float, float] = VisionConstants.kVisionStdDevs):
+        self._odometry = odometry
+        self._capacity = capacity
+        self._gain_x = _gain(state_std[0], vision_std[0])
+        self._gain_y = _gain(state_std[1], vision_std[1])
+
+        # (timestamps, updates), sorted by timestamp. Replaced as a whole, never modified, so
+        # readers that take it once per call need no lock
+        self._state: Tuple[Tuple[float, ...], Tuple[VisionUpdate, ...]] = ((), ())
+
+        self._tags: Dict[int, Tuple[float, float]] = {}
+        self.accepted = 0
+        self.rejected = 0
+
+    def _odometry_at(self, timestamp: float) -> Optional[Pose]:
+        values = self._odometry.history.sample_at(timestamp)
+        return None if values is None else (values[X], values[Y], values[HEADING])
+
+    @staticmethod
+    def _estimate_from(previous: Optional[VisionUpdate], odometry: Pose) -> Pose:
+        if previous is None:
+            return odometry
+        return _apply(previous.estimate, _relative(previous.odometry, odometry))
+
+    def _correct(self, estimate: Pose, x: float, y: float) -> Pose:
+        return (estimate[0] + self._gain_x * (x - estimate[0]),
+                estimate[1] + self._gain_y * (y - estimate[1]),
+                estimate[2])
+
+    def add_vision_measurement(self, timestamp: float, x: float, y: float) -> bool:
+        """ Apply a field position measured at FPGA time 'timestamp'. False if it is too old to use """
+        history = self._odometry.history
+        oldest = history.oldest_timestamp()
+        valid_from = max(oldest if oldest is not None else math.inf, self._odometry.reset_timestamp)
+        odometry = self._odometry_at(timestamp) if timestamp >= valid_from else None
+        if odometry is None:
+            self.rejected += 1
+            return False
+
+        # Updates that are no longer covered by the odometry history are dropped, except the
+        # newest of them, which anchors the estimate unless odometry was reset since
+        timestamps, updates = self._state
+        first = bisect.bisect_left(timestamps, valid_from)
+        if first and timestamps[first - 1] >= self._odometry.reset_timestamp:
+            first -= 1
+        index = bisect.bisect_right(timestamps, timestamp)
+        previous = updates[index - 1] if index > first else None
+
+        update = VisionUpdate(timestamp, odometry, self._correct(self._estimate_from(previous, odometry), x, y), x, y)
+        result = list(updates[max(first, index + 1 - self._capacity):index])
+        result.append(update)
+
+        # Re-apply the measurements that came after this one
+        for later in updates[index:]:
+            estimate = self._correct(self._estimate_from(result[-1], later.odometry), later.x, later.y)
+            result.append(later._replace(estimate=estimate))
+
+        del result[:max(0, len(result) - self._capacity)]
+        self._state = (tuple(u.timestamp for u in result), tuple(result))
+        self.accepted += 1
+        return True
+
+    def _pose(self, timestamp: float, odometry: Pose) -> Pose:
+        timestamps, updates = self._state
+        index = bisect.bisect_right(timestamps, timestamp)
+        previous = updates[index - 1] if index else None
+        if previous is not None and previous.timestamp < self._odometry.reset_timestamp:
+            previous = None
+        return self._estimate_from(previous, odometry)
+
+    def pose(self) -> Pose2d:
+        """ Current estimated pose """
+        sample = self._odometry.history.latest()
+        if sample is None:
+            return Pose2d()
+        x, y, heading = self._pose(math.inf, sample[1][:3])
+        return Pose2d(x, y, Rotation2d(heading))
+
+    def pose_at(self, timestamp: float) -> Optional[Pose2d]:
+        """ Estimated pose at an earlier FPGA time. None before the first odometry update """
+        odometry = self._odometry_at(timestamp)
+        if odometry is None:
+            return None
+        x, y, heading = self._pose(timestamp, odometry)
+        return Pose2d(x, y, Rotation2d(heading))
+
+    ###########################################################################
+    # AprilTags
+
+    def set_tag_layout(self, tags: Dict[int, Tuple[float, float]]) -> None:
+        """ Field (x, y) of each tag, see load_field_tags() """
+        self._tags = dict(tags)
+
+    def add_detections(self, timestamp: float, detections: Sequence[TagDetection]) -> int:
+        """
+        Vision listener: apply the robot position implied by each usable tag in a frame.
+        Returns the number of measurements applied.
+        """
+        if not detections:
+            return 0
+
+        odometry = self._odometry_at(timestamp)
+        if odometry is None:
+            return 0
+        heading = self._pose(timestamp, odometry)[2]
+
+        c = math.cos(heading)
+        s = math.sin(heading)
+        applied = 0
+        for detection in detections:
+            tag = self._tags.get(detection.id)
+            if tag is None or detection.hamming > VisionConstants.kMaxHamming or \
+                    detection.ambiguity > VisionConstants.kMaxAmbiguity:
+                continue
+
+            # Tag offset from the robot center, in the robot's frame
+            forward, left = camera_to_robot(detection)
+            x = tag[0] - (c * forward - s * left)
+            y = tag[1] - (s * forward + c * left)
+            if self.add_vision_measurement(timestamp, x, y):
+                applied += 1
+
+        return applied
+
+
+def camera_to_robot(detection: TagDetection) -> Tuple[float, float]:
+    """ Horizontal (forward, left) offset of a detected tag from the robot center, in meters """
+    # AprilTag camera frame is x right, y down, z forward
+    forward, left, up = detection.z, -detection.x, -detection.y
+
+    # Undo the camera pitch (WPILib convention, negative is tilted up), then its yaw
+    pitch = VisionConstants.kCameraPitchRadians
+    forward = math.cos(pitch) * forward + math.sin(pitch) * up
+
+    yaw = VisionConstants.kRobotToCameraYawRadians
+    c = math.cos(yaw)
+    s = math.sin(yaw)
+    return (VisionConstants.kRobotToCameraX + c * forward - s * left,
+            VisionConstants.kRobotToCameraY + s * forward + c * left)
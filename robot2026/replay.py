@@ -0,0 +1,246 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Faster-than-real-time replay of recorded matches.
+#
+#   Feeds the driver station state, joystick inputs and sensor readings of a data log
+#   (see robot2026.datalog) back through RobotContainer in simulation, one scheduler
+#   tick per record with the FPGA clock stepped to the recorded timestamp, and runs
+#   as fast as the CPU allows. The arm voltage and drive outputs of each tick are
+#   compared against the recorded ones.
+#
+#   The container is rebuilt with the configuration stored in the log header (see
+#   RobotContainer.config). Logs recorded with vision or a sensor sampler depend on
+#   inputs that are not in the log (AprilTag detections, high-rate encoder samples),
+#   as do logs without a recorded configuration. These are reported as SKIP rather
+#   than replayed against a different controller.
+#
+#       python -m robot2026.replay [--tolerance 1e-6] <log-file-or-directory> ...
+#
+#   The exit status is non-zero if any log diverges, so this doubles as a regression
+#   test over a directory of recorded matches. Skipped logs do not fail the run.
+#
+import argparse
+import asyncio
+import gc
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import hal
+from commands2 import CommandScheduler
+from commands2.command import Command
+from wpilib.simulation import DriverStationSim, EncoderSim, pauseTiming, restartTiming, stepTiming
+
+from robot2026 import constants
+from robot2026.datalog import LEFT_Y_AXIS, RIGHT_TRIGGER_AXIS, RIGHT_X_AXIS
+from robot2026.robotcontainer import RobotContainer
+from util.datalog import FILE_SUFFIX, read_datalog, read_datalog_header
+
+DEFAULT_TOLERANCE = 1e-6
+
+# Recorded output field -> function reading the replayed value from the container
+OUTPUTS = {
+    "arm_voltage": lambda container: container.robot_arm.output_voltage,
+    "left_output": lambda container: container.robot_drive.left1.get(),
+    "right_output": lambda container: container.robot_drive.right1.get(),
+}
+
+
+class ReplayResult(NamedTuple):
+    log: str
+    ticks: int
+    elapsed: float                      # Wall-clock seconds for the replay
+    max_error: Dict[str, float]         # Largest absolute difference per output
+    first_mismatch: Optional[int]       # Index of the first record outside tolerance
+    skipped: Optional[str] = None       # Why the log could not be replayed
+
+    @property
+    def passed(self) -> bool:
+        return self.first_mismatch is None and self.skipped is None
+
+
+def container_config(path: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    """ RobotContainer arguments a log was recorded with, and why it cannot be replayed (None if it can) """
+    header, _ = read_datalog_header(path)
+    config = header.get("metadata", {}).get("container")
+
+    if config is None:
+        return {}, "no container configuration recorded"
+    if config.get("vision"):
+        return {}, "recorded with vision, AprilTag detections are not in the log"
+    if config.get("sensor_rate", 0.0) > 0:
+        return {}, "recorded with a sensor sampler, its encoder samples are not in the log"
+
+    return {"arm_tables": bool(config.get("arm_tables")), "parallel": bool(config.get("parallel"))}, None
+
+
+class LogReplay:
+    """
+    Replays one data log through a fresh RobotContainer. Mode transitions call the
+    same RobotContainer methods that MyRobot's mode init functions do.
+    """
+
+    def __init__(self, tolerance: float = DEFAULT_TOLERANCE):
+        self._tolerance = tolerance
+        self._port = constants.OIConstants.kDriverControllerPort
+
+    def _set_inputs(self, record, container: RobotContainer, encoders: List[EncoderSim]) -> None:
+        port = self._port
+
+        DriverStationSim.setEnabled(bool(record["enabled"]))
+        DriverStationSim.setAutonomous(bool(record["autonomous"]))
+        DriverStationSim.setTest(bool(record["test"]))
+        DriverStationSim.setJoystickAxis(port, LEFT_Y_AXIS, float(record["driver_left_y"]))
+        DriverStationSim.setJoystickAxis(port, RIGHT_X_AXIS, float(record["driver_right_x"]))
+        DriverStationSim.setJoystickAxis(port, RIGHT_TRIGGER_AXIS, float(record["driver_right_trigger"]))
+        DriverStationSim.setJoystickButtons(port, int(record["driver_buttons"]))
+        DriverStationSim.notifyNewData()
+
+        left, right, arm = encoders
+        left.setDistance(float(record["left_distance"]))
+        left.setRate(float(record["left_rate"]))
+        right.setDistance(float(record["right_distance"]))
+        right.setRate(float(record["right_rate"]))
+        arm.setDistance(float(record["arm_measurement"]) - constants.ArmConstants.kArmOffsetRads)
+
+    @staticmethod
+    def _mode_changed(mode, container: RobotContainer, scheduler: CommandScheduler,
+                      autonomous_command: Optional[Command]) -> Optional[Command]:
+        enabled, autonomous, test = mode
+
+        if not enabled:
+            container.disablePIDSubsystems()
+        elif autonomous:
+            autonomous_command = container.getAutonomousCommand()
+            if autonomous_command:
+                autonomous_command.schedule()
+        elif test:
+            scheduler.cancelAll()
+        elif autonomous_command:
+            autonomous_command.cancel()
+
+        return autonomous_command
+
+    def run(self, path: str) -> ReplayResult:
+        config, skipped = container_config(path)
+        if skipped:
+            return ReplayResult(str(path), 0, 0.0, {name: 0.0 for name in OUTPUTS}, None, skipped)
+
+        records = read_datalog(path)
+
+        CommandScheduler.resetInstance()
+        scheduler = CommandScheduler.getInstance()
+        container = RobotContainer(**config)
+        drive = container.robot_drive
+
+        # The robot prepares trajectories on the RobotService loop at robotInit, here they are
+        # ready before the first tick so autonomous runs the same command it did live
+        asyncio.run(container.autos.prepare())
+        encoders = [EncoderSim(drive.left_encoder), EncoderSim(drive.right_encoder),
+                    EncoderSim(container.robot_arm.encoder)]
+
+        DriverStationSim.setJoystickAxisCount(self._port, 6)
+        DriverStationSim.setJoystickButtonCount(self._port, 10)
+
+        max_error = {name: 0.0 for name in OUTPUTS}
+        first_mismatch = None
+        autonomous_command = None
+        mode = None
+
+        restartTiming()
+        pauseTiming()
+        now = 0.0
+        start = time.perf_counter()
+
+        try:
+            for index, record in enumerate(records):
+                timestamp = float(record["timestamp"])
+                if timestamp > now:
+                    stepTiming(timestamp - now)
+                    now = timestamp
+
+                self._set_inputs(record, container, encoders)
+
+                record_mode = (bool(record["enabled"]), bool(record["autonomous"]), bool(record["test"]))
+                if record_mode != mode:
+                    mode = record_mode
+                    autonomous_command = self._mode_changed(mode, container, scheduler, autonomous_command)
+
+                container.captureSensors()
+                container.runSubsystemWork()
+                scheduler.run()
+                container.flushOutputs()
+
+                for name, replayed in OUTPUTS.items():
+                    error = abs(replayed(container) - float(record[name]))
+                    if error > max_error[name]:
+                        max_error[name] = error
+                    if error > self._tolerance and first_mismatch is None:
+                        first_mismatch = index
+
+        finally:
+            elapsed = time.perf_counter() - start
+
+            # Release the hardware channels so the next log can build a new container
+            CommandScheduler.resetInstance()
+            container.tick.close()
+            del container, encoders, drive
+            gc.collect()
+
+        return ReplayResult(str(path), len(records), elapsed, max_error, first_mismatch)
+
+
+def log_files(paths: Sequence[str]) -> List[Path]:
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob(f"*{FILE_SUFFIX}")) if path.is_dir() else [path])
+    return files
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded robot data logs and diff the outputs",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="Data log files or directories of data logs")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Largest allowed absolute difference of a replayed output")
+    args = parser.parse_args(argv)
+
+    if not hal.initialize(500, 0):
+        print("Unable to initialize the simulation HAL", file=sys.stderr)
+        return 2
+
+    replay = LogReplay(args.tolerance)
+    failures = 0
+
+    for path in log_files(args.paths):
+        result = replay.run(str(path))
+        if result.skipped:
+            print(f"SKIP: {path.name}: {result.skipped}")
+            continue
+
+        errors = ", ".join(f"{name} {error:.2e}" for name, error in result.max_error.items())
+        status = "PASS" if result.passed else f"FAIL at record {result.first_mismatch}"
+        print(f"{status}: {path.name}: {result.ticks} ticks in {result.elapsed:.3f}s. Max error: {errors}")
+        failures += 0 if result.passed else 1
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
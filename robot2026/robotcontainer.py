@@ -3,15 +3,26 @@
 # Open Source Software; you can modify and/or share it under the terms of
 # the WPILib BSD license file in the root directory of this project.
 #
+from typing import Optional
+
 import commands2
 import commands2.button
 import commands2.cmd
-from robot2025.subsystems.armsubsystem import ArmSubsystem
-from robot2025.subsystems.drivesubsystem import DriveSubsystem
-from wpilib import DriverStation, RobotBase
+from robot2026.autos import AutoRoutine, AutoRoutines
+from robot2026.pose_estimator import load_field_tags
+from robot2026.subsystems.armsubsystem import ArmSubsystem
+from robot2026.subsystems.drivesubsystem import DriveSubsystem
+from robot2026.subsystems.visionsubsystem import VisionSubsystem
+from robot2026.vision import VisionConfig
+from wpilib import DriverStation, RobotBase, SendableChooser, SmartDashboard, Timer
 
 import logging
-from robot2025 import constants
+from robot2026 import constants
+from util.command_watchdog import with_budget
+from util.outputs import OutputStage
+from util.parallel import ParallelTick
+from util.sampling import SensorSampler
+from util.snapshot import SensorSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -23,17 +34,73 @@ class RobotContainer:
     subsystems, commands, and button mappings) should be declared here.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, sensor_rate: float = 0.0, arm_tables: bool = False, vision: Optional[VisionConfig] = None,
+                 parallel: bool = False) -> None:
+        # Motor outputs are staged by the subsystems and written once per loop by flushOutputs()
+        self.outputs = OutputStage()
+
+        # Sensors are read once at the start of each tick by captureSensors()
+        self.snapshot = SensorSnapshot(clock=Timer.getFPGATimestamp)
+
         # The robot's subsystems
-        self.robot_drive = DriveSubsystem()
-        self.robot_arm = ArmSubsystem()
+        self.robot_drive = DriveSubsystem(self.outputs, self.snapshot)
+        self.robot_arm = ArmSubsystem(self.outputs, self.snapshot)
+        self.robot_vision = VisionSubsystem(vision) if vision else None
+
+        # AprilTag detections correct the drive's pose, applied on the event loop as they arrive
+        if self.robot_vision:
+            self.robot_drive.pose_estimator.set_tag_layout(load_field_tags())
+            self.robot_vision.addListener(self.robot_drive.pose_estimator.add_detections)
         self.simulation = RobotBase.isSimulation()
 
+        # Precomputed arm feedforward, and profiles between the goals bound to the A and B buttons
+        if arm_tables:
+            self.robot_arm.useLookupTables((2.0, constants.ArmConstants.kArmOffsetRads))
+
+        # Optionally sample the drive and arm encoders at 'sensor_rate' Hz on their own thread
+        self.sampler: Optional[SensorSampler] = None
+        if sensor_rate > 0:
+            self.sampler = SensorSampler(sensor_rate, clock=Timer.getFPGATimestamp)
+            self.robot_drive.attachSampler(self.sampler)
+            self.robot_arm.attachSampler(self.sampler)
+            self.sampler.start()
+
+        # Initial values, before the first loop
+        self.snapshot.capture()
+
+        # With free-threaded Python, drive odometry and the arm controller run side by side each
+        # tick (see runSubsystemWork) instead of one after the other from the scheduler
+        self.tick = ParallelTick(parallel=parallel)
+        if self.tick.parallel:
+            self.tick.take_periodic(self.robot_drive)
+            self.tick.take_periodic(self.robot_arm)
+
+        # How this container was built. Recorded in data logs so that a replay can build the same one
+        self.config = {
+            "sensor_rate": sensor_rate,
+            "arm_tables": arm_tables,
+            "vision": vision is not None,
+            "parallel": self.tick.parallel,
+        }
+
         # If this is a simulation, we need to silence joystick warnings
         if self.simulation:
             logger.warning("Simlation detected. Silencing annoying JoyStick warnings")
             DriverStation.silenceJoystickConnectionWarning(True)
 
+        # Autonomous routines. Their trajectories are prepared at robotInit (see robot.py)
+        self.autos = AutoRoutines(self.robot_drive)
+        self.autos.add(AutoRoutine("S-Curve", (0.0, 0.0, 0.0), [(1.0, 1.0), (2.0, -1.0)], (3.0, 0.0, 0.0)))
+        self.autos.add(AutoRoutine("Drive Forward", (0.0, 0.0, 0.0), [], (2.0, 0.0, 0.0)))
+
+        self.auto_chooser = SendableChooser()
+        for index, name in enumerate(self.autos.names()):
+            if index == 0:
+                self.auto_chooser.setDefaultOption(name, name)
+            else:
+                self.auto_chooser.addOption(name, name)
+        SmartDashboard.putData("Autonomous", self.auto_chooser)
+
         # The driver's controller
         self.driver_controller = commands2.button.CommandXboxController(
             constants.OIConstants.kDriverControllerPort
@@ -44,14 +111,17 @@ class RobotContainer:
         # Set the default drive command
         # Set the default drive command to split-stick arcade drive
         self.robot_drive.setDefaultCommand(
-            commands2.cmd.run(
-                # A split-stick arcade command, with forward/backward controlled by the left
-                # hand, and turning controlled by the right.
-                lambda: self.robot_drive.arcadeDrive(
-                    -self.driver_controller.getLeftY(),
-                    -self.driver_controller.getRightX(),
-                ),
-                self.robot_drive,
+            with_budget(
+                commands2.cmd.run(
+                    # A split-stick arcade command, with forward/backward controlled by the left
+                    # hand, and turning controlled by the right.
+                    lambda: self.robot_drive.arcadeDrive(
+                        -self.driver_controller.getLeftY(),
+                        -self.driver_controller.getRightX(),
+                    ),
+                    self.robot_drive,
+                ).withName("Arcade Drive"),
+                constants.CommandConstants.kDriveBudgetMs,
             )
         )
 
@@ -62,30 +132,38 @@ class RobotContainer:
         and then passing it to a JoystickButton.
         """
 
+        arm_budget = constants.CommandConstants.kArmBudgetMs
+        drive_budget = constants.CommandConstants.kDriveBudgetMs
+
         # Move the arm to 2 radians above horizontal when the 'A' button is pressed.
         self.driver_controller.a().onTrue(
-            commands2.cmd.run(lambda: self.moveArm(2), self.robot_arm)
+            with_budget(commands2.cmd.run(lambda: self.moveArm(2), self.robot_arm).withName("Arm Up"), arm_budget)
         )
 
         # Move the arm to neutral position when the 'B' button is pressed
         self.driver_controller.b().onTrue(
-            commands2.cmd.run(
-                lambda: self.moveArm(constants.ArmConstants.kArmOffsetRads),
-                self.robot_arm,
+            with_budget(
+                commands2.cmd.run(
+                    lambda: self.moveArm(constants.ArmConstants.kArmOffsetRads),
+                    self.robot_arm,
+                ).withName("Arm Neutral"),
+                arm_budget,
             )
         )
 
         # Disable the arm controller when Y is pressed
         self.driver_controller.y().onTrue(
-            commands2.cmd.runOnce(lambda: self.robot_arm.disable())
+            with_budget(commands2.cmd.runOnce(lambda: self.robot_arm.disable()).withName("Arm Disable"), arm_budget)
         )
 
         # Drive at half speed when the bumper is held
         self.driver_controller.rightTrigger().onTrue(
-            commands2.cmd.runOnce(lambda: self.robot_drive.setMaxOutput(0.5))
+            with_budget(commands2.cmd.runOnce(lambda: self.robot_drive.setMaxOutput(0.5)).withName("Half Speed"),
+                        drive_budget)
         )
         self.driver_controller.rightTrigger().onFalse(
-            commands2.cmd.runOnce(lambda: self.robot_drive.setMaxOutput(1.0))
+            with_budget(commands2.cmd.runOnce(lambda: self.robot_drive.setMaxOutput(1.0)).withName("Full Speed"),
+                        drive_budget)
         )
 
     def disablePIDSubsystems(self) -> None:
@@ -98,7 +176,20 @@ class RobotContainer:
 
         :returns: the command to run in autonomous
         """
-        return commands2.cmd.none()
+        return self.autos.getCommand(self.auto_chooser.getSelected())
+
+    def captureSensors(self) -> None:
+        """Reads every sensor for this loop. Call once at the start of each loop."""
+        self.snapshot.capture()
+
+    def runSubsystemWork(self) -> None:
+        """Runs the subsystem periodic work taken from the scheduler, in parallel if enabled.
+        Call after captureSensors() and before the scheduler runs."""
+        self.tick.run()
+
+    def flushOutputs(self) -> None:
+        """Writes the motor outputs staged during this loop. Call once at the end of each loop."""
+        self.outputs.flush()
 
     def moveArm(self, radians: float) -> None:
         self.robot_arm.setGoal(radians)
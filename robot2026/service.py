@@ -16,11 +16,17 @@
 # ------------------------------------------------------------------------ #
 
 import argparse
-from typing import Optional
+import concurrent.futures
+import functools
+from typing import Coroutine, List, Optional
 
 import asyncio
 import logging
-from util.worker_thread import AsyncioWorkerThread
+from robot2026 import constants
+from util.logging import DEFAULT_DRAIN_INTERVAL, log_queue
+from util.metrics import MetricsExporter, create_exporters, export_metrics, gauge
+from util.periodic import PeriodicScheduler
+from util.worker_thread import AsyncioWorkerThread, ThreadSettings
 
 logger = logging.getLogger(__name__)
 
@@ -32,15 +38,43 @@ def close(msg: str) -> None:
 class RobotService(AsyncioWorkerThread):
     """ Service / main loop """
 
-    def __init__(self, args: argparse.Namespace):
-        super().__init__("Robot Service", debug=args.debug)
+    def __init__(self, args: argparse.Namespace, settings: Optional[ThreadSettings] = None):
+        super().__init__("Robot Service", debug=args.debug, settings=settings)
         self._args = args
         self._tasks = []
+        self._periodic: Optional[PeriodicScheduler] = None
+        self._exporters: List[MetricsExporter] = []
 
     @property
     def args(self) -> argparse.Namespace:
         return self._args
-    
+
+    @property
+    def periodic(self) -> Optional[PeriodicScheduler]:
+        """ Periodic tasks on the service's event loop, available once the service is running """
+        return self._periodic
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """
+        Run a coroutine on the service's event loop from any other thread.
+
+        The caller's context variables, which includes the active OpenTelemetry span,
+        are copied along with the call so the work is traced as a child of the caller
+        without serializing the trace context.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.event_loop)
+
+    # Metric gauge callbacks, evaluated on this thread at flush time
+
+    def _task_count(self) -> int:
+        return len(asyncio.all_tasks(self.event_loop))
+
+    def _missed_count(self) -> int:
+        return sum(task.missed for task in self._periodic.tasks())
+
+    def _skipped_count(self) -> int:
+        return sum(task.skipped for task in self._periodic.tasks())
+
     async def close(self, reason: Optional[str] = "") -> None:
         """ Initiate shutdown of the main application thread and asyncio event loop """
         if self._debug:
@@ -75,7 +109,43 @@ class RobotService(AsyncioWorkerThread):
             # library debug enabled
             self.event_loop.set_debug(True)
 
-        # TODO: If we need any periodic tasks or other tasks to run, they can be
-        #       started here
+        # Periodic work runs at fixed times on the event loop's clock, see util/periodic.py
+        self._periodic = PeriodicScheduler(self.event_loop)
+
+        # Queued log records are formatted and written from this thread
+        queue = log_queue()
+        if queue:
+            self._periodic.add("log-drain", queue.drain, DEFAULT_DRAIN_INTERVAL)
+
+        if self._args.metrics:
+            gauge("robot_service.tasks", description="Tasks on the RobotService event loop",
+                  callback=self._task_count)
+            gauge("robot_service.periodic.missed", description="Periodic task runs that missed their deadline",
+                  callback=self._missed_count)
+            gauge("robot_service.periodic.skipped", description="Periodic task cycles skipped after an overrun",
+                  callback=self._skipped_count)
+
+            self._exporters = create_exporters(constants.OTEL_METRICS_EXPORTER, constants.OTEL_OLTP_ENDPOINT,
+                                               constants.OTEL_SERVICE_NAME)
+
+            # Offset from the log drain so the two do not land on the same loop iteration
+            self._periodic.add("metrics-flush", functools.partial(export_metrics, self._exporters),
+                               self._args.metrics_interval, phase=(DEFAULT_DRAIN_INTERVAL / 2) % self._args.metrics_interval)
 
         return await super().on_run()
+
+    async def on_shutdown(self) -> None:
+        """ Stop the periodic tasks, then output any queued logs and close the metrics exporters """
+        if self._periodic:
+            logger.info(f"Periodic tasks: {self._periodic.stats()}")
+            await self._periodic.stop()
+
+        queue = log_queue()
+        if queue:
+            queue.drain()
+
+        exporters, self._exporters = self._exporters, []
+        for exporter in exporters:
+            exporter.shutdown()
+
+        await super().on_shutdown()
@@ -4,19 +4,35 @@
 # the WPILib BSD license file in the root directory of this project.
 #
 
+from typing import List, Optional, Sequence
+
 import commands2
 import wpilib
 import wpimath.controller
 import wpimath.trajectory
 
-from robot2025.constants import ArmConstants
+from robot2026.constants import ArmConstants
+from util.metrics import gauge
+from util.outputs import OutputStage
+from util.snapshot import SensorSnapshot
+from util.sampling import SampleRing, SensorSampler
+
+
+class ProfileSample:
+    """Position and velocity of a lookup table setpoint, in place of a TrapezoidProfile.State"""
+    __slots__ = ("position", "velocity")
+
+    def __init__(self) -> None:
+        self.position = 0.0
+        self.velocity = 0.0
 
 
 class ArmSubsystem(commands2.ProfiledPIDSubsystem):
     """A robot arm subsystem that moves with a motion profile."""
 
-    # Create a new ArmSubsystem
-    def __init__(self) -> None:
+    # Create a new ArmSubsystem. The motor output is written through 'outputs' and the encoder
+    # is read once per tick through 'snapshot' when given
+    def __init__(self, outputs: Optional[OutputStage] = None, snapshot: Optional[SensorSnapshot] = None) -> None:
         super().__init__(
             wpimath.controller.ProfiledPIDController(
                 ArmConstants.kP,
@@ -46,17 +62,135 @@ class ArmSubsystem(commands2.ProfiledPIDSubsystem):
             ArmConstants.kEncoderDistancePerPulse
         )
 
+        # Staged output, as a duty cycle so battery compensation is the same as setVoltage()
+        self.outputs = outputs
+        if outputs:
+            self.motor_channel = outputs.register("arm.motor", self.motor.set)
+
+        # Per-tick encoder position
+        self.snapshot = snapshot
+        if snapshot:
+            self.position_channel = snapshot.register("arm.position", self.readPosition)
+
+        # Metrics. The encoder rate is only read when metrics are exported
+        self.voltage_gauge = gauge("arm.motor.voltage", unit="V", description="Arm motor command")
+        gauge("arm.encoder.rate", unit="rad/s", description="Arm velocity", callback=self.encoder.getRate)
+
+        # High-rate encoder samples when a sampler is attached
+        self.encoder_samples: Optional[SampleRing] = None
+
+        # Last setpoint and output, kept for the data logger
+        self.setpoint_position = 0.0
+        self.setpoint_velocity = 0.0
+        self.output_voltage = 0.0
+
+        # Optional feedforward and profile lookup tables, see useLookupTables()
+        self.feedforward_table = None
+        self.profile_tables: List = []
+        self._goal: Optional[float] = None
+        self._profile = None
+        self._profile_start = 0.0
+        self._table_setpoint = ProfileSample()
+
         # Start arm at rest in neutral position
         self.setGoal(ArmConstants.kArmOffsetRads)
 
+    def useLookupTables(self, goals: Sequence[float]) -> None:
+        """Use precomputed tables for the feedforward and for moves between the given goals
+        instead of calculating them every loop.
+
+        :param goals: arm positions (radians) to build rest-to-rest profiles between
+        """
+        from robot2026.arm_tables import FeedforwardTable, build_profile_tables
+
+        self.feedforward_table = FeedforwardTable(
+            ArmConstants.kSVolts, ArmConstants.kGVolts, ArmConstants.kVVoltSecondPerRad,
+            size=ArmConstants.kFeedforwardTableSize,
+        )
+        self.profile_tables = build_profile_tables(
+            wpimath.trajectory.TrapezoidProfile.Constraints(
+                ArmConstants.kMaxVelocityRadPerSecond,
+                ArmConstants.kMaxAccelerationRadPerSecSquared,
+            ),
+            goals,
+            step=ArmConstants.kProfileTableStepSeconds,
+        )
+
+    def setGoal(self, goal: float) -> None:
+        if goal != self._goal:
+            self._profile = None
+        self._goal = goal
+        super().setGoal(goal)
+
+    def enable(self) -> None:
+        # Follow a profile table if the arm is at the start of one that reaches the goal. This
+        # is checked on every enable, the bindings re-enable an already enabled arm on each move
+        if self._profile is None and self.profile_tables:
+            measurement = self.getMeasurement()
+            for table in self.profile_tables:
+                if table.goal == self._goal and \
+                        abs(table.start - measurement) <= ArmConstants.kProfileTableToleranceRads:
+                    self._profile = table
+                    self._profile_start = wpilib.Timer.getFPGATimestamp()
+                    break
+        super().enable()
+
+    def disable(self) -> None:
+        self._profile = None
+        super().disable()
+
+    def periodic(self) -> None:
+        profile = self._profile
+        if profile is None or not self.isEnabled():
+            super().periodic()
+            return
+
+        # Same as the ProfiledPIDController (P only) with the setpoint taken from the table
+        setpoint = self._table_setpoint
+        setpoint.position, setpoint.velocity = profile.sample(wpilib.Timer.getFPGATimestamp() - self._profile_start)
+        self.useOutput(ArmConstants.kP * (setpoint.position - self.getMeasurement()), setpoint)
+
     def useOutput(
             self, output: float, setpoint: wpimath.trajectory.TrapezoidProfile.State
     ) -> None:
         # Calculate the feedforward from the setpoint
-        feedforward = self.feedforward.calculate(setpoint.position, setpoint.velocity)
+        if self.feedforward_table:
+            feedforward = self.feedforward_table.calculate(setpoint.position, setpoint.velocity)
+        else:
+            feedforward = self.feedforward.calculate(setpoint.position, setpoint.velocity)
 
         # Add the feedforward to the PID output to get the motor output
-        self.motor.setVoltage(output + feedforward)
+        voltage = output + feedforward
+        if self.outputs:
+            self.outputs.stage(self.motor_channel, voltage / wpilib.RobotController.getBatteryVoltage())
+        else:
+            self.motor.setVoltage(voltage)
+        self.voltage_gauge.set(voltage)
+
+        self.setpoint_position = setpoint.position
+        self.setpoint_velocity = setpoint.velocity
+        self.output_voltage = voltage
+
+    def attachSampler(self, sampler: SensorSampler) -> None:
+        """Samples the arm encoder on the sampler's thread, getMeasurement() then returns the
+        newest sample instead of reading the encoder."""
+        self.encoder_samples = sampler.register("arm encoder", (self.encoder.getDistance,))
+
+    def readPosition(self) -> float:
+        """Reads the encoder now (from the newest sample if a sampler is attached), without the
+        arm offset."""
+        if self.encoder_samples and self.encoder_samples.count:
+            return self.encoder_samples.latest_value()
+        return self.encoder.getDistance()
 
     def getMeasurement(self) -> float:
-        return self.encoder.getDistance() + ArmConstants.kArmOffsetRads
+        if self.snapshot:
+            return self.snapshot.values[self.position_channel] + ArmConstants.kArmOffsetRads
+        return self.readPosition() + ArmConstants.kArmOffsetRads
+
+    def getMeasurementAt(self, timestamp: float) -> float:
+        """Arm position at an FPGA timestamp, interpolated from the sampled encoder. Without a
+        sampler this is the current measurement."""
+        if self.encoder_samples and self.encoder_samples.count:
+            return self.encoder_samples.value_at(timestamp) + ArmConstants.kArmOffsetRads
+        return self.getMeasurement()
@@ -4,16 +4,28 @@
 # the WPILib BSD license file in the root directory of this project.
 #
 
+import contextlib
+from typing import Optional, Sequence, Tuple
+
 import commands2
-from wpilib import PWMSparkMax, Encoder
+from wpilib import PWMSparkMax, Encoder, RobotController, Timer
 from wpilib.drive import DifferentialDrive
+from wpimath import applyDeadband
+from wpimath.geometry import Pose2d
 
-from robot2025.constants import DriveConstants
+from robot2026.constants import DriveConstants
+from robot2026.odometry import DifferentialOdometry
+from robot2026.pose_estimator import PoseEstimator
+from util.metrics import gauge
+from util.outputs import OutputStage
+from util.snapshot import SensorSnapshot
+from util.sampling import SampleRing, SensorSampler
 
 
 class DriveSubsystem(commands2.Subsystem):
-    # Creates a new DriveSubsystem
-    def __init__(self) -> None:
+    # Creates a new DriveSubsystem. Motor outputs are written through 'outputs' and the
+    # encoder distances are read once per tick through 'snapshot' when given
+    def __init__(self, outputs: Optional[OutputStage] = None, snapshot: Optional[SensorSnapshot] = None) -> None:
         super().__init__()
 
         # The motors on the left side of the drive.
@@ -57,27 +69,204 @@ class DriveSubsystem(commands2.Subsystem):
         # gearbox is constructed, you might have to invert the left side instead.
         self.right1.setInverted(True)
 
+        # Staged outputs. The drive does the same math as DifferentialDrive and stages the
+        # result. The stage keeps motor safety fed each loop the drive is commanded.
+        self.outputs = outputs
+        self.max_output = 1.0
+        if outputs:
+            self.left_channel = outputs.register("drive.left", self.left1.set, keepalive=self.drive.feed)
+            self.right_channel = outputs.register("drive.right", self.right1.set)
+
+        # High-rate encoder samples (left, right distance) when a sampler is attached
+        self.encoder_samples: Optional[SampleRing] = None
+        self.sampler: Optional[SensorSampler] = None
+
+        # Per-tick encoder distances and rates
+        self.snapshot = snapshot
+        if snapshot:
+            self.left_distance_channel = snapshot.register("drive.left_distance", self.readLeftDistance)
+            self.right_distance_channel = snapshot.register("drive.right_distance", self.readRightDistance)
+            self.left_rate_channel = snapshot.register("drive.left_rate", self.left_encoder.getRate)
+            self.right_rate_channel = snapshot.register("drive.right_rate", self.right_encoder.getRate)
+
+        # Pose tracking. Updated by the sampler thread if there is one, otherwise by periodic()
+        self.odometry = DifferentialOdometry(DriveConstants.kTrackWidthMeters, DriveConstants.kPoseHistorySize)
+
+        # Odometry with vision corrections, when there is vision
+        self.pose_estimator = PoseEstimator(self.odometry)
+
+        # Metrics. These are only read when metrics are exported
+        gauge("drive.left_encoder.rate", unit="in/s", callback=self.left_encoder.getRate)
+        gauge("drive.right_encoder.rate", unit="in/s", callback=self.right_encoder.getRate)
+        gauge("drive.left_motor.voltage", unit="V", callback=self.getLeftVoltage)
+        gauge("drive.right_motor.voltage", unit="V", callback=self.getRightVoltage)
+
     def arcadeDrive(self, fwd: float, rot: float) -> None:
         """Drives the robot using arcade controls.
 
         :param fwd: the commanded forward movement
         :param rot: the commanded rotation
         """
-        self.drive.arcadeDrive(fwd, rot)
+        if self.outputs is None:
+            self.drive.arcadeDrive(fwd, rot)
+            return
+
+        speeds = DifferentialDrive.arcadeDriveIK(
+            applyDeadband(fwd, DriveConstants.kDeadband), applyDeadband(rot, DriveConstants.kDeadband), True
+        )
+        self.outputs.stage(self.left_channel, speeds.left * self.max_output)
+        self.outputs.stage(self.right_channel, speeds.right * self.max_output)
+
+    def tankDrive(self, left: float, right: float) -> None:
+        """Drives each side of the robot directly. Inputs are not squared.
+
+        :param left: the left side output [-1, 1]
+        :param right: the right side output [-1, 1]
+        """
+        if self.outputs is None:
+            self.drive.tankDrive(left, right, False)
+            return
+
+        speeds = DifferentialDrive.tankDriveIK(
+            applyDeadband(left, DriveConstants.kDeadband), applyDeadband(right, DriveConstants.kDeadband), False
+        )
+        self.outputs.stage(self.left_channel, speeds.left * self.max_output)
+        self.outputs.stage(self.right_channel, speeds.right * self.max_output)
+
+    def attachSampler(self, sampler: SensorSampler) -> None:
+        """Samples the drive encoders on the sampler's thread. Distances are then served from the
+        newest sample instead of reading the encoders.
+
+        :param sampler: the sensor sampler, before it is started
+        """
+        self.sampler = sampler
+        self.encoder_samples = sampler.register(
+            "drive encoders", (self.left_encoder.getDistance, self.right_encoder.getDistance),
+            listener=self._updateOdometry,
+        )
+
+    def periodic(self) -> None:
+        if self.encoder_samples is None:
+            if self.snapshot:
+                self._updateOdometry(self.snapshot.timestamp, (self.getLeftDistance(), self.getRightDistance()))
+            else:
+                self._updateOdometry(
+                    Timer.getFPGATimestamp(), (self.left_encoder.getDistance(), self.right_encoder.getDistance())
+                )
+
+    def _updateOdometry(self, timestamp: float, distances: Sequence[float]) -> None:
+        left, right = distances
+        self.odometry.update(
+            timestamp, left * DriveConstants.kInchesToMeters, right * DriveConstants.kInchesToMeters
+        )
+
+    def getPose(self) -> Pose2d:
+        """Gets the current estimated pose of the robot.
+
+        :returns: the pose, in meters
+        """
+        return self.pose_estimator.pose()
+
+    def getPoseAt(self, timestamp: float) -> Optional[Pose2d]:
+        """Gets the estimated pose of the robot at an earlier FPGA timestamp.
+
+        :param timestamp: FPGA time, in seconds
+        :returns: the interpolated pose, or None if there is no history yet
+        """
+        return self.pose_estimator.pose_at(timestamp)
+
+    def resetOdometry(self, pose: Pose2d) -> None:
+        """Resets odometry to the given pose.
+
+        :param pose: the pose to continue tracking from
+        """
+        self.odometry.reset(pose)
 
     def resetEncoders(self) -> None:
         """Resets the drive encoders to currently read a position of 0."""
-        self.left_encoder.reset()
-        self.right_encoder.reset()
+        # The sampler must not take a sample, or update odometry, part way through the reset
+        with self.sampler.lock if self.sampler else contextlib.nullcontext():
+            self.left_encoder.reset()
+            self.right_encoder.reset()
+
+            # Samples from before the reset are no longer valid, distances come from the
+            # encoders until the next sample
+            if self.encoder_samples:
+                self.encoder_samples.clear()
+
+            if self.snapshot:
+                self.snapshot.refresh(self.left_distance_channel)
+                self.snapshot.refresh(self.right_distance_channel)
+
+            # Continue from the current pose rather than see the reset as motion
+            self.odometry.reset(self.getPose())
 
     def getAverageEncoderDistance(self) -> float:
         """Gets the average distance of the two encoders.
 
         :returns: the average of the two encoder readings
         """
-        return (
-                self.left_encoder.getDistance() + self.right_encoder.getDistance()
-        ) / 2.0
+        return (self.getLeftDistance() + self.getRightDistance()) / 2.0
+
+    def readLeftDistance(self) -> float:
+        """Reads the left encoder distance now, from the newest sample if a sampler is attached.
+
+        :returns: the left distance, in inches
+        """
+        samples = self.encoder_samples
+        if samples and samples.count:
+            return samples.latest_value(0)
+        return self.left_encoder.getDistance()
+
+    def readRightDistance(self) -> float:
+        """Reads the right encoder distance now, from the newest sample if a sampler is attached.
+
+        :returns: the right distance, in inches
+        """
+        samples = self.encoder_samples
+        if samples and samples.count:
+            return samples.latest_value(1)
+        return self.right_encoder.getDistance()
+
+    def getLeftDistance(self) -> float:
+        """Gets the left encoder distance as of the start of this tick.
+
+        :returns: the left distance, in inches
+        """
+        if self.snapshot:
+            return self.snapshot.values[self.left_distance_channel]
+        return self.readLeftDistance()
+
+    def getRightDistance(self) -> float:
+        """Gets the right encoder distance as of the start of this tick.
+
+        :returns: the right distance, in inches
+        """
+        if self.snapshot:
+            return self.snapshot.values[self.right_distance_channel]
+        return self.readRightDistance()
+
+    def getEncoderVelocities(self, window: float = 0.02) -> Tuple[float, float]:
+        """Gets the left and right wheel velocities. With a sampler attached these are averaged
+        over the most recent 'window' seconds of samples, otherwise the encoder rates as of the
+        start of this tick are used.
+
+        :param window: seconds of samples to average over
+        :returns: the (left, right) velocities
+        """
+        samples = self.encoder_samples
+        sample = samples.latest() if samples else None
+        if sample:
+            timestamp, (left, right) = sample
+            return (
+                (left - samples.value_at(timestamp - window, 0)) / window,
+                (right - samples.value_at(timestamp - window, 1)) / window,
+            )
+
+        if self.snapshot:
+            values = self.snapshot.values
+            return values[self.left_rate_channel], values[self.right_rate_channel]
+        return self.left_encoder.getRate(), self.right_encoder.getRate()
 
     def getLeftEncoder(self) -> Encoder:
         """Gets the left drive encoder.
@@ -93,9 +282,24 @@ class DriveSubsystem(commands2.Subsystem):
         """
         return self.right_encoder
 
+    def getLeftVoltage(self) -> float:
+        """Gets the voltage currently applied to the left side of the drive.
+
+        :returns: the left motor voltage
+        """
+        return self.left1.get() * RobotController.getBatteryVoltage()
+
+    def getRightVoltage(self) -> float:
+        """Gets the voltage currently applied to the right side of the drive.
+
+        :returns: the right motor voltage
+        """
+        return self.right1.get() * RobotController.getBatteryVoltage()
+
     def setMaxOutput(self, max_output: float) -> None:
         """Sets the max output of the drive. Useful for scaling the drive to drive more slowly.
 
         :param maxOutput: the maximum output to which the drive will be constrained
         """
+        self.max_output = max_output
         self.drive.setMaxOutput(max_output)
@@ -0,0 +1,108 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# AprilTag detections from the vision pipeline (robot2026.vision).
+#
+#   Detection runs in separate processes. Each frame's results are read on the
+#   RobotService event loop as soon as they arrive and handed to any listeners there.
+#   The control loop only looks at the most recent results.
+#
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+import commands2
+from wpilib import Timer
+
+from robot2026.constants import VisionConstants
+from robot2026.vision import TagDetection, VisionConfig, VisionPipeline
+from util.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+Detections = Tuple[float, Tuple[TagDetection, ...]]
+DetectionListener = Callable[[float, Tuple[TagDetection, ...]], None]
+
+
+class VisionSubsystem(commands2.Subsystem):
+    """AprilTag vision. Call start() with the event loop that is to receive the detections."""
+
+    def __init__(self, config: VisionConfig) -> None:
+        super().__init__()
+        self.pipeline = VisionPipeline(config)
+
+        # (FPGA timestamp, detections) of the most recent frames, appended by the event loop
+        self.detections: Deque[Detections] = deque(maxlen=VisionConstants.kDetectionHistory)
+        self.listeners: List[DetectionListener] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._frames = counter("vision.frames", description="Frames processed by the AprilTag detector")
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start the vision processes, delivering their results on 'loop'.
+
+        :param loop: event loop (normally the RobotService loop) to read the results on
+        """
+        self.pipeline.start()
+        self._loop = loop
+        loop.call_soon_threadsafe(loop.add_reader, self.pipeline.connection.fileno(), self._onReadable)
+
+    def addListener(self, listener: DetectionListener) -> None:
+        """Call 'listener(timestamp, detections)' on the event loop for every processed frame.
+
+        :param listener: callable taking the frame's FPGA timestamp and its detections
+        """
+        self.listeners.append(listener)
+
+    def _onReadable(self) -> None:
+        try:
+            timestamp, detections = self.pipeline.read()
+
+        except (EOFError, OSError):
+            logger.error("Vision detector process exited")
+            self._loop.remove_reader(self.pipeline.connection.fileno())
+            return
+
+        # Capture times are monotonic clock, convert to FPGA time
+        timestamp += Timer.getFPGATimestamp() - time.monotonic()
+        detections = tuple(detection._replace(timestamp=timestamp) for detection in detections)
+
+        self.detections.append((timestamp, detections))
+        self._frames.add()
+
+        for listener in self.listeners:
+            try:
+                listener(timestamp, detections)
+
+            except Exception as e:  # pylint: disable=broad-except
+                logger.exception(f"Vision listener failed: {e}")
+
+    def getLatest(self) -> Optional[Detections]:
+        """Gets the most recent frame's detections.
+
+        :returns: (FPGA timestamp, detections), or None before the first frame
+        """
+        detections = self.detections
+        return detections[-1] if detections else None
+
+    def close(self) -> None:
+        """Stop the vision processes."""
+        connection = self.pipeline.connection
+        if self._loop is not None and connection is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._loop.remove_reader, connection.fileno())
+        self.pipeline.close()
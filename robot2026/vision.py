@@ -0,0 +1,424 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# AprilTag vision pipeline.
+#
+#   Detection runs in its own process, so it never holds the control loop's GIL:
+#
+#     capture process    camera (cscore) or a recorded PGM image sequence, writing
+#                        8-bit grayscale frames in place into a SharedFrameRing
+#     detector process   robotpy_apriltag on a NumPy view of the newest frame (no
+#                        copy), pose estimated per tag, results packed into one
+#                        compact binary message per frame and sent over a pipe
+#     robot process      VisionPipeline.read() unpacks a message into TagDetections.
+#                        VisionSubsystem does this from the RobotService event loop
+#                        whenever the pipe is readable
+#
+#   Frame timestamps are time.monotonic() seconds in the capture process, the same
+#   clock in every process. The robot process converts them to FPGA time.
+#
+#   Record a sequence from a camera, or run the pipeline over one and print the
+#   detections (no robot required):
+#
+#       python -m robot2026.vision camera:0 --record frames/
+#       python -m robot2026.vision frames/ --fps 30
+#
+import argparse
+import glob
+import logging
+import multiprocessing
+import os
+import struct
+import sys
+import time
+from multiprocessing.connection import Connection
+from typing import List, NamedTuple, Optional, Tuple
+
+from robot2026.constants import VisionConstants
+from util.shm_ring import SharedFrameRing
+
+logger = logging.getLogger(__name__)
+
+CAMERA_PREFIX = "camera:"
+PGM_SUFFIX = ".pgm"
+
+# Message per processed frame: sequence, capture timestamp, detection time (s), detection count,
+# followed by 'count' detection records
+FRAME = struct.Struct("<QddI")
+# id, hamming, decision margin, center x/y (pixels), camera-to-tag translation x/y/z (m),
+# rotation quaternion w/x/y/z, pose error, pose ambiguity
+DETECTION = struct.Struct("<HBx12f")
+
+MAX_DETECTIONS = 32
+MESSAGE_SIZE = FRAME.size + MAX_DETECTIONS * DETECTION.size
+
+
+class VisionConfig(NamedTuple):
+    """ Everything the vision processes need, picklable for the child processes """
+    source: str
+    width: int = VisionConstants.kCameraWidth
+    height: int = VisionConstants.kCameraHeight
+    fps: float = VisionConstants.kCameraFps
+    slots: int = VisionConstants.kFrameSlots
+    family: str = VisionConstants.kTagFamily
+    tag_size: float = VisionConstants.kTagSizeMeters
+    fx: float = VisionConstants.kCameraFx
+    fy: float = VisionConstants.kCameraFy
+    cx: float = VisionConstants.kCameraCx
+    cy: float = VisionConstants.kCameraCy
+    threads: int = VisionConstants.kDetectorThreads
+    loop: bool = True                   # Image sequences start over at the end
+    record: str = ""                    # Directory to also save captured frames to
+
+
+class TagDetection(NamedTuple):
+    timestamp: float                    # Frame capture time (monotonic, or FPGA once converted)
+    frame: int
+    id: int
+    hamming: int
+    margin: float
+    center_x: float
+    center_y: float
+    x: float                            # Camera-to-tag transform, meters (camera coordinates)
+    y: float
+    z: float
+    qw: float
+    qx: float
+    qy: float
+    qz: float
+    error: float
+    ambiguity: float
+
+
+###############################################################################
+# PGM images
+
+def read_pgm_header(f) -> Tuple[int, int, int]:
+    """ Parse a binary (P5) PGM header, leaving 'f' at the start of the pixels """
+    tokens: List[bytes] = []
+    while len(tokens) < 4:
+        line = f.readline()
+        if not line:
+            raise ValueError("Truncated PGM header")
+        tokens.extend(line.split(b"#", 1)[0].split())
+
+    if tokens[0] != b"P5":
+        raise ValueError(f"Not a binary PGM image ({tokens[0]!r})")
+
+    width, height, maxval = int(tokens[1]), int(tokens[2]), int(tokens[3])
+    if maxval > 255:
+        raise ValueError("Only 8-bit PGM images are supported")
+    return width, height, maxval
+
+
+def read_pgm_into(path: str, view: memoryview, width: int, height: int) -> None:
+    """ Read an 8-bit PGM image straight into 'view' (width * height bytes) """
+    with open(path, "rb") as f:
+        size = read_pgm_header(f)[:2]
+        if size != (width, height):
+            raise ValueError(f"{path}: image is {size[0]}x{size[1]}, expected {width}x{height}")
+        if f.readinto(view) != width * height:
+            raise ValueError(f"{path}: truncated image")
+
+
+def write_pgm(path: str, pixels, width: int, height: int) -> None:
+    with open(path, "wb") as f:
+        f.write(b"P5\n%d %d\n255\n" % (width, height))
+        f.write(pixels)
+
+
+def image_sequence(directory: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(directory, "*" + PGM_SUFFIX)))
+
+
+def image_sequence_size(directory: str) -> Tuple[int, int]:
+    """ Size of the images in a recorded sequence, from the first one """
+    images = image_sequence(directory)
+    if not images:
+        raise ValueError(f"No {PGM_SUFFIX} images found in {directory}")
+
+    with open(images[0], "rb") as f:
+        return read_pgm_header(f)[:2]
+
+
+###############################################################################
+# Child processes
+
+def _capture_main(config: VisionConfig, ring_name: str, frame_ready, stop) -> None:
+    """ Capture process: fill the ring from the camera or the image sequence """
+    ring = SharedFrameRing.attach(ring_name)
+    count = 0
+    try:
+        if config.source.startswith(CAMERA_PREFIX):
+            frames = _camera_frames(config, ring, stop)
+        else:
+            frames = _sequence_frames(config, ring, stop)
+
+        for timestamp in frames:
+            if config.record:
+                slot = ring.next_slot()
+                write_pgm(os.path.join(config.record, f"frame-{count:06d}{PGM_SUFFIX}"),
+                          ring.frame_view(slot), config.width, config.height)
+            ring.publish(timestamp)
+            frame_ready.release()
+            count += 1
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        stop.set()      # An image sequence played once has ended, the detector finishes up and exits
+        ring.close()
+
+
+def _sequence_frames(config: VisionConfig, ring: SharedFrameRing, stop):
+    """ Replay a recorded image sequence at 'fps' """
+    images = image_sequence(config.source)
+    if not images:
+        raise ValueError(f"No {PGM_SUFFIX} images found in {config.source}")
+
+    period = 1.0 / config.fps
+    deadline = time.monotonic()
+    while not stop.is_set():
+        for path in images:
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            deadline = max(deadline + period, time.monotonic() - period)
+
+            if stop.is_set():
+                return
+
+            read_pgm_into(path, ring.frame_view(ring.next_slot()), config.width, config.height)
+            yield time.monotonic()
+
+        if not config.loop:
+            return
+
+
+def _camera_frames(config: VisionConfig, ring: SharedFrameRing, stop):
+    """ Grab grayscale frames from a USB camera with cscore, directly into the ring when possible """
+    import numpy as np
+    from cscore import CvSink, UsbCamera, VideoMode
+
+    camera = UsbCamera("vision", int(config.source[len(CAMERA_PREFIX):]))
+    camera.setVideoMode(VideoMode.PixelFormat.kMJPEG, config.width, config.height, int(config.fps))
+    sink = CvSink("vision", VideoMode.PixelFormat.kGray)
+    sink.setSource(camera)
+
+    while not stop.is_set():
+        frame = np.frombuffer(ring.frame_view(ring.next_slot()), dtype=np.uint8).reshape(config.height,
+                                                                                        config.width)
+        grabbed, image = sink.grabFrame(frame)
+        if grabbed == 0:
+            logger.warning(f"Camera: {sink.getError()}")
+            continue
+
+        timestamp = time.monotonic()
+        if image is not frame:
+            np.copyto(frame, image)
+        del frame, image        # Release the shared memory view
+        yield timestamp
+
+
+def _detect_main(config: VisionConfig, ring_name: str, frame_ready, stop, conn: Connection) -> None:
+    """ Detector process: detect tags in the newest frame and send the results to the robot """
+    import numpy as np
+    from robotpy_apriltag import AprilTagDetector, AprilTagPoseEstimator
+
+    detector = AprilTagDetector()
+    detector.addFamily(config.family)
+    detector_config = detector.getConfig()
+    detector_config.numThreads = config.threads
+    detector.setConfig(detector_config)
+    estimator = AprilTagPoseEstimator(
+        AprilTagPoseEstimator.Config(config.tag_size, config.fx, config.fy, config.cx, config.cy)
+    )
+
+    ring = SharedFrameRing.attach(ring_name)
+    images = [np.frombuffer(ring.frame_view(slot), dtype=np.uint8).reshape(ring.height, ring.width)
+              for slot in range(ring.slots)]
+    message = bytearray(MESSAGE_SIZE)
+    last = 0
+    try:
+        while True:
+            if not frame_ready.acquire(timeout=0.1):
+                if stop.is_set():
+                    break
+                continue
+            while frame_ready.acquire(False):       # Only the newest frame matters
+                pass
+
+            latest = ring.latest()
+            if latest is None or latest[0] == last:
+                continue
+            sequence, timestamp, slot = latest
+            last = sequence
+
+            start = time.monotonic()
+            detections = detector.detect(images[slot])
+
+            count = 0
+            for detection in detections[:MAX_DETECTIONS]:
+                estimate = estimator.estimateOrthogonalIteration(detection, VisionConstants.kPoseIterations)
+                pose = estimate.pose1
+                quaternion = pose.rotation().getQuaternion()
+                center = detection.getCenter()
+                DETECTION.pack_into(message, FRAME.size + count * DETECTION.size,
+                                    detection.getId(), detection.getHamming(), detection.getDecisionMargin(),
+                                    center.x, center.y, pose.X(), pose.Y(), pose.Z(),
+                                    quaternion.W(), quaternion.X(), quaternion.Y(), quaternion.Z(),
+                                    estimate.error1, estimate.getAmbiguity())
+                count += 1
+
+            if ring.overwritten(sequence):
+                continue        # The frame changed while detecting, the results can't be trusted
+
+            FRAME.pack_into(message, 0, sequence, timestamp, time.monotonic() - start, count)
+            conn.send_bytes(message, 0, FRAME.size + count * DETECTION.size)
+
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+
+    finally:
+        del images
+        ring.close()
+        conn.close()
+
+
+###############################################################################
+# Robot process
+
+class VisionPipeline:
+    """ Starts and owns the capture and detector processes and the frame ring """
+
+    def __init__(self, config: VisionConfig):
+        self.config = config
+        self.frames = 0
+        self.last_frame = 0
+        self.last_detect_time = 0.0
+
+        self._ring: Optional[SharedFrameRing] = None
+        self._processes: List[multiprocessing.Process] = []
+        self._conn: Optional[Connection] = None
+        self._stop = None
+        self._frame_ready = None
+        self._message = bytearray(MESSAGE_SIZE)
+
+    @property
+    def connection(self) -> Optional[Connection]:
+        """ Readable end of the detection pipe, for event loop add_reader() """
+        return self._conn
+
+    def start(self) -> None:
+        config = self.config
+        if config.record:
+            os.makedirs(config.record, exist_ok=True)
+
+        # 'spawn' so the children don't inherit the robot's HAL and threads
+        context = multiprocessing.get_context("spawn")
+        self._ring = SharedFrameRing.create(config.slots, config.width, config.height)
+        self._stop = context.Event()
+        self._frame_ready = context.Semaphore(0)     # Kept referenced until the children have it
+        receiver, sender = context.Pipe(duplex=False)
+
+        self._processes = [
+            context.Process(target=_capture_main, name="vision-capture", daemon=True,
+                            args=(config, self._ring.name, self._frame_ready, self._stop)),
+            context.Process(target=_detect_main, name="vision-detect", daemon=True,
+                            args=(config, self._ring.name, self._frame_ready, self._stop, sender)),
+        ]
+        for process in self._processes:
+            process.start()
+
+        sender.close()
+        self._conn = receiver
+        logger.info(f"Vision started: {config.source} {config.width}x{config.height} @ {config.fps} fps")
+
+    def read(self) -> Tuple[float, Tuple[TagDetection, ...]]:
+        """
+        Receive one frame's results: (capture timestamp, detections). Blocks until a message
+        arrives, raises EOFError once the detector has exited.
+        """
+        message = self._message
+        self._conn.recv_bytes_into(message)
+        sequence, timestamp, detect_time, count = FRAME.unpack_from(message, 0)
+
+        self.frames += 1
+        self.last_frame = sequence
+        self.last_detect_time = detect_time
+        return timestamp, tuple(
+            TagDetection(timestamp, sequence, *DETECTION.unpack_from(message, FRAME.size + i * DETECTION.size))
+            for i in range(count)
+        )
+
+    def close(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+
+        for process in self._processes:
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+
+def make_config(source: str, **kwargs) -> VisionConfig:
+    """ Vision configuration for a source, sized from the images for a recorded sequence """
+    if not source.startswith(CAMERA_PREFIX):
+        kwargs["width"], kwargs["height"] = image_sequence_size(source)
+    return VisionConfig(source, **kwargs)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the AprilTag vision pipeline and print the detections")
+    parser.add_argument("source", help=f"Directory of {PGM_SUFFIX} images, or '{CAMERA_PREFIX}<device>'")
+    parser.add_argument("--fps", type=float, default=VisionConstants.kCameraFps, help="Frame rate")
+    parser.add_argument("--once", action="store_true", help="Play an image sequence once rather than looping")
+    parser.add_argument("--record", default="", help="Also save the captured frames to this directory")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    pipeline = VisionPipeline(make_config(args.source, fps=args.fps, loop=not args.once, record=args.record))
+    pipeline.start()
+    try:
+        while True:
+            timestamp, detections = pipeline.read()
+            latency = (time.monotonic() - timestamp) * 1000.0
+            tags = ", ".join(f"{d.id}@({d.x:.2f}, {d.y:.2f}, {d.z:.2f})" for d in detections)
+            print(f"frame {pipeline.last_frame}: {latency:6.1f} ms latency, "
+                  f"{pipeline.last_detect_time * 1000.0:5.1f} ms detect  {tags}")
+
+    except (KeyboardInterrupt, EOFError):
+        pass
+
+    finally:
+        pipeline.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
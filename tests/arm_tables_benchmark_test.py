@@ -0,0 +1,127 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Arm lookup table benchmarks.
+#
+#   Compares robot2026.arm_tables against the exact ArmFeedforward and TrapezoidProfile
+#   calculations over the arm's range of motion, through both the scalar lookups used
+#   by ArmSubsystem and the vectorised versions, and times a single lookup against a
+#   single exact call. Errors are checked against a bound, timings are only reported:
+#
+#       python -m robotpy test -- -s -k arm_tables_benchmark
+#
+import json
+import math
+import time
+
+import numpy as np
+from wpimath.controller import ArmFeedforward
+from wpimath.trajectory import TrapezoidProfile
+
+from robot2026.arm_tables import FeedforwardTable, build_profile_tables
+from robot2026.constants import ArmConstants
+
+CALLS = 100_000
+MAX_FEEDFORWARD_ERROR = 1e-4        # Volts
+MAX_PROFILE_ERROR = 1e-4            # Radians and radians/second
+GOALS = (2.0, ArmConstants.kArmOffsetRads)
+
+
+def _per_call_us(function, *args) -> float:
+    """ Best of three runs of CALLS calls """
+    best = math.inf
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6 / CALLS
+
+
+def _constraints() -> TrapezoidProfile.Constraints:
+    return TrapezoidProfile.Constraints(ArmConstants.kMaxVelocityRadPerSecond,
+                                        ArmConstants.kMaxAccelerationRadPerSecSquared)
+
+
+def test_feedforward_table_benchmark():
+    exact = ArmFeedforward(ArmConstants.kSVolts, ArmConstants.kGVolts,
+                           ArmConstants.kVVoltSecondPerRad, ArmConstants.kAVoltSecondSquaredPerRad)
+    table = FeedforwardTable(ArmConstants.kSVolts, ArmConstants.kGVolts, ArmConstants.kVVoltSecondPerRad,
+                             size=ArmConstants.kFeedforwardTableSize)
+
+    positions, velocities = np.meshgrid(np.linspace(-math.pi, math.pi, 401),
+                                        np.linspace(-ArmConstants.kMaxVelocityRadPerSecond,
+                                                    ArmConstants.kMaxVelocityRadPerSecond, 61))
+    positions = positions.ravel()
+    velocities = velocities.ravel()
+
+    expected = np.array([exact.calculate(p, v) for p, v in zip(positions.tolist(), velocities.tolist())])
+    vector_error = float(np.abs(table.calculate_many(positions, velocities) - expected).max())
+    scalar_error = max(abs(table.calculate(p, v) - e)
+                       for p, v, e in zip(positions.tolist(), velocities.tolist(), expected.tolist()))
+
+    exact_us = _per_call_us(exact.calculate, 1.2, 1.5)
+    table_us = _per_call_us(table.calculate, 1.2, 1.5)
+
+    results = {
+        "points": len(expected),
+        "max_error_v": max(vector_error, scalar_error),
+        "exact_us": exact_us,
+        "table_us": table_us,
+        "speedup": exact_us / table_us,
+    }
+    print(f"\nfeedforward: {json.dumps(results, indent=2)}")
+
+    assert results["max_error_v"] <= MAX_FEEDFORWARD_ERROR
+
+
+def test_profile_table_benchmark():
+    constraints = _constraints()
+
+    for table in build_profile_tables(constraints, GOALS, step=ArmConstants.kProfileTableStepSeconds):
+        profile = TrapezoidProfile(constraints)
+        start = TrapezoidProfile.State(table.start, 0.0)
+        goal = TrapezoidProfile.State(table.goal, 0.0)
+
+        times = np.linspace(0.0, table.duration + 0.1, 2001)
+        expected = [profile.calculate(t, start, goal) for t in times.tolist()]
+        positions, velocities = table.sample_many(times)
+
+        position_error = float(np.abs(positions - [s.position for s in expected]).max())
+        velocity_error = float(np.abs(velocities - [s.velocity for s in expected]).max())
+
+        # sample() is what ArmSubsystem.periodic() calls, check it as well as the vectorised build
+        for t, state in zip(times.tolist(), expected):
+            position, velocity = table.sample(t)
+            position_error = max(position_error, abs(position - state.position))
+            velocity_error = max(velocity_error, abs(velocity - state.velocity))
+
+        exact_us = _per_call_us(profile.calculate, 0.3, start, goal)
+        table_us = _per_call_us(table.sample, 0.3)
+
+        results = {
+            "duration_s": table.duration,
+            "max_position_error": position_error,
+            "max_velocity_error": velocity_error,
+            "exact_us": exact_us,
+            "table_us": table_us,
+            "speedup": exact_us / table_us,
+        }
+        print(f"\nprofile {table.start:.2f} -> {table.goal:.2f}: {json.dumps(results, indent=2)}")
+
+        assert position_error <= MAX_PROFILE_ERROR
+        assert velocity_error <= MAX_PROFILE_ERROR
@@ -0,0 +1,106 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Cross event loop call benchmarks.
+#
+#   Compares run_coroutine_in_other_thread() (which blocks an executor thread per call)
+#   with call_coroutine_in_loop() and the batched call_coroutines_in_loop(). The calls
+#   go from a caller loop to a loop running in another thread. Reports one-at-a-time
+#   latency and throughput with many concurrent callers:
+#
+#       python -m robotpy test -- -s -k cross_loop_benchmark
+#
+import asyncio
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from util.asyncio import call_coroutine_in_loop, call_coroutines_in_loop, run_coroutine_in_other_thread
+
+CALLS = int(os.environ.get("ROBOT_BENCH_CALLS", 5000))
+CONCURRENCY = 100
+
+
+async def _work(value: int) -> int:
+    return value
+
+
+@pytest.fixture
+def other_loop():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="bench-other-loop", daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=1.0)
+    loop.close()
+
+
+def _percentile(values, fraction: float) -> float:
+    values = sorted(values)
+    return values[int(fraction * (len(values) - 1))]
+
+
+async def _latency(call) -> dict:
+    """ One call at a time """
+    durations = []
+    for i in range(CALLS):
+        start = time.perf_counter_ns()
+        assert await call(i) == i
+        durations.append((time.perf_counter_ns() - start) / 1000.0)
+
+    return {"p50_us": _percentile(durations, 0.5), "p99_us": _percentile(durations, 0.99)}
+
+
+async def _throughput(call) -> float:
+    """ CONCURRENCY callers at once, calls per second """
+    async def caller(count: int) -> None:
+        for i in range(count):
+            await call(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller(CALLS // CONCURRENCY) for _ in range(CONCURRENCY)))
+    return (CALLS // CONCURRENCY) * CONCURRENCY / (time.perf_counter() - start)
+
+
+async def _batched_throughput(other_loop, batch: int) -> float:
+    start = time.perf_counter()
+    for first in range(0, CALLS, batch):
+        values = range(first, min(first + batch, CALLS))
+        assert await call_coroutines_in_loop((_work(i) for i in values), other_loop) == list(values)
+    return CALLS / (time.perf_counter() - start)
+
+
+def test_cross_loop_benchmark(other_loop):
+    async def run() -> dict:
+        executor_call = lambda i: run_coroutine_in_other_thread(_work(i), other_loop)
+        direct_call = lambda i: call_coroutine_in_loop(_work(i), other_loop)
+
+        return {
+            "executor": {**await _latency(executor_call), "calls_per_s": await _throughput(executor_call)},
+            "direct": {**await _latency(direct_call), "calls_per_s": await _throughput(direct_call)},
+            "batched_100": {"calls_per_s": await _batched_throughput(other_loop, 100)},
+        }
+
+    results = asyncio.run(run())
+    print(f"\ncross loop calls: {json.dumps(results, indent=2)}")
+
+    assert results["direct"]["p50_us"] < results["executor"]["p50_us"]
+    assert results["batched_100"]["calls_per_s"] > results["direct"]["calls_per_s"]
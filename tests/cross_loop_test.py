@@ -0,0 +1,198 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Cross event loop call tests.
+#
+#   Behaviour of call_coroutine_in_loop() and call_coroutines_in_loop() between a
+#   caller loop and a loop running in another thread: results, exceptions,
+#   cancellation of the caller before and after the remote coroutine starts, and
+#   context variables.
+#
+import asyncio
+import contextvars
+import inspect
+import threading
+
+import pytest
+
+from util.asyncio import call_coroutine_in_loop, call_coroutines_in_loop
+
+TIMEOUT = 5.0
+
+request_id: contextvars.ContextVar = contextvars.ContextVar("request_id", default=None)
+
+
+@pytest.fixture
+def other_loop():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="test-other-loop", daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=1.0)
+    loop.close()
+
+
+def _block(loop: asyncio.AbstractEventLoop) -> threading.Event:
+    """ Stall 'loop' until the returned event is set, so nothing queued to it starts """
+    release = threading.Event()
+    blocked = threading.Event()
+
+    def wait() -> None:
+        blocked.set()
+        release.wait(TIMEOUT)
+
+    loop.call_soon_threadsafe(wait)
+    assert blocked.wait(TIMEOUT)
+    return release
+
+
+async def _where() -> threading.Thread:
+    await asyncio.sleep(0)
+    return threading.current_thread()
+
+
+async def _fail(message: str) -> None:
+    await asyncio.sleep(0)
+    raise ValueError(message)
+
+
+def test_result_from_other_loop(other_loop):
+    async def caller():
+        return await call_coroutine_in_loop(_where(), other_loop)
+
+    assert asyncio.run(caller()) is not threading.current_thread()
+
+
+def test_exception_propagates(other_loop):
+    async def caller():
+        with pytest.raises(ValueError, match="remote failure"):
+            await call_coroutine_in_loop(_fail("remote failure"), other_loop)
+
+    asyncio.run(caller())
+
+
+def test_batch_exceptions(other_loop):
+    async def _value(value: int) -> int:
+        return value
+
+    async def caller():
+        with pytest.raises(ValueError, match="second"):
+            await call_coroutines_in_loop([_value(1), _fail("second"), _value(3)], other_loop)
+
+        results = await call_coroutines_in_loop([_value(1), _fail("second"), _value(3)], other_loop,
+                                                return_exceptions=True)
+        assert results[0] == 1 and results[2] == 3
+        assert isinstance(results[1], ValueError)
+
+        assert await call_coroutines_in_loop([], other_loop) == []
+
+    asyncio.run(caller())
+
+
+def test_cancel_before_start_closes_coroutine(other_loop):
+    ran = threading.Event()
+
+    async def remote():
+        ran.set()
+
+    async def caller():
+        coro = remote()
+        release = _block(other_loop)
+        call = asyncio.ensure_future(call_coroutine_in_loop(coro, other_loop))
+        await asyncio.sleep(0.01)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+        # The other loop now gets to the start of the call, after the caller gave up
+        release.set()
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(asyncio.sleep(0), other_loop))
+        return coro
+
+    coro = asyncio.run(caller())
+    assert not ran.is_set()
+    assert inspect.getcoroutinestate(coro) == inspect.CORO_CLOSED
+
+
+def test_cancel_batch_before_start_closes_coroutines(other_loop):
+    async def remote():
+        pass
+
+    async def caller():
+        coros = [remote(), remote()]
+        release = _block(other_loop)
+        call = asyncio.ensure_future(call_coroutines_in_loop(coros, other_loop))
+        await asyncio.sleep(0.01)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+        release.set()
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(asyncio.sleep(0), other_loop))
+        return coros
+
+    for coro in asyncio.run(caller()):
+        assert inspect.getcoroutinestate(coro) == inspect.CORO_CLOSED
+
+
+@pytest.mark.parametrize("batch", [False, True], ids=["single", "batch"])
+def test_cancel_after_start_cancels_remote_task(other_loop, batch):
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    async def remote():
+        started.set()
+        try:
+            await asyncio.sleep(TIMEOUT)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def caller():
+        if batch:
+            call = asyncio.ensure_future(call_coroutines_in_loop([remote()], other_loop))
+        else:
+            call = asyncio.ensure_future(call_coroutine_in_loop(remote(), other_loop))
+
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+    asyncio.run(caller())
+    assert cancelled.wait(TIMEOUT)
+
+
+def test_context_variables_carried_over(other_loop):
+    async def remote():
+        return request_id.get(), threading.current_thread()
+
+    async def caller():
+        request_id.set("tick-42")
+        single = await call_coroutine_in_loop(remote(), other_loop)
+        batch = await call_coroutines_in_loop([remote(), remote()], other_loop)
+        return single, batch
+
+    single, batch = asyncio.run(caller())
+    for value, thread in [single] + batch:
+        assert value == "tick-42"
+        assert thread is not threading.current_thread()
+
+    # The value stays in the caller's context, it does not leak into the other loop's
+    assert asyncio.run_coroutine_threadsafe(remote(), other_loop).result(TIMEOUT)[0] is None
@@ -0,0 +1,123 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Event loop implementation benchmarks.
+#
+#   Runs a RobotService on each available event loop implementation (see --event-loop)
+#   and measures background work throughput on it:
+#
+#     task_spawn          tasks created and run to completion per second
+#     call_soon_threadsafe  callbacks handed over from another thread per second
+#     timers              call_later() timers scheduled and fired per second
+#
+#       python -m robotpy test -- -s -k event_loop_benchmark
+#
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+
+import pytest
+
+from robot2026.service import RobotService
+from util.asyncio import event_loop_init
+
+COUNT = int(os.environ.get("ROBOT_BENCH_LOOP_COUNT", 50_000))
+TIMER_SPREAD = 0.010            # Timers are due over this many seconds
+
+
+def _available(name: str) -> bool:
+    if name == "uvloop":
+        try:
+            import uvloop  # noqa: F401
+        except ImportError:
+            return False
+    return True
+
+
+@pytest.fixture(params=["asyncio", "uvloop"])
+def service(request):
+    if not _available(request.param):
+        pytest.skip(f"{request.param} is not installed")
+
+    assert event_loop_init(request.param) == request.param
+    service = RobotService(argparse.Namespace(debug=False, metrics=False))
+    service.start()
+    assert service.wait_ready(timeout=5.0)
+
+    yield service
+
+    service.stop()
+    event_loop_init("asyncio")
+
+
+async def _task_spawn() -> float:
+    async def nothing() -> None:
+        pass
+
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    tasks = [loop.create_task(nothing()) for _ in range(COUNT)]
+    await asyncio.gather(*tasks)
+    return COUNT / (time.perf_counter() - start)
+
+
+def _call_soon_threadsafe(loop: asyncio.AbstractEventLoop) -> float:
+    done = threading.Event()
+    calls = [0]
+
+    def callback() -> None:
+        calls[0] += 1
+        if calls[0] == COUNT:
+            done.set()
+
+    start = time.perf_counter()
+    for _ in range(COUNT):
+        loop.call_soon_threadsafe(callback)
+    assert done.wait(timeout=60.0)
+    return COUNT / (time.perf_counter() - start)
+
+
+async def _timers() -> float:
+    loop = asyncio.get_running_loop()
+    finished = loop.create_future()
+    fired = [0]
+
+    def callback() -> None:
+        fired[0] += 1
+        if fired[0] == COUNT:
+            finished.set_result(None)
+
+    delays = [random.random() * TIMER_SPREAD for _ in range(COUNT)]
+    start = time.perf_counter()
+    for delay in delays:
+        loop.call_later(delay, callback)
+    await finished
+    return COUNT / (time.perf_counter() - start)
+
+
+def test_event_loop_benchmark(service):
+    results = {
+        "loop": type(service.event_loop).__module__ + "." + type(service.event_loop).__name__,
+        "task_spawn_per_s": service.submit(_task_spawn()).result(timeout=60.0),
+        "call_soon_threadsafe_per_s": _call_soon_threadsafe(service.event_loop),
+        "timers_per_s": service.submit(_timers()).result(timeout=60.0),
+    }
+    print(f"\nevent loop: {json.dumps(results, indent=2)}")
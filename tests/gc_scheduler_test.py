@@ -0,0 +1,165 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Deterministic garbage collection scheduler tests.
+#
+import gc
+
+import pytest
+
+import util.gc_scheduler as gc_scheduler
+from util.gc_scheduler import GCScheduler
+
+PERIOD = 0.020
+MIN_SLACK = 0.004
+
+
+class Clock:
+    """ Stands in for time.perf_counter() """
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(gc_scheduler.time, "perf_counter", clock)
+    return clock
+
+
+@pytest.fixture
+def scheduler():
+    threshold = gc.get_threshold()
+    scheduler = GCScheduler("deterministic", period=PERIOD, min_slack=MIN_SLACK)
+    yield scheduler
+
+    gc.callbacks.remove(scheduler._on_gc)
+    gc.set_threshold(*threshold)
+    gc.unfreeze()
+    gc.enable()
+
+
+class _Node:
+    pass
+
+
+def _make_garbage(count: int) -> None:
+    """ Unreachable reference cycles, only the cyclic collector frees them """
+    for _ in range(count):
+        node = _Node()
+        node.self = node
+
+
+def _collections(scheduler: GCScheduler, generation: int) -> int:
+    return scheduler.stats()[f"gen{generation}"]["collections"]
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        GCScheduler("sometimes")
+
+
+def test_freeze(scheduler):
+    kept = [[] for _ in range(100)]
+    frozen = gc.get_freeze_count()
+
+    scheduler.freeze()
+
+    assert gc.get_freeze_count() >= frozen + len(kept)
+    assert _collections(scheduler, 2) == 1
+    assert scheduler.stats()["gen2"]["unscheduled"] == 0
+
+
+def test_disabled_while_enabled(scheduler):
+    scheduler.on_enabled()
+    assert not gc.isenabled()
+
+    scheduler.on_disabled()
+    assert gc.isenabled()
+
+
+def test_auto_mode_leaves_gc_alone():
+    scheduler = GCScheduler("auto")
+    try:
+        scheduler.on_enabled()
+        assert gc.isenabled()
+
+        frozen = gc.get_freeze_count()
+        scheduler.freeze()
+        assert gc.get_freeze_count() == frozen
+
+    finally:
+        gc.callbacks.remove(scheduler._on_gc)
+
+
+def test_collect_in_slack_needs_min_slack(scheduler, clock):
+    scheduler.on_enabled()
+    gc.set_threshold(10, 1000, 1000)
+    _make_garbage(50)
+
+    # Not enough of the period left
+    scheduler.loop_start()
+    clock.now += PERIOD - MIN_SLACK / 2
+    scheduler.collect_in_slack()
+    assert _collections(scheduler, 0) == 0
+
+    # Past the deadline, e.g. collecting from a tick that overran into the next one
+    clock.now += PERIOD
+    scheduler.collect_in_slack()
+    assert _collections(scheduler, 0) == 0
+
+    scheduler.loop_start()
+    clock.now += PERIOD - MIN_SLACK * 1.5
+    scheduler.collect_in_slack()
+    assert _collections(scheduler, 0) == 1
+    assert scheduler.stats()["gen0"]["unscheduled"] == 0
+
+
+def test_collect_in_slack_only_when_due(scheduler, clock):
+    scheduler.on_enabled()
+    gc.collect(0)
+    gc.set_threshold(100000, 1000, 1000)
+    collected = _collections(scheduler, 0), _collections(scheduler, 1)
+
+    scheduler.loop_start()
+    scheduler.collect_in_slack()
+    assert (_collections(scheduler, 0), _collections(scheduler, 1)) == collected
+
+
+def test_older_generation_needs_twice_the_slack(scheduler, clock):
+    scheduler.on_enabled()
+    gc.set_threshold(10, 1, 1000)
+    _make_garbage(50)
+    gc.collect(0)
+    _make_garbage(50)
+    young = _collections(scheduler, 0)
+
+    # Enough for the young generation only
+    scheduler.loop_start()
+    clock.now += PERIOD - MIN_SLACK * 1.5
+    scheduler.collect_in_slack()
+    assert _collections(scheduler, 1) == 0
+    assert _collections(scheduler, 0) == young + 1
+
+    _make_garbage(50)
+    scheduler.loop_start()
+    scheduler.collect_in_slack()
+    assert _collections(scheduler, 1) == 1
@@ -0,0 +1,155 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Scheduler loop benchmarks.
+#
+#   Boots MyRobot in simulation, runs a few thousand ticks in each mode and records
+#   the wall-clock duration of all of robotPeriodic() (sensor capture, subsystem
+#   work, scheduler and output flush), overruns of the 20 mS period and allocations.
+#   The results are compared against 'loop_benchmark_baseline.json' and any metric
+#   that regresses beyond the tolerance fails the run.
+#
+#   Simulated time is stepped, so the wall-clock spacing of ticks says nothing about
+#   loop jitter on the robot and is not measured.
+#
+#   To (re)create the baseline on the reference machine:
+#
+#       ROBOT_BENCH_UPDATE=1 python -m robotpy test -- -k loop_benchmark
+#
+#   Until a baseline is committed the comparison is skipped and only the results
+#   are reported.
+#
+import gc
+import json
+import os
+import sys
+import time
+from array import array
+from pathlib import Path
+
+import pytest
+
+BASELINE_FILE = Path(__file__).parent / "loop_benchmark_baseline.json"
+UPDATE_BASELINE = os.environ.get("ROBOT_BENCH_UPDATE", "").strip() == "1"
+
+TICKS = int(os.environ.get("ROBOT_BENCH_TICKS", 2000))
+PERIOD = 0.020
+TOLERANCE = float(os.environ.get("ROBOT_BENCH_TOLERANCE", 0.25))   # Allowed fractional regression
+SLACK = {                                                            # ... plus an absolute allowance
+    "tick_p50_us": 5.0,
+    "tick_p99_us": 20.0,
+    "overruns": 1.0,
+    "alloc_blocks_per_tick": 1.0,
+    "gc_gen0_per_1k_ticks": 2.0,
+}
+
+
+class TickRecorder:
+    """ Records the wall-clock duration and allocated-block delta of each robotPeriodic() """
+
+    def __init__(self, robot, capacity: int):
+        self._robot = robot
+        self._capacity = capacity
+        self.durations = array('q', [0]) * capacity
+        self.blocks = array('q', [0]) * capacity
+        self.count = 0
+
+    def __enter__(self) -> "TickRecorder":
+        periodic = self._robot.robotPeriodic
+        perf_counter_ns = time.perf_counter_ns
+        allocated_blocks = sys.getallocatedblocks
+
+        def timed_periodic():
+            count = self.count
+            if count >= self._capacity:
+                return periodic()
+
+            blocks = allocated_blocks()
+            start = perf_counter_ns()
+            periodic()
+            self.durations[count] = perf_counter_ns() - start
+            self.blocks[count] = allocated_blocks() - blocks
+            self.count = count + 1
+
+        self._gc_start = gc.get_stats()[0]["collections"]
+        self._robot.robotPeriodic = timed_periodic
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        vars(self._robot).pop("robotPeriodic", None)
+        self._gc_collections = gc.get_stats()[0]["collections"] - self._gc_start
+
+    def results(self) -> dict:
+        count = self.count
+        durations = sorted(self.durations[:count])
+
+        return {
+            "ticks": count,
+            "tick_p50_us": durations[(count - 1) // 2] / 1000.0,
+            "tick_p99_us": durations[int(0.99 * (count - 1))] / 1000.0,
+            "overruns": sum(1 for duration in durations if duration > PERIOD * 1e9),
+            "alloc_blocks_per_tick": sum(self.blocks[:count]) / count,
+            "gc_gen0_per_1k_ticks": 1000.0 * self._gc_collections / count,
+        }
+
+
+def _load_baseline() -> dict:
+    if BASELINE_FILE.exists():
+        return json.loads(BASELINE_FILE.read_text())
+    return {}
+
+
+def _save_baseline(mode: str, results: dict) -> None:
+    baseline = _load_baseline()
+    baseline[mode] = results
+    BASELINE_FILE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.mark.parametrize("mode", ["disabled", "teleop", "autonomous"])
+def test_loop_benchmark(control, robot, mode):
+    enabled = mode != "disabled"
+    autonomous = mode == "autonomous"
+
+    with control.run_robot():
+        try:
+            # Let the robot finish robotInit and settle into the mode before measuring
+            control.step_timing(seconds=1.0, autonomous=autonomous, enabled=enabled)
+
+            with TickRecorder(robot, TICKS) as recorder:
+                control.step_timing(seconds=TICKS * PERIOD, autonomous=autonomous, enabled=enabled)
+
+        finally:
+            if robot.service:
+                robot.service.stop()
+
+    results = recorder.results()
+    print(f"\n{mode}: {json.dumps(results, indent=2)}")
+    assert results["ticks"] >= TICKS * 0.9, "Scheduler did not run the expected number of ticks"
+
+    if UPDATE_BASELINE:
+        _save_baseline(mode, results)
+        return
+
+    baseline = _load_baseline().get(mode)
+    if baseline is None:
+        pytest.skip(f"No '{mode}' loop benchmark baseline. Run with ROBOT_BENCH_UPDATE=1 to create one")
+
+    regressions = [f"{metric}: {results[metric]:.2f} > baseline {baseline.get(metric, 0.0):.2f}"
+                   for metric, slack in SLACK.items()
+                   if results[metric] > baseline.get(metric, 0.0) * (1.0 + TOLERANCE) + slack]
+
+    assert not regressions, f"{mode} loop benchmark regressed: " + "; ".join(regressions)
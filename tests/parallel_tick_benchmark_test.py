@@ -0,0 +1,110 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Parallel tick benchmarks.
+#
+#   Builds RobotContainer with the parallel tick forced on, so the tick holds the
+#   robot's real per-tick work (Drive.periodic() and Arm.periodic() with the arm
+#   moving to a goal), and times container.tick.run() for a simulated encoder
+#   trajectory. The same is then done with the tick closed, which runs the items in
+#   order on the calling thread as on a GIL build. Both must produce the same drive
+#   pose and arm output every tick.
+#
+#   The items are small, so the queue handoff to the worker thread can cost more than
+#   the work it moves. Only a free-threaded Python (GIL disabled) can show a speedup:
+#
+#       python -m robotpy test -- -s -k parallel_tick_benchmark
+#
+import gc
+import json
+import statistics
+import time
+
+import hal
+from commands2 import CommandScheduler
+from wpilib.simulation import EncoderSim, pauseTiming, restartTiming
+
+from robot2026.robotcontainer import RobotContainer
+from util.parallel import free_threaded
+
+TICKS = 500
+PERIOD = 0.020
+
+
+def _run(parallel: bool):
+    CommandScheduler.resetInstance()
+    container = RobotContainer(parallel=True)
+    tick = container.tick
+    if not parallel:
+        tick.close()
+
+    drive = container.robot_drive
+    arm = container.robot_arm
+    left, right = EncoderSim(drive.left_encoder), EncoderSim(drive.right_encoder)
+    arm_encoder = EncoderSim(arm.encoder)
+    container.moveArm(2.0)
+
+    outputs = []
+    times = []
+    try:
+        for index in range(TICKS):
+            left.setDistance(index * PERIOD * 1.0)
+            right.setDistance(index * PERIOD * 1.1)
+            arm_encoder.setDistance(min(index * PERIOD * 0.5, 1.0))
+            container.captureSensors()
+
+            start = time.perf_counter()
+            tick.run()
+            times.append((time.perf_counter() - start) * 1e6)
+
+            container.flushOutputs()
+            pose = drive.getPose()
+            outputs.append((pose.X(), pose.Y(), arm.output_voltage))
+
+        stats = tick.stats()
+    finally:
+        tick.close()
+        CommandScheduler.resetInstance()
+        del container, drive, arm, left, right, arm_encoder
+        gc.collect()
+
+    times.sort()
+    return outputs, {
+        "p50_us": statistics.median(times),
+        "p99_us": times[int(len(times) * 0.99) - 1],
+        "items": stats,
+    }
+
+
+def test_parallel_tick_benchmark():
+    assert hal.initialize(500, 0)
+    restartTiming()
+    pauseTiming()
+
+    parallel_outputs, parallel = _run(parallel=True)
+    sequential_outputs, sequential = _run(parallel=False)
+
+    results = {
+        "free_threaded": free_threaded(),
+        "sequential": sequential,
+        "parallel": parallel,
+        "speedup": sequential["p50_us"] / parallel["p50_us"],
+    }
+    print(f"\nparallel tick: {json.dumps(results, indent=2)}")
+
+    assert len(parallel["items"]) == 2, "Expected the drive and arm periodic() work in the tick"
+    assert parallel_outputs == sequential_outputs
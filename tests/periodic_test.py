@@ -0,0 +1,187 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# PeriodicScheduler tests.
+#
+#   Run on an event loop with a virtual clock: whenever the loop would wait for
+#   its next timer, the clock jumps straight to it. A callback "takes time" by
+#   advancing the clock itself, so start times, missed deadlines and skipped
+#   cycles are exact.
+#
+import asyncio
+
+import pytest
+
+from util.periodic import PeriodicScheduler, PeriodicTask
+
+START = 1000.0
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """ Event loop whose time() only advances while it would otherwise sleep """
+
+    def __init__(self):
+        super().__init__()
+        self.now = START
+        select = self._selector.select
+
+        def virtual_select(timeout=None):
+            if timeout is not None and timeout > 0:
+                self.now += timeout
+            return select(0)
+
+        self._selector.select = virtual_select
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def loop():
+    loop = VirtualClockLoop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    asyncio.set_event_loop(None)
+    loop.close()
+
+
+def _run(loop: VirtualClockLoop, seconds: float, setup) -> PeriodicScheduler:
+    """ Create a scheduler, register tasks with setup(scheduler) and run for 'seconds' """
+    async def main() -> PeriodicScheduler:
+        scheduler = PeriodicScheduler(loop)
+        setup(scheduler)
+        await asyncio.sleep(seconds)
+        await scheduler.stop()
+        return scheduler
+
+    return loop.run_until_complete(main())
+
+
+def _recorder(loop: VirtualClockLoop, starts: list, duration: float = 0.0):
+    def callback() -> None:
+        starts.append(loop.time() - START)
+        loop.now += duration
+    return callback
+
+
+def test_runs_on_absolute_times_without_drift(loop):
+    starts = []
+    tasks = {}
+
+    def setup(scheduler):
+        tasks["fast"] = scheduler.add("fast", _recorder(loop, starts, duration=0.003), 0.010)
+
+    _run(loop, 1.0, setup)
+    task = tasks["fast"]
+
+    # Every run starts on the 10 mS grid even though each one takes 3 mS
+    assert task.runs == len(starts) >= 99
+    assert starts == pytest.approx([index * 0.010 for index in range(len(starts))], abs=1e-9)
+    assert (task.missed, task.skipped, task.errors) == (0, 0, 0)
+    assert task.max_duration == pytest.approx(0.003)
+
+
+def test_phase_offsets_tasks_with_the_same_period(loop):
+    first, second = [], []
+
+    def setup(scheduler):
+        scheduler.add("first", _recorder(loop, first), 0.100)
+        scheduler.add("second", _recorder(loop, second), 0.100, phase=0.030)
+
+    _run(loop, 0.45, setup)
+
+    assert first == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4], abs=1e-9)
+    assert second == pytest.approx([0.03, 0.13, 0.23, 0.33, 0.43], abs=1e-9)
+
+
+def test_late_finish_counts_missed_deadline(loop):
+    starts = []
+    tasks = {}
+
+    def setup(scheduler):
+        tasks["slow"] = scheduler.add("slow", _recorder(loop, starts, duration=0.015), 0.020, deadline=0.010)
+
+    _run(loop, 0.19, setup)
+    task = tasks["slow"]
+
+    # Over the deadline, but finished before the next start so nothing is skipped
+    assert task.runs == 10
+    assert task.missed == task.runs
+    assert task.skipped == 0
+    assert starts == pytest.approx([index * 0.020 for index in range(10)], abs=1e-9)
+
+
+def test_overrun_skips_cycles_and_stays_on_the_grid(loop):
+    starts = []
+    tasks = {}
+
+    def setup(scheduler):
+        tasks["overrun"] = scheduler.add("overrun", _recorder(loop, starts, duration=0.050), 0.020)
+
+    _run(loop, 0.29, setup)
+    task = tasks["overrun"]
+
+    # Each 50 mS run covers its own 20 mS cycle plus two more, which are skipped
+    assert starts == pytest.approx([0.0, 0.06, 0.12, 0.18, 0.24], abs=1e-9)
+    assert task.runs == 5
+    assert task.missed == 5
+    assert task.skipped == 2 * 5
+
+
+def test_coroutines_and_errors(loop):
+    tasks = {}
+
+    async def sleeper() -> None:
+        await asyncio.sleep(0.004)
+
+    def failing() -> None:
+        raise RuntimeError("failed")
+
+    def setup(scheduler):
+        tasks["sleeper"] = scheduler.add("sleeper", sleeper, 0.010, deadline=0.002)
+        tasks["failing"] = scheduler.add("failing", failing, 0.050)
+
+    scheduler = _run(loop, 0.095, setup)
+
+    # The coroutine's own sleep counts towards its run time
+    assert tasks["sleeper"].runs == 10
+    assert tasks["sleeper"].missed == 10
+    assert tasks["sleeper"].stats()["mean_duration_ms"] == pytest.approx(4.0)
+    assert tasks["failing"].errors == tasks["failing"].runs == 2
+    assert scheduler.names() == []
+
+
+def test_invalid_tasks():
+    with pytest.raises(ValueError):
+        PeriodicTask("zero", lambda: None, 0.0)
+    with pytest.raises(ValueError):
+        PeriodicTask("phase", lambda: None, 0.1, phase=0.1)
+
+
+def test_duplicate_names_and_remove(loop):
+    async def main():
+        scheduler = PeriodicScheduler(loop)
+        scheduler.add("task", lambda: None, 0.1)
+        with pytest.raises(ValueError):
+            scheduler.add("task", lambda: None, 0.1)
+
+        task = scheduler.remove("task")
+        await asyncio.sleep(0)
+        assert not task.running
+        assert scheduler.get("task") is None
+
+    loop.run_until_complete(main())
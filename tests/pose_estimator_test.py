@@ -0,0 +1,158 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Latency compensated pose estimator tests.
+#
+#   Drives DifferentialOdometry along a known path and checks that PoseEstimator
+#   gives the same estimate whatever order measurements arrive in, keeps its
+#   correction once measurements are older than the odometry history (but not
+#   across an odometry reset), and does the same work per measurement however long
+#   the robot has been running.
+#
+import math
+
+import pytest
+from wpimath.geometry import Pose2d
+
+from robot2026.odometry import DifferentialOdometry
+from robot2026.pose_estimator import PoseEstimator
+
+TRACK_WIDTH = 0.7
+PERIOD = 0.020
+STD = (0.1, 0.1)                # Equal state and vision deviations, a gain of 0.5
+
+
+def make(history: int = 1024, updates: int = 16):
+    odometry = DifferentialOdometry(TRACK_WIDTH, capacity=history)
+    return odometry, PoseEstimator(odometry, capacity=updates, state_std=STD, vision_std=STD)
+
+
+def drive(odometry: DifferentialOdometry, ticks: int, start: int = 0, curve: float = 0.01) -> float:
+    """ Drive an arc (or straight with curve=0), one update per tick. Returns the last timestamp """
+    for tick in range(start, start + ticks):
+        odometry.update(tick * PERIOD, tick * 0.02, tick * (0.02 + curve * 0.02))
+    return (start + ticks - 1) * PERIOD
+
+
+def assert_pose(actual: Pose2d, expected: Pose2d, tolerance: float = 1e-9):
+    assert actual.X() == pytest.approx(expected.X(), abs=tolerance)
+    assert actual.Y() == pytest.approx(expected.Y(), abs=tolerance)
+    assert actual.rotation().radians() == pytest.approx(expected.rotation().radians(), abs=tolerance)
+
+
+def test_out_of_order_matches_in_order():
+    measurements = [(0.5, 0.3, 0.05), (1.0, 0.6, 0.15), (1.5, 0.95, 0.3), (1.9, 1.2, 0.45)]
+
+    in_order_odometry, in_order = make()
+    drive(in_order_odometry, 100)
+    for measurement in measurements:
+        assert in_order.add_vision_measurement(*measurement)
+
+    # The oldest measurement arrives last, and another one in between the rest
+    late_odometry, late = make()
+    drive(late_odometry, 100)
+    for index in (1, 3, 2, 0):
+        assert late.add_vision_measurement(*measurements[index])
+
+    assert_pose(late.pose(), in_order.pose())
+    for timestamp in (0.4, 0.5, 0.75, 1.2, 1.5, 1.95):
+        assert_pose(late.pose_at(timestamp), in_order.pose_at(timestamp))
+
+    # And the correction moved the estimate off the odometry
+    assert abs(in_order.pose().X() - in_order_odometry.pose().X()) > 0.01
+
+
+def test_measurement_outside_history_is_rejected():
+    odometry, estimator = make(history=50)
+    drive(odometry, 100)
+
+    assert not estimator.add_vision_measurement(0.5, 1.0, 1.0)
+    assert estimator.rejected == 1
+    assert_pose(estimator.pose(), odometry.pose())
+
+
+def test_anchor_survives_history_expiry():
+    odometry, estimator = make(history=50)
+    drive(odometry, 50, curve=0.0)
+
+    # Straight along x, so the correction is a fixed offset of half the innovation
+    measured_at = 0.5
+    assert estimator.add_vision_measurement(measured_at, odometry.pose_at(measured_at).X() + 1.0, 0.0)
+    offset = estimator.pose().X() - odometry.pose().X()
+    assert offset == pytest.approx(0.5)
+
+    # Long enough that the measurement is no longer covered by the odometry history
+    last = drive(odometry, 200, start=50, curve=0.0)
+    assert odometry.history.oldest_timestamp() > measured_at
+    assert estimator.pose().X() - odometry.pose().X() == pytest.approx(offset)
+
+    # A measurement agreeing with the current estimate changes nothing. Without the anchor it
+    # would be blended with the raw odometry and lose half the offset
+    estimate = estimator.pose_at(last)
+    assert estimator.add_vision_measurement(last, estimate.X(), estimate.Y())
+    assert estimator.pose().X() - odometry.pose().X() == pytest.approx(offset)
+
+
+def test_reset_discards_anchor():
+    odometry, estimator = make(history=50)
+    drive(odometry, 50, curve=0.0)
+    assert estimator.add_vision_measurement(0.5, odometry.pose_at(0.5).X() + 1.0, 0.0)
+    last = drive(odometry, 200, start=50, curve=0.0)
+
+    odometry.reset(Pose2d(2.0, 1.0, 0.0))
+    last = drive(odometry, 10, start=int(round(last / PERIOD)) + 1, curve=0.0)
+
+    # The old correction no longer applies
+    assert_pose(estimator.pose(), odometry.pose())
+
+    # And a new measurement is blended with the odometry, not the pre-reset estimate
+    odometry_pose = odometry.pose_at(last)
+    assert estimator.add_vision_measurement(last, odometry_pose.X() + 1.0, odometry_pose.Y())
+    assert estimator.pose().X() - odometry.pose().X() == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("ticks", [200, 2000, 20000])
+def test_work_per_measurement_is_flat(ticks):
+    odometry, estimator = make(history=ticks, updates=16)
+    drive(odometry, ticks)
+
+    # Count the odometry history lookups and corrections each measurement costs
+    counts = {"lookups": 0, "corrections": 0}
+    sample_at = odometry.history.sample_at
+    correct = estimator._correct
+
+    def counted_sample_at(timestamp):
+        counts["lookups"] += 1
+        return sample_at(timestamp)
+
+    def counted_correct(*args):
+        counts["corrections"] += 1
+        return correct(*args)
+
+    odometry.history.sample_at = counted_sample_at
+    estimator._correct = counted_correct
+
+    # In order, one measurement per tick over the last 100 ticks
+    first = ticks - 100
+    for tick in range(first, ticks):
+        assert estimator.add_vision_measurement(tick * PERIOD, math.sin(tick), math.cos(tick))
+    assert counts == {"lookups": 100, "corrections": 100}
+
+    # A late measurement re-applies only the updates after it
+    counts.update(lookups=0, corrections=0)
+    assert estimator.add_vision_measurement((ticks - 3.5) * PERIOD, 0.0, 0.0)
+    assert counts == {"lookups": 1, "corrections": 4}
@@ -0,0 +1,157 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Record-and-replay regression test.
+#
+#   Drives a short simulated match (disabled, autonomous, then teleop with the arm
+#   moved between its A and B goals) through RobotContainer, recording it with
+#   RobotDataRecorder exactly as MyRobot does, then replays the log with
+#   robot2026.replay and checks that every output is reproduced in under a second.
+#
+import asyncio
+import gc
+import math
+from pathlib import Path
+
+import hal
+import pytest
+from commands2 import CommandScheduler
+from wpilib.simulation import DriverStationSim, EncoderSim, pauseTiming, restartTiming, stepTiming
+
+from robot2026 import constants
+from robot2026.datalog import LEFT_Y_AXIS, RIGHT_X_AXIS, ROBOT_SCHEMA, RobotDataRecorder
+from robot2026.replay import LogReplay
+from robot2026.robotcontainer import RobotContainer
+from util.datalog import FILE_SUFFIX, DataLogger
+
+PERIOD = 0.020
+A_BUTTON = 1 << 0
+B_BUTTON = 1 << 1
+
+# (ticks, enabled, autonomous, buttons)
+MATCH = [
+    (10, False, False, 0),
+    (50, True, True, 0),
+    (40, True, False, A_BUTTON),
+    (40, True, False, 0),
+    (40, True, False, B_BUTTON),
+    (20, True, False, 0),
+    (10, False, False, 0),
+]
+
+
+@pytest.fixture(autouse=True)
+def simulation():
+    assert hal.initialize(500, 0)
+    restartTiming()
+    pauseTiming()
+    yield
+    CommandScheduler.resetInstance()
+    gc.collect()
+
+
+def record_match(directory: Path, **config) -> Path:
+    """ Runs MATCH through a RobotContainer, ticking it the way MyRobot.robotPeriodic() does """
+    CommandScheduler.resetInstance()
+    scheduler = CommandScheduler.getInstance()
+    container = RobotContainer(**config)
+    asyncio.run(container.autos.prepare())
+    recorder = RobotDataRecorder(container, str(directory))
+
+    drive = container.robot_drive
+    left, right = EncoderSim(drive.left_encoder), EncoderSim(drive.right_encoder)
+    arm = EncoderSim(container.robot_arm.encoder)
+    port = constants.OIConstants.kDriverControllerPort
+    DriverStationSim.setJoystickAxisCount(port, 6)
+    DriverStationSim.setJoystickButtonCount(port, 10)
+
+    autonomous_command = None
+    mode = None
+    tick = 0
+
+    try:
+        for ticks, enabled, autonomous, buttons in MATCH:
+            for _ in range(ticks):
+                stepTiming(PERIOD)
+                tick += 1
+
+                DriverStationSim.setEnabled(enabled)
+                DriverStationSim.setAutonomous(autonomous)
+                DriverStationSim.setTest(False)
+                DriverStationSim.setJoystickAxis(port, LEFT_Y_AXIS, -0.5 * math.sin(tick * 0.05))
+                DriverStationSim.setJoystickAxis(port, RIGHT_X_AXIS, 0.25 * math.cos(tick * 0.03))
+                DriverStationSim.setJoystickButtons(port, buttons)
+                DriverStationSim.notifyNewData()
+
+                # Crude plant so the controllers see their outputs move the sensors
+                left_rate = drive.left1.get() * constants.AutoConstants.kMaxSpeedMetersPerSecond
+                right_rate = drive.right1.get() * constants.AutoConstants.kMaxSpeedMetersPerSecond
+                left.setRate(left_rate)
+                right.setRate(right_rate)
+                left.setDistance(left.getDistance() + left_rate * PERIOD)
+                right.setDistance(right.getDistance() + right_rate * PERIOD)
+                arm.setDistance(arm.getDistance() + container.robot_arm.output_voltage * 0.001)
+
+                if (enabled, autonomous, False) != mode:
+                    mode = (enabled, autonomous, False)
+                    autonomous_command = LogReplay._mode_changed(mode, container, scheduler, autonomous_command)
+
+                container.captureSensors()
+                container.runSubsystemWork()
+                scheduler.run()
+                container.flushOutputs()
+                recorder.record()
+
+    finally:
+        recorder.close()
+        CommandScheduler.resetInstance()
+        container.tick.close()
+        del container, drive, left, right, arm
+        gc.collect()
+
+    (path,) = directory.glob(f"*{FILE_SUFFIX}")
+    return path
+
+
+@pytest.mark.parametrize("config", [{}, {"arm_tables": True}], ids=["default", "arm_tables"])
+def test_replay_reproduces_match(tmp_path, config):
+    path = record_match(tmp_path, **config)
+
+    result = LogReplay().run(str(path))
+    print(f"\n{path.name}: {result.ticks} ticks in {result.elapsed:.3f}s, max error {result.max_error}")
+
+    assert result.ticks == sum(ticks for ticks, *_ in MATCH)
+    assert result.skipped is None
+    assert result.first_mismatch is None, f"Replay diverged at record {result.first_mismatch}"
+    assert result.elapsed < 1.0
+
+
+@pytest.mark.parametrize("container, reason", [
+    (None, "no container configuration"),
+    ({"sensor_rate": 250.0, "arm_tables": False, "vision": False, "parallel": False}, "sensor sampler"),
+    ({"sensor_rate": 0.0, "arm_tables": False, "vision": True, "parallel": False}, "vision"),
+])
+def test_replay_skips_unreproducible_logs(tmp_path, container, reason):
+    logger = DataLogger(str(tmp_path), ROBOT_SCHEMA, metadata={"container": container} if container else None)
+    logger.record(*([0] * len(ROBOT_SCHEMA.fields)))
+    logger.close()
+    (path,) = tmp_path.glob(f"*{FILE_SUFFIX}")
+
+    result = LogReplay().run(str(path))
+
+    assert not result.passed
+    assert reason in result.skipped
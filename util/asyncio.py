@@ -21,7 +21,7 @@ import logging
 import sys
 import threading
 import traceback
-from typing import Set, Union
+from typing import Any, Callable, Coroutine, Iterable, List, Optional, Set, Union
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +29,11 @@ _asyncio_no_task_names = sys.hexversion < 0x03080000
 _background_lock = threading.Lock()
 _background_tasks: Set[asyncio.Task] = set()
 
+# Event loop implementation used by new_event_loop(), see event_loop_init()
+EVENT_LOOPS = ("auto", "asyncio", "uvloop")
+_event_loop_name = "asyncio"
+_event_loop_factory: Callable[[], asyncio.AbstractEventLoop] = asyncio.new_event_loop
+
 
 class ShutdownException(Exception):
     """ Used for fast/graceful exit from asyncio/future calls to signal controlled application shutdown """
@@ -48,6 +53,40 @@ def get_tid() -> int:
     return libc.syscall(186)
 
 
+def event_loop_init(name: str = "auto") -> str:
+    """
+    Choose the event loop implementation for new_event_loop(): 'uvloop', 'asyncio' (the
+    standard library loop) or 'auto' (uvloop if it is installed). A requested uvloop
+    that is not installed falls back to asyncio. Returns the name of the one chosen.
+    """
+    global _event_loop_name, _event_loop_factory
+
+    if name not in EVENT_LOOPS:
+        raise ValueError(f"Unknown event loop '{name}', expected one of {EVENT_LOOPS}")
+
+    _event_loop_name, _event_loop_factory = "asyncio", asyncio.new_event_loop
+    if name in ("auto", "uvloop"):
+        try:
+            import uvloop
+            _event_loop_name, _event_loop_factory = "uvloop", uvloop.new_event_loop
+
+        except ImportError:
+            if name == "uvloop":
+                logger.warning("uvloop requested but it is not installed, using the asyncio event loop")
+
+    logger.info(f"Event loop: {_event_loop_name}")
+    return _event_loop_name
+
+
+def event_loop_name() -> str:
+    return _event_loop_name
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """ Create an event loop of the implementation chosen by event_loop_init() """
+    return _event_loop_factory()
+
+
 def _task_cleanup(task):
     # An event_loop only keeps weak references to tasks. To prevent garbage collection
     # from not cleaning up, a reference is maintained at creation and released here.
@@ -116,3 +155,89 @@ async def run_coroutine_in_other_thread(coro, other_loop, thread_pool=None, our_
 
     except ShutdownException:
         return None
+
+
+def _copy_future_state(source: asyncio.Future, destination: asyncio.Future) -> None:
+    """ Runs on the destination's loop: complete 'destination' the same way 'source' completed """
+    if destination.cancelled():
+        return
+    if source.cancelled():
+        destination.cancel()
+    elif source.exception() is not None:
+        destination.set_exception(source.exception())
+    else:
+        destination.set_result(source.result())
+
+
+async def call_coroutine_in_loop(coro: Coroutine, other_loop: asyncio.AbstractEventLoop,
+                                 our_loop: Optional[asyncio.AbstractEventLoop] = None) -> Any:
+    """
+    Run a coroutine on other_loop (running in another thread) and return its result.
+
+    Unlike run_coroutine_in_other_thread(), no thread is blocked while waiting. The
+    coroutine is started with one call_soon_threadsafe() to other_loop, and its task
+    completes a future on our loop directly with one call_soon_threadsafe() back. The
+    caller's context variables are carried over, and cancelling the caller cancels
+    the coroutine.
+    """
+    loop = our_loop or asyncio.get_running_loop()
+    if other_loop is loop:
+        return await coro
+
+    result = loop.create_future()
+    started: List[asyncio.Task] = []
+
+    def start() -> None:
+        if result.done():                   # Cancelled before it could start
+            coro.close()
+            return
+        task = other_loop.create_task(coro)
+        started.append(task)
+        task.add_done_callback(lambda done: loop.call_soon_threadsafe(_copy_future_state, done, result))
+
+    other_loop.call_soon_threadsafe(start)
+    try:
+        return await result
+
+    except asyncio.CancelledError:
+        other_loop.call_soon_threadsafe(lambda: started and started[0].cancel())
+        raise
+
+
+async def call_coroutines_in_loop(coros: Iterable[Coroutine], other_loop: asyncio.AbstractEventLoop,
+                                  our_loop: Optional[asyncio.AbstractEventLoop] = None,
+                                  return_exceptions: bool = False) -> List[Any]:
+    """
+    Batched call_coroutine_in_loop(): run many coroutines on other_loop concurrently and
+    return their results in order, as asyncio.gather() would.
+
+    The whole batch costs one handoff to other_loop and one back, however many
+    coroutines there are.
+    """
+    coros = list(coros)
+    if not coros:
+        return []
+
+    loop = our_loop or asyncio.get_running_loop()
+    if other_loop is loop:
+        return await asyncio.gather(*coros, return_exceptions=return_exceptions)
+
+    result = loop.create_future()
+    started: List[asyncio.Future] = []
+
+    def start() -> None:
+        if result.done():
+            for coro in coros:
+                coro.close()
+            return
+        gathered = asyncio.gather(*coros, return_exceptions=return_exceptions)
+        started.append(gathered)
+        gathered.add_done_callback(lambda done: loop.call_soon_threadsafe(_copy_future_state, done, result))
+
+    other_loop.call_soon_threadsafe(start)
+    try:
+        return await result
+
+    except asyncio.CancelledError:
+        other_loop.call_soon_threadsafe(lambda: started and started[0].cancel())
+        raise
@@ -0,0 +1,220 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Per-command execution budgets and watchdog.
+#
+#   A command declares how long one call of its initialize(), execute() or end()
+#   may take with with_budget(). The watchdog shadows those methods on each
+#   command instance (as the loop profiler does), records every call into a
+#   per-command cost histogram and counts the calls that go over budget. Commands
+#   without a budget of their own get the watchdog's default.
+#
+#   A command that overruns 'strikes' calls in a row is a repeat offender and is
+#   logged. With throttling enabled, an offender's execute() then only runs every
+#   'throttle' ticks until an execute() comes back within budget. Commands that
+#   require a subsystem staging motor outputs are never throttled, only flagged:
+#   skipping them would leave the motors unfed and trip motor safety.
+#
+#   Everything here runs on the control loop thread.
+#
+import time
+import weakref
+from typing import Callable, Dict, List
+
+import logging
+from util.metrics import Histogram, counter, histogram
+
+logger = logging.getLogger(__name__)
+
+PHASES = ("initialize", "execute", "end")
+BUDGET_ATTRIBUTE = "execution_budget_ms"
+
+DEFAULT_BUDGET_MS = 2.0         # Per call, for commands that do not declare a budget
+DEFAULT_STRIKES = 5             # Consecutive overruns before a command is a repeat offender
+COST_BOUNDS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0)    # Milliseconds
+
+_budgeted: 'weakref.WeakSet' = weakref.WeakSet()
+
+
+def stages_outputs(command) -> bool:
+    """
+    True if the command requires a subsystem that drives motors, through an output stage
+    ('outputs') or, when that is None, directly
+    """
+    return any(hasattr(subsystem, "outputs") for subsystem in command.getRequirements())
+
+
+def with_budget(command, budget_ms: float):
+    """ Declare the execution budget (milliseconds per call) of a command. Returns the command """
+    if budget_ms <= 0:
+        raise ValueError(f"Command budget must be greater than zero, not {budget_ms}")
+
+    setattr(command, BUDGET_ATTRIBUTE, budget_ms)
+    _budgeted.add(command)
+    return command
+
+
+class CommandCost:
+    """ Cost histograms and budget overruns of one command """
+
+    def __init__(self, name: str, budget_ms: float, declared: bool, throttle: bool = True):
+        self.name = name
+        self.budget_ms = budget_ms
+        self.declared = declared
+        self.throttle = throttle    # May skip execute() calls while an offender
+        self.histograms: Dict[str, Histogram] = {
+            phase: histogram(f"command.{name}.{phase}", unit="ms", description=f"{name}.{phase}() time",
+                             bounds=COST_BOUNDS)
+            for phase in PHASES
+        }
+        self.calls = 0
+        self.overruns = 0
+        self.consecutive = 0
+        self.worst_ms = 0.0
+        self.offender = False
+        self.throttled = 0          # execute() calls skipped while an offender
+
+    def record(self, phase: str, elapsed_ms: float, strikes: int) -> None:
+        self.histograms[phase].record(elapsed_ms)
+        self.calls += 1
+        if elapsed_ms > self.worst_ms:
+            self.worst_ms = elapsed_ms
+
+        if elapsed_ms <= self.budget_ms:
+            self.consecutive = 0
+            if self.offender and phase == "execute":
+                self.offender = False
+                logger.info(f"Command '{self.name}' is back within its {self.budget_ms:.2f} ms budget")
+            return
+
+        self.overruns += 1
+        self.consecutive += 1
+        if self.consecutive >= strikes and not self.offender:
+            self.offender = True
+            logger.warning(f"Command '{self.name}' {phase}() took {elapsed_ms:.2f} ms, over its "
+                           f"{self.budget_ms:.2f} ms budget {self.consecutive} calls in a row")
+
+    def stats(self) -> Dict[str, float]:
+        result = {"budget_ms": self.budget_ms, "calls": self.calls, "overruns": self.overruns,
+                  "worst_ms": self.worst_ms, "offender": self.offender, "throttled": self.throttled}
+        for phase, samples in self.histograms.items():
+            result[f"{phase}_mean_ms"] = samples.sum / samples.count if samples.count else 0.0
+        return result
+
+
+class CommandWatchdog:
+    """ Times every command's initialize/execute/end against its budget """
+
+    def __init__(self, default_budget_ms: float = DEFAULT_BUDGET_MS, strikes: int = DEFAULT_STRIKES,
+                 throttle: int = 0):
+        self._default_budget_ms = default_budget_ms
+        self._strikes = max(1, strikes)
+        self._throttle = throttle
+        self._costs: Dict[str, CommandCost] = {}
+        self._watched: 'weakref.WeakSet' = weakref.WeakSet()
+        self._overruns = counter("command.overruns", description="Command calls over their execution budget")
+        self._scheduler = None
+        self._hooked = False
+
+    @property
+    def enabled(self) -> bool:
+        return self._scheduler is not None
+
+    def enable(self, scheduler) -> None:
+        """ Watch the budgeted, default and running commands, and every command scheduled later """
+        if self._scheduler is not None:
+            return
+
+        self._scheduler = scheduler
+        for command in list(_budgeted):
+            self.watch(command)
+
+        for command in list(getattr(scheduler, "_subsystems", {}).values()):
+            if command is not None:
+                self.watch(command)
+
+        for command in list(getattr(scheduler, "_scheduledCommands", {})):
+            self.watch(command)
+
+        if not self._hooked:
+            # Commands first seen here have their first initialize() go untimed
+            scheduler.onCommandInitialize(self.watch)
+            self._hooked = True
+
+    def watch(self, command) -> None:
+        """ Time the command's initialize/execute/end against its budget """
+        if self._scheduler is None or command in self._watched:
+            return
+
+        budget_ms = getattr(command, BUDGET_ATTRIBUTE, None)
+        cost = CommandCost(self._unique_name(command.getName()), budget_ms or self._default_budget_ms,
+                           declared=budget_ms is not None, throttle=not stages_outputs(command))
+        self._costs[cost.name] = cost
+        self._watched.add(command)
+
+        for phase in PHASES:
+            setattr(command, phase, self._timed(cost, phase, getattr(command, phase)))
+
+    def _unique_name(self, name: str) -> str:
+        unique, index = name, 1
+        while unique in self._costs:
+            index += 1
+            unique = f"{name}#{index}"
+        return unique
+
+    def _timed(self, cost: CommandCost, phase: str, func: Callable) -> Callable:
+        perf_counter_ns = time.perf_counter_ns
+        strikes = self._strikes
+        overruns = self._overruns
+        throttle = self._throttle if phase == "execute" and cost.throttle else 0
+        ticks = [0]
+
+        def wrapper(*args, **kwargs):
+            if throttle and cost.offender:
+                ticks[0] += 1
+                if ticks[0] % throttle:
+                    cost.throttled += 1
+                    return None
+
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed_ms = (perf_counter_ns() - start) / 1e6
+                cost.record(phase, elapsed_ms, strikes)
+                if elapsed_ms > cost.budget_ms:
+                    overruns.add(1)
+
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def offenders(self) -> List[str]:
+        return [name for name, cost in self._costs.items() if cost.offender]
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """ Per-command statistics, most overruns first """
+        stats = {name: cost.stats() for name, cost in self._costs.items()}
+        return dict(sorted(stats.items(), key=lambda item: (item[1]["overruns"], item[1]["worst_ms"]),
+                           reverse=True))
+
+    def dump(self, output: Callable[[str], None] = print) -> None:
+        """ Write a table of every watched command's cost against its budget (milliseconds) """
+        output(f"{'Command':<40} {'budget':>8} {'calls':>8} {'over':>6} {'exec mean':>10} {'worst':>8}")
+        for name, stats in self.report().items():
+            flag = " *" if stats["offender"] else ""
+            output(f"{name:<40} {stats['budget_ms']:>8.2f} {stats['calls']:>8} {stats['overruns']:>6} "
+                   f"{stats['execute_mean_ms']:>10.3f} {stats['worst_ms']:>8.2f}{flag}")
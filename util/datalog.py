@@ -0,0 +1,221 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Compact binary data logging.
+#
+#   A log is described by a schema of (name, struct type code) fields. Each record is
+#   packed straight into one of a small pool of preallocated buffers; full buffers are
+#   handed to a background writer thread that does large sequential writes to size
+#   capped, rotating files. The control loop never formats, allocates a buffer or
+#   touches the file system.
+#
+#   File layout:  FILE_MAGIC | uint32 header length | JSON header | records...
+#
+#   read_datalog() loads a whole file into a NumPy structured array in one call.
+#
+import json
+import queue
+import struct
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+FILE_MAGIC = b"RBDLOG01"
+FILE_SUFFIX = ".rlog"
+
+DEFAULT_RECORDS_PER_BUFFER = 500        # 10 seconds at 50 Hz
+DEFAULT_BUFFERS = 8
+DEFAULT_MAX_FILE_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_FILES = 16
+
+_header_length = struct.Struct("<I")
+
+
+class LogSchema:
+    """ Ordered record fields as (name, struct type code), e.g. ('timestamp', 'd') """
+
+    def __init__(self, fields: Sequence[Tuple[str, str]]):
+        self.fields: List[Tuple[str, str]] = [(name, code) for name, code in fields]
+        self.struct = struct.Struct("<" + "".join(code for _, code in self.fields))
+
+    @property
+    def names(self) -> List[str]:
+        return [name for name, _ in self.fields]
+
+    @property
+    def record_size(self) -> int:
+        return self.struct.size
+
+    def dtype(self):
+        """ Matching NumPy structured dtype """
+        import numpy as np
+        return np.dtype([(name, "<" + code) for name, code in self.fields])
+
+    def to_json(self) -> List[List[str]]:
+        return [[name, code] for name, code in self.fields]
+
+
+class _DataLogWriter(threading.Thread):
+    """ Writes full buffers to rotating files and returns them to the free pool """
+
+    def __init__(self, directory: Path, prefix: str, header: bytes, free: deque,
+                 max_file_bytes: int, max_files: int):
+        super().__init__(name=f"DataLog {prefix}", daemon=True)
+        self._directory = directory
+        self._prefix = prefix
+        self._header = header
+        self._free = free
+        self._max_file_bytes = max_file_bytes
+        self._max_files = max_files
+        self._pending: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._file = None
+        self._file_bytes = 0
+        self._sequence = 0
+        self.path: Optional[Path] = None
+
+    def submit(self, buffer: bytearray, length: int) -> None:
+        self._pending.put((buffer, length))
+
+    def close(self) -> None:
+        self._pending.put(None)
+        self.join(timeout=5.0)
+
+    def _rotate(self) -> None:
+        if self._file:
+            self._file.close()
+
+        files = sorted(self._directory.glob(f"{self._prefix}-*{FILE_SUFFIX}"))
+        while len(files) >= self._max_files:
+            files.pop(0).unlink(missing_ok=True)
+
+        self._sequence += 1
+        self.path = self._directory / f"{self._prefix}-{time.strftime('%Y%m%d-%H%M%S')}-{self._sequence:04d}{FILE_SUFFIX}"
+        self._file = open(self.path, "wb", buffering=0)
+        self._file.write(self._header)
+        self._file_bytes = len(self._header)
+
+    def run(self) -> None:
+        while (item := self._pending.get()) is not None:
+            buffer, length = item
+            try:
+                if self._file is None or self._file_bytes + length > self._max_file_bytes:
+                    self._rotate()
+                self._file.write(memoryview(buffer)[:length])
+                self._file_bytes += length
+
+            except OSError as e:
+                logger.warning(f"DataLog: Write to {self.path} failed: {e}")
+
+            finally:
+                self._free.append(buffer)
+
+        if self._file:
+            self._file.close()
+
+
+class DataLogger:
+    """
+    Fixed-size binary records written from a single thread (normally the control
+    loop) with record(). If every buffer is waiting to be written the record is
+    dropped and counted rather than blocking.
+    """
+
+    def __init__(self, directory: str, schema: LogSchema, prefix: str = "robot",
+                 records_per_buffer: int = DEFAULT_RECORDS_PER_BUFFER, buffers: int = DEFAULT_BUFFERS,
+                 max_file_bytes: int = DEFAULT_MAX_FILE_BYTES, max_files: int = DEFAULT_MAX_FILES,
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.schema = schema
+        self._pack_into = schema.struct.pack_into
+        self._record_size = schema.record_size
+        self._buffer_size = records_per_buffer * self._record_size
+        self._free = deque(bytearray(self._buffer_size) for _ in range(buffers))
+        self._buffer = self._free.popleft()
+        self._offset = 0
+        self.dropped = 0
+
+        header = json.dumps({
+            "schema": schema.to_json(),
+            "record_size": self._record_size,
+            "created": time.time(),
+            "metadata": metadata or {},
+        }).encode("utf-8")
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self._writer = _DataLogWriter(directory, prefix, FILE_MAGIC + _header_length.pack(len(header)) + header,
+                                      self._free, max_file_bytes, max_files)
+        self._writer.start()
+
+    @property
+    def path(self) -> Optional[Path]:
+        """ File currently being written """
+        return self._writer.path
+
+    def record(self, *values) -> None:
+        if self._buffer is None:
+            # Writer is behind, try to get a buffer back
+            if not self._free:
+                self.dropped += 1
+                return
+            self._buffer = self._free.popleft()
+
+        self._pack_into(self._buffer, self._offset, *values)
+        self._offset += self._record_size
+
+        if self._offset >= self._buffer_size:
+            self._writer.submit(self._buffer, self._offset)
+            self._offset = 0
+            self._buffer = self._free.popleft() if self._free else None
+
+    def flush(self) -> None:
+        """ Hand a partially filled buffer to the writer (e.g. at the end of a match) """
+        if self._buffer is not None and self._offset:
+            self._writer.submit(self._buffer, self._offset)
+            self._offset = 0
+            self._buffer = self._free.popleft() if self._free else None
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
+        if self.dropped:
+            logger.warning(f"DataLog: {self.dropped} records dropped, writer could not keep up")
+
+
+def read_datalog_header(path: str) -> Tuple[Dict[str, Any], int]:
+    """ JSON header of a data log and the file offset of the first record """
+    with open(path, "rb") as f:
+        if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+            raise ValueError(f"{path} is not a data log")
+        (length,) = _header_length.unpack(f.read(_header_length.size))
+        header = json.loads(f.read(length).decode("utf-8"))
+    return header, len(FILE_MAGIC) + _header_length.size + length
+
+
+def read_datalog(path: str):
+    """ All complete records of a data log as a NumPy structured array """
+    import numpy as np
+
+    header, offset = read_datalog_header(path)
+    schema = LogSchema(header["schema"])
+    count = (Path(path).stat().st_size - offset) // schema.record_size
+    return np.fromfile(path, dtype=schema.dtype(), count=count, offset=offset)
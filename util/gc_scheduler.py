@@ -0,0 +1,179 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Deterministic garbage collection for the control loop.
+#
+#   In 'deterministic' mode the long-lived objects created during robotInit are
+#   frozen into the permanent generation and automatic collection is turned off
+#   while the robot is enabled. Young generations are then collected only in the
+#   slack left at the end of a loop and full collections only run while disabled.
+#   Every collection, scheduled or not, is counted and timed.
+#
+#   The slack is the time left before the next tick is due, measured from the
+#   loop_start() of the current one. collect_in_slack() must therefore run after
+#   everything else in the tick, e.g. from a TimedRobot.addPeriodic() callback
+#   offset past the loop function and the other callbacks.
+#
+import gc
+import time
+from typing import Dict, Optional, Union
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+GC_MODES = ("auto", "deterministic")
+
+DEFAULT_PERIOD = 0.020          # Seconds, TimedRobot default period
+DEFAULT_MIN_SLACK = 0.004       # Seconds of loop budget that must remain to collect
+DEFAULT_FULL_INTERVAL = 5.0     # Seconds between full collections while disabled
+
+_gc_scheduler: Union['GCScheduler', None] = None
+
+
+def gc_scheduler() -> Union['GCScheduler', None]:
+    return _gc_scheduler
+
+
+def gc_init(mode: str, period: Optional[float] = DEFAULT_PERIOD) -> 'GCScheduler':
+    global _gc_scheduler
+    if _gc_scheduler is None:
+        _gc_scheduler = GCScheduler(mode, period=period)
+    return _gc_scheduler
+
+
+class GCScheduler:
+    """ Controls when the cyclic garbage collector may run and accounts for each pause """
+
+    def __init__(self, mode: str = "deterministic", period: float = DEFAULT_PERIOD,
+                 min_slack: float = DEFAULT_MIN_SLACK, full_interval: float = DEFAULT_FULL_INTERVAL):
+        if mode not in GC_MODES:
+            raise ValueError(f"GC mode must be one of {GC_MODES}, not '{mode}'")
+
+        self._mode = mode
+        self._period = period
+        self._min_slack = min_slack
+        self._full_interval = full_interval
+        self._loop_start = 0.0
+        self._last_full = 0.0
+        self._scheduled = False
+        self._pause_start = 0
+
+        # Accounting, per generation
+        self._collections = [0, 0, 0]
+        self._unscheduled = [0, 0, 0]
+        self._pause_total_ns = [0, 0, 0]
+        self._pause_max_ns = [0, 0, 0]
+
+        gc.callbacks.append(self._on_gc)
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    @property
+    def deterministic(self) -> bool:
+        return self._mode == "deterministic"
+
+    def _on_gc(self, phase: str, info: Dict[str, int]) -> None:
+        if phase == "start":
+            self._pause_start = time.perf_counter_ns()
+            return
+
+        generation = info["generation"]
+        pause = time.perf_counter_ns() - self._pause_start
+        self._collections[generation] += 1
+        self._pause_total_ns[generation] += pause
+        if pause > self._pause_max_ns[generation]:
+            self._pause_max_ns[generation] = pause
+        if not self._scheduled:
+            self._unscheduled[generation] += 1
+
+    def _collect(self, generation: int) -> None:
+        self._scheduled = True
+        try:
+            gc.collect(generation)
+        finally:
+            self._scheduled = False
+
+    def freeze(self) -> None:
+        """
+        Call once robotInit/RobotContainer construction is complete. Everything alive
+        at this point is moved to the permanent generation and is never scanned again.
+        """
+        if not self.deterministic:
+            return
+
+        self._collect(2)
+        gc.freeze()
+        logger.info(f"GC: {gc.get_freeze_count()} objects frozen after robot initialization")
+
+    def on_enabled(self) -> None:
+        """ Robot enabled (autonomous, teleop or test), no automatic collections """
+        if self.deterministic:
+            gc.disable()
+
+    def on_disabled(self) -> None:
+        """ Robot disabled, automatic collection is allowed again """
+        if self.deterministic:
+            gc.enable()
+            logger.info(f"GC: {self.stats()}")
+
+    def loop_start(self) -> None:
+        """ Call at the start of each loop, the next loop is due one period later """
+        self._loop_start = time.perf_counter()
+
+    def collect_in_slack(self) -> None:
+        """
+        Call once everything in the loop is done. Collects the youngest generation that is
+        due if enough time remains before the next loop.
+        """
+        if not self.deterministic:
+            return
+
+        slack = self._period - (time.perf_counter() - self._loop_start)
+        if slack < self._min_slack:
+            return
+
+        count0, count1, _ = gc.get_count()
+        threshold0, threshold1, _ = gc.get_threshold()
+
+        if count1 >= threshold1 and slack >= 2 * self._min_slack:
+            self._collect(1)
+        elif count0 >= threshold0:
+            self._collect(0)
+
+    def collect_full(self) -> None:
+        """ Call from disabledPeriodic, runs a full collection every 'full_interval' seconds """
+        if not self.deterministic:
+            return
+
+        now = time.monotonic()
+        if now - self._last_full >= self._full_interval:
+            self._last_full = now
+            self._collect(2)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """ Collections, unscheduled collections and pause times (mS) per generation """
+        return {
+            f"gen{generation}": {
+                "collections": self._collections[generation],
+                "unscheduled": self._unscheduled[generation],
+                "pause_total_ms": self._pause_total_ns[generation] / 1e6,
+                "pause_max_ms": self._pause_max_ns[generation] / 1e6,
+            } for generation in range(3)
+        }
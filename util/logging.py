@@ -15,7 +15,16 @@
 #    Jemison High School - Huntsville Alabama                              #
 # ------------------------------------------------------------------------ #
 
+import collections
 import logging
+from typing import Deque, Dict, List, Optional, Tuple
+
+DEFAULT_QUEUE_SIZE = 4096           # Records held before new records are dropped
+DEFAULT_DRAIN_INTERVAL = 0.05       # Seconds between drains on the worker thread
+DEFAULT_RATE_WINDOW = 1.0           # Seconds
+DEFAULT_RATE_BURST = 5              # Identical messages allowed per window
+
+_log_queue: Optional['LogQueue'] = None
 
 
 def init_logging() -> logging.Logger:
@@ -73,3 +82,166 @@ def init_logging() -> logging.Logger:
     # logger.addHandler(file_handler)
 
     return logger
+
+
+class _EnqueueHandler(logging.Handler):
+    """
+    Root handler for queued logging. handle() is overridden so that the caller only
+    pays for a length check and a deque append (no handler lock), plus prepare().
+    """
+
+    def __init__(self, records: Deque[logging.LogRecord], max_records: int):
+        super().__init__()
+        self._records = records
+        self._max_records = max_records
+        self._formatter = logging.Formatter()
+        self.dropped = 0
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if len(self._records) < self._max_records:
+            self._records.append(self.prepare(record))
+        else:
+            self.dropped += 1
+        return True
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        As logging.handlers.QueueHandler.prepare(): merge 'args' into the message and
+        render any exception now, while they still hold the values they had at the call.
+        Records without arguments or an exception (f-string messages) cost nothing here.
+        """
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = self._formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.handle(record)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Passes at most 'burst' records from the same logging call site per 'window'
+    seconds, then reports how many were suppressed. The message is not part of the
+    key, so f-string messages that differ only in an interpolated value are limited
+    together.
+    """
+
+    def __init__(self, window: float = DEFAULT_RATE_WINDOW, burst: int = DEFAULT_RATE_BURST):
+        super().__init__()
+        self._window = window
+        self._burst = burst
+        self._seen: Dict[Tuple, List] = {}          # key -> [window start, count, suppressed]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.levelno, record.pathname, record.lineno)
+        entry = self._seen.get(key)
+
+        if entry is None or record.created - entry[0] >= self._window:
+            suppressed = entry[2] if entry else 0
+            self._seen[key] = [record.created, 1, 0]
+            if suppressed:
+                record.msg = f"{record.msg} [{suppressed} similar messages suppressed]"
+            if len(self._seen) > 1024:
+                self._prune(record.created)
+            return True
+
+        entry[1] += 1
+        if entry[1] <= self._burst:
+            return True
+
+        entry[2] += 1
+        return False
+
+    def _prune(self, now: float) -> None:
+        for key in [key for key, entry in self._seen.items() if now - entry[0] >= self._window and not entry[2]]:
+            del self._seen[key]
+
+
+class LogQueue:
+    """
+    Queued logging. Any thread (including the control loop) only enqueues; drain()
+    does the rate limiting, formatting and output and is run by the RobotService
+    worker thread.
+    """
+
+    def __init__(self, max_records: int = DEFAULT_QUEUE_SIZE, rate_window: float = DEFAULT_RATE_WINDOW,
+                 rate_burst: int = DEFAULT_RATE_BURST):
+        self._records: Deque[logging.LogRecord] = collections.deque()
+        self._handler = _EnqueueHandler(self._records, max_records)
+        self._rate_limit = RateLimitFilter(rate_window, rate_burst)
+        self._targets: List[logging.Handler] = []
+        self._reported_drops = 0
+
+    @property
+    def dropped(self) -> int:
+        return self._handler.dropped
+
+    @property
+    def pending(self) -> int:
+        return len(self._records)
+
+    def start(self) -> None:
+        """ Move the root logger's handlers behind the queue """
+        root = logging.getLogger()
+        self._targets = list(root.handlers)
+        for handler in self._targets:
+            root.removeHandler(handler)
+        root.addHandler(self._handler)
+
+    def stop(self) -> None:
+        """ Output anything still queued and give the root logger its handlers back """
+        root = logging.getLogger()
+        root.removeHandler(self._handler)
+        self.drain()
+        for handler in self._targets:
+            root.addHandler(handler)
+
+    def drain(self, max_records: Optional[int] = None) -> int:
+        """ Output up to 'max_records' (default: all) queued records. Returns the number handled """
+        records = self._records
+        handled = 0
+
+        while records and (max_records is None or handled < max_records):
+            record = records.popleft()
+            handled += 1
+            if self._rate_limit.filter(record):
+                self._output(record)
+
+        dropped = self._handler.dropped
+        if dropped != self._reported_drops:
+            record = logging.LogRecord("util.logging", logging.WARNING, __file__, 0,
+                                       f"Log queue full, {dropped - self._reported_drops} records dropped "
+                                       f"({dropped} total)", None, None)
+            self._reported_drops = dropped
+            self._output(record)
+
+        return handled
+
+    def _output(self, record: logging.LogRecord) -> None:
+        for handler in self._targets:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+def log_queue() -> Optional[LogQueue]:
+    return _log_queue
+
+
+def start_log_queue(max_records: int = DEFAULT_QUEUE_SIZE) -> LogQueue:
+    """ Switch the root logger to queued output. Call once, after init_logging() """
+    global _log_queue
+    if _log_queue is None:
+        _log_queue = LogQueue(max_records)
+        _log_queue.start()
+    return _log_queue
+
+
+def stop_log_queue() -> None:
+    global _log_queue
+    if _log_queue is not None:
+        _log_queue.stop()
+        _log_queue = None
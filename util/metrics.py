@@ -0,0 +1,371 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Low-overhead metrics.
+#
+#   Counters, gauges and histograms are pre-aggregated in place by the thread that
+#   records them (normally the control loop) with no locks: every instrument has a
+#   single writer and only ever accumulates, and the flusher running on the
+#   RobotService event loop only reads. Values are exported as cumulative totals, so
+#   a sample recorded while a snapshot is being taken simply shows up in the next one.
+#
+#   Gauges created with a callback are only evaluated at flush time, which keeps
+#   sensor reads that exist purely for metrics out of the control loop.
+#
+#   A gauge never owns its callback. Bound methods are held through a WeakMethod and
+#   any other callable through a weak reference, so a gauge never keeps a subsystem
+#   (and the hardware channels it owns) alive. Whoever registers the callback keeps
+#   it alive; pass a bound method rather than a lambda. A gauge whose callback is
+#   gone is left out of snapshots.
+#
+#   A histogram's count is the sum of its bucket counts, taken from one copy of the
+#   buckets, so an exported count always matches its buckets.
+#
+import asyncio
+import json
+import time
+import weakref
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BOUNDS = (0.5, 1.0, 2.0, 5.0, 10.0, 15.0, 20.0, 25.0, 50.0, 100.0)
+
+COUNTER = "counter"
+GAUGE = "gauge"
+HISTOGRAM = "histogram"
+
+
+class Counter:
+    """ Monotonic counter. Only one thread may call add() """
+    __slots__ = ("name", "unit", "description", "value")
+
+    def __init__(self, name: str, unit: str = "", description: str = ""):
+        self.name = name
+        self.unit = unit
+        self.description = description
+        self.value = 0
+
+    def add(self, amount: Union[int, float] = 1) -> None:
+        self.value += amount
+
+
+class Gauge:
+    """
+    Last value, either set() by one thread or read from 'callback' at flush time.
+    The callback is only weakly referenced, the caller must keep it alive.
+    """
+    __slots__ = ("name", "unit", "description", "value", "_callback")
+
+    def __init__(self, name: str, unit: str = "", description: str = "",
+                 callback: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.unit = unit
+        self.description = description
+        self.value = 0.0
+        self._callback = None
+        self.set_callback(callback)
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def set_callback(self, callback: Optional[Callable[[], float]]) -> None:
+        if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            self._callback = weakref.WeakMethod(callback)
+        elif callback is not None:
+            self._callback = weakref.ref(callback)
+        else:
+            self._callback = None
+
+    def read(self) -> float:
+        if self._callback is None:
+            return self.value
+        callback = self._callback()
+        if callback is None:
+            raise ReferenceError(f"Gauge '{self.name}' callback no longer exists")
+        return callback()
+
+
+class Histogram:
+    """ Explicit-bucket histogram. Only one thread may call record() """
+    __slots__ = ("name", "unit", "description", "bounds", "counts", "sum")
+
+    def __init__(self, name: str, unit: str = "", description: str = "",
+                 bounds: Sequence[float] = DEFAULT_BOUNDS):
+        self.name = name
+        self.unit = unit
+        self.description = description
+        self.bounds = tuple(bounds)
+        self.counts = array('Q', [0]) * (len(self.bounds) + 1)
+        self.sum = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def record(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class MetricSample(NamedTuple):
+    kind: str
+    name: str
+    unit: str
+    description: str
+    value: float                                # Counter total or gauge value, histogram sum
+    count: int = 0                              # Histogram only
+    bounds: Tuple[float, ...] = ()              # Histogram only
+    bucket_counts: Tuple[int, ...] = ()         # Histogram only
+
+
+class MetricsSnapshot(NamedTuple):
+    start_time_ns: int
+    time_ns: int
+    samples: List[MetricSample]
+
+
+class MetricsRegistry:
+    """ All instruments, by name """
+
+    def __init__(self):
+        self._instruments: Dict[str, Union[Counter, Gauge, Histogram]] = {}
+        self._start_time_ns = time.time_ns()
+
+    def _get(self, cls, name: str, **kwargs):
+        instrument = self._instruments.get(name)
+        if instrument is None:
+            instrument = self._instruments[name] = cls(name, **kwargs)
+        elif not isinstance(instrument, cls):
+            raise TypeError(f"Metric '{name}' is already a {type(instrument).__name__}")
+        return instrument
+
+    def counter(self, name: str, unit: str = "", description: str = "") -> Counter:
+        return self._get(Counter, name, unit=unit, description=description)
+
+    def gauge(self, name: str, unit: str = "", description: str = "",
+              callback: Optional[Callable[[], float]] = None) -> Gauge:
+        instrument = self._get(Gauge, name, unit=unit, description=description, callback=callback)
+        if callback is not None:
+            instrument.set_callback(callback)   # Re-created owner (new subsystem instance, ...)
+        return instrument
+
+    def histogram(self, name: str, unit: str = "", description: str = "",
+                  bounds: Sequence[float] = DEFAULT_BOUNDS) -> Histogram:
+        return self._get(Histogram, name, unit=unit, description=description, bounds=bounds)
+
+    def collect(self) -> MetricsSnapshot:
+        samples = []
+        for instrument in list(self._instruments.values()):
+            if isinstance(instrument, Counter):
+                samples.append(MetricSample(COUNTER, instrument.name, instrument.unit, instrument.description,
+                                            instrument.value))
+            elif isinstance(instrument, Gauge):
+                try:
+                    value = instrument.read()
+                except Exception as e:
+                    logger.debug(f"Metrics: gauge '{instrument.name}' callback failed: {e}")
+                    continue
+                samples.append(MetricSample(GAUGE, instrument.name, instrument.unit, instrument.description, value))
+            else:
+                counts = tuple(instrument.counts[:])
+                samples.append(MetricSample(HISTOGRAM, instrument.name, instrument.unit, instrument.description,
+                                            instrument.sum, sum(counts), instrument.bounds, counts))
+
+        return MetricsSnapshot(self._start_time_ns, time.time_ns(), samples)
+
+
+_registry = MetricsRegistry()
+
+
+def metrics_registry() -> MetricsRegistry:
+    return _registry
+
+
+def counter(name: str, unit: str = "", description: str = "") -> Counter:
+    return _registry.counter(name, unit=unit, description=description)
+
+
+def gauge(name: str, unit: str = "", description: str = "",
+          callback: Optional[Callable[[], float]] = None) -> Gauge:
+    return _registry.gauge(name, unit=unit, description=description, callback=callback)
+
+
+def histogram(name: str, unit: str = "", description: str = "",
+              bounds: Sequence[float] = DEFAULT_BOUNDS) -> Histogram:
+    return _registry.histogram(name, unit=unit, description=description, bounds=bounds)
+
+
+###############################################################################
+# Exporters. These run on the RobotService thread (or its executor), never on the
+# control loop.
+
+class MetricsExporter:
+    def export(self, snapshot: MetricsSnapshot) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class ConsoleMetricsExporter(MetricsExporter):
+    """ Logs the change in each metric since the previous flush """
+
+    def __init__(self, output: Callable[[str], None] = print):
+        self._output = output
+        self._previous: Dict[str, MetricSample] = {}
+
+    def export(self, snapshot: MetricsSnapshot) -> None:
+        lines = []
+        for sample in snapshot.samples:
+            previous = self._previous.get(sample.name)
+            self._previous[sample.name] = sample
+
+            if sample.kind == GAUGE:
+                lines.append(f"{sample.name:<40} {sample.value:>12.3f} {sample.unit}")
+
+            elif sample.kind == COUNTER:
+                delta = sample.value - (previous.value if previous else 0)
+                lines.append(f"{sample.name:<40} {sample.value:>12} (+{delta}) {sample.unit}")
+
+            else:
+                count = sample.count - (previous.count if previous else 0)
+                total = sample.value - (previous.value if previous else 0.0)
+                mean = total / count if count else 0.0
+                lines.append(f"{sample.name:<40} {count:>12} samples, mean {mean:.3f} {sample.unit}")
+
+        self._output("Metrics:\n  " + "\n  ".join(lines))
+
+
+class FileMetricsExporter(MetricsExporter):
+    """ Appends one JSON line per flush to a local file """
+
+    def __init__(self, path: str):
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._path, "a", buffering=64 * 1024)
+
+    def export(self, snapshot: MetricsSnapshot) -> None:
+        record = {
+            "start_time_ns": snapshot.start_time_ns,
+            "time_ns": snapshot.time_ns,
+            "metrics": [sample._asdict() for sample in snapshot.samples],
+        }
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        self._file.close()
+
+
+class OtlpMetricsExporter(MetricsExporter):
+    """
+    Sends the cumulative aggregates directly as an OTLP ExportMetricsServiceRequest
+    over gRPC. The OpenTelemetry protobuf/gRPC modules are only imported when this
+    exporter is created.
+    """
+
+    def __init__(self, endpoint: str, service_name: str, insecure: bool = True):
+        import grpc
+        from opentelemetry.proto.collector.metrics.v1 import metrics_service_pb2, metrics_service_pb2_grpc
+        from opentelemetry.proto.common.v1 import common_pb2
+        from opentelemetry.proto.metrics.v1 import metrics_pb2
+        from opentelemetry.proto.resource.v1 import resource_pb2
+
+        self._pb = metrics_pb2
+        self._request = metrics_service_pb2.ExportMetricsServiceRequest
+        self._resource = resource_pb2.Resource(attributes=[
+            common_pb2.KeyValue(key="service.name", value=common_pb2.AnyValue(string_value=service_name))
+        ])
+        self._scope = common_pb2.InstrumentationScope(name=__name__)
+
+        target = endpoint.split("://", 1)[-1]
+        self._channel = grpc.insecure_channel(target) if insecure else \
+            grpc.secure_channel(target, grpc.ssl_channel_credentials())
+        self._stub = metrics_service_pb2_grpc.MetricsServiceStub(self._channel)
+
+    def _metric(self, sample: MetricSample, start_ns: int, time_ns: int):
+        pb = self._pb
+        cumulative = pb.AGGREGATION_TEMPORALITY_CUMULATIVE
+        metric = pb.Metric(name=sample.name, unit=sample.unit, description=sample.description)
+
+        if sample.kind == COUNTER:
+            metric.sum.CopyFrom(pb.Sum(aggregation_temporality=cumulative, is_monotonic=True, data_points=[
+                pb.NumberDataPoint(start_time_unix_nano=start_ns, time_unix_nano=time_ns, as_double=sample.value)]))
+        elif sample.kind == GAUGE:
+            metric.gauge.CopyFrom(pb.Gauge(data_points=[
+                pb.NumberDataPoint(time_unix_nano=time_ns, as_double=sample.value)]))
+        else:
+            metric.histogram.CopyFrom(pb.Histogram(aggregation_temporality=cumulative, data_points=[
+                pb.HistogramDataPoint(start_time_unix_nano=start_ns, time_unix_nano=time_ns,
+                                      count=sample.count, sum=sample.value,
+                                      bucket_counts=sample.bucket_counts, explicit_bounds=sample.bounds)]))
+        return metric
+
+    def export(self, snapshot: MetricsSnapshot) -> None:
+        metrics = [self._metric(sample, snapshot.start_time_ns, snapshot.time_ns) for sample in snapshot.samples]
+        request = self._request(resource_metrics=[
+            self._pb.ResourceMetrics(resource=self._resource,
+                                     scope_metrics=[self._pb.ScopeMetrics(scope=self._scope, metrics=metrics)])
+        ])
+        self._stub.Export(request, timeout=5.0)
+
+    def shutdown(self) -> None:
+        self._channel.close()
+
+
+def create_exporters(spec: str, endpoint: str, service_name: str) -> List[MetricsExporter]:
+    """
+    Exporters from an OTEL_METRICS_EXPORTER style comma separated list of 'console',
+    'otlp' and 'file:<path>'. 'none' or an empty string disables export.
+    """
+    exporters = []
+    for name in (item.strip() for item in spec.split(",")):
+        try:
+            if name == "console":
+                exporters.append(ConsoleMetricsExporter())
+            elif name == "otlp":
+                exporters.append(OtlpMetricsExporter(endpoint, service_name))
+            elif name.startswith("file:"):
+                exporters.append(FileMetricsExporter(name[len("file:"):]))
+            elif name not in ("", "none"):
+                logger.warning(f"Metrics: Unknown exporter '{name}' ignored")
+
+        except Exception as e:
+            logger.warning(f"Metrics: Unable to create '{name}' exporter: {e}")
+
+    return exporters
+
+
+async def export_metrics(exporters: Sequence[MetricsExporter], registry: Optional[MetricsRegistry] = None) -> None:
+    """ Collect all metrics once and hand them to each exporter """
+    snapshot = (registry or _registry).collect()
+    loop = asyncio.get_running_loop()
+
+    for exporter in exporters:
+        try:
+            # Exporters may do file or network I/O, keep it off the event loop
+            await loop.run_in_executor(None, exporter.export, snapshot)
+
+        except Exception as e:
+            logger.warning(f"Metrics: {type(exporter).__name__} export failed: {e}")
+
@@ -0,0 +1,155 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Batched actuator outputs.
+#
+#   Subsystems stage the value they want on each output channel with stage(), and
+#   the robot writes everything once with flush() at the end of robotPeriodic. If a
+#   channel is staged more than once in a loop, only the last value is written. A
+#   value that is already on the hardware is not written again. Every value is clamped
+#   to its channel's limits (NaN becomes 0) before it is written, so this is the one
+#   place safety limits are applied.
+#
+#   A value only counts as already on the hardware while the channel keeps being
+#   staged every loop. Once a loop goes by without it, the next value is always
+#   written, since something else (motor safety, disable) may have stopped the motor
+#   in the meantime.
+#
+#   Channels may also have a 'keepalive', called on every flush of the channel even
+#   when the write is suppressed (e.g. DifferentialDrive.feed for motor safety).
+#
+#   stage() may be called from several threads at once (util.parallel.ParallelTick
+#   items). flush() is only called from the control loop once they are all done.
+#
+import threading
+from array import array
+from typing import Callable, Dict, List, Optional
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 16
+
+Writer = Callable[[float], None]
+
+
+class OutputStage:
+    """ Preallocated per-loop buffer of actuator outputs """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._capacity = capacity
+        self._names: List[str] = []
+        self._writers: List[Writer] = []
+        self._keepalives: List[Optional[Callable[[], None]]] = []
+        self._low = array('d', [0.0]) * capacity
+        self._high = array('d', [0.0]) * capacity
+        self._desired = array('d', [0.0]) * capacity
+        self._written = array('d', [0.0]) * capacity
+        self._flushed = array('q', [-1]) * capacity     # Flush number the channel was last written/refreshed in
+        self._staged = bytearray(capacity)
+        self._order = array('i', [0]) * capacity       # Channels staged this loop, in order
+        self._count = 0
+        self._flushes = 0
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.writes = 0
+        self.suppressed = 0
+        self.duplicates = 0
+        self.clamped = 0
+
+    def register(self, name: str, writer: Writer, low: float = -1.0, high: float = 1.0,
+                 keepalive: Optional[Callable[[], None]] = None) -> int:
+        """ Add an output channel, returning the channel number to stage() to """
+        channel = len(self._names)
+        if channel >= self._capacity:
+            raise ValueError(f"Output stage is full ({self._capacity} channels), unable to add '{name}'")
+
+        self._names.append(name)
+        self._writers.append(writer)
+        self._keepalives.append(keepalive)
+        self._low[channel] = low
+        self._high[channel] = high
+        return channel
+
+    def stage(self, channel: int, value: float) -> None:
+        """ Set the value to write to a channel at the next flush() """
+        with self._lock:
+            if self._staged[channel]:
+                self.duplicates += 1
+            else:
+                self._staged[channel] = 1
+                self._order[self._count] = channel
+                self._count += 1
+            self._desired[channel] = value
+
+    def flush(self) -> int:
+        """ Write all staged channels that changed. Returns the number of writes """
+        flushes = self._flushes
+        writes = 0
+        for i in range(self._count):
+            channel = self._order[i]
+            self._staged[channel] = 0
+
+            value = self._desired[channel]
+            low = self._low[channel]
+            high = self._high[channel]
+            if value != value:
+                value = 0.0 if low <= 0.0 <= high else low
+                self.clamped += 1
+            elif value < low:
+                value = low
+                self.clamped += 1
+            elif value > high:
+                value = high
+                self.clamped += 1
+
+            if value == self._written[channel] and self._flushed[channel] == flushes - 1:
+                self.suppressed += 1
+            else:
+                self._writers[channel](value)
+                self._written[channel] = value
+                writes += 1
+
+            self._flushed[channel] = flushes
+            keepalive = self._keepalives[channel]
+            if keepalive is not None:
+                keepalive()
+
+        self._count = 0
+        self._flushes = flushes + 1
+        self.writes += writes
+        return writes
+
+    def value(self, channel: int) -> float:
+        """ The last value written to a channel """
+        return self._written[channel]
+
+    def set_limits(self, channel: int, low: float, high: float) -> None:
+        self._low[channel] = low
+        self._high[channel] = high
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "channels": len(self._names),
+            "flushes": self._flushes,
+            "writes": self.writes,
+            "suppressed": self.suppressed,
+            "duplicates": self.duplicates,
+            "clamped": self.clamped,
+        }
@@ -0,0 +1,202 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Parallel work within a scheduler tick.
+#
+#   With free-threaded Python (the GIL disabled) independent per-tick work, such
+#   as drive odometry and the arm controller, can run on separate cores. Work
+#   items are registered once. run() hands all but the first to persistent worker
+#   threads, runs the first on the calling thread and joins before returning, so
+#   all of it is done before the tick's outputs are flushed. With the GIL enabled
+#   the same items run one after another on the calling thread.
+#
+#   Items must be independent of each other. They may read the sensor snapshot
+#   and stage outputs (OutputStage.stage() is thread-safe), but must not share
+#   other mutable state.
+#
+import queue
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import logging
+from util.profiler import LoopProfiler, ProfileSamples
+from util.worker_pool import worker_pool
+from util.worker_thread import ThreadSettings, apply_thread_settings
+
+logger = logging.getLogger(__name__)
+
+PARALLEL_MODES = ("auto", "on", "off")
+
+
+def free_threaded() -> bool:
+    """ True if running on a free-threaded Python with the GIL disabled """
+    return hasattr(sys, "_is_gil_enabled") and not sys._is_gil_enabled()
+
+
+def _noop() -> None:
+    pass
+
+
+class TickWork:
+    """ One independent piece of work run every tick, with its cost """
+    __slots__ = ("name", "function", "count", "last_ns", "total_ns", "max_ns", "error", "samples")
+
+    def __init__(self, name: str, function: Callable[[], None]):
+        self.name = name
+        self.function = function
+        self.count = 0
+        self.last_ns = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.error: Optional[BaseException] = None
+        self.samples: Optional[ProfileSamples] = None    # Loop profiler samples, when profiling
+
+    def run(self) -> None:
+        start = time.perf_counter_ns()
+        try:
+            self.function()
+
+        except BaseException as e:      # Re-raised on the control thread by ParallelTick.run()
+            self.error = e
+
+        elapsed = time.perf_counter_ns() - start
+        self.count += 1
+        self.last_ns = elapsed
+        self.total_ns += elapsed
+        if elapsed > self.max_ns:
+            self.max_ns = elapsed
+        if self.samples is not None:
+            self.samples.add(elapsed)
+
+
+class ParallelTick:
+    """ Runs the registered work items in parallel (free-threaded) or in order (GIL) """
+
+    def __init__(self, parallel: Optional[bool] = None, workers: int = 1,
+                 settings: Optional[ThreadSettings] = None):
+        self._parallel = free_threaded() if parallel is None else parallel
+        self._items: List[TickWork] = []
+        self._queues: List[queue.SimpleQueue] = []
+        self._done: queue.SimpleQueue = queue.SimpleQueue()
+        self._threads: List[threading.Thread] = []
+        self.ticks = 0
+
+        if self._parallel:
+            if not free_threaded():
+                logger.warning("Parallel tick enabled with the GIL enabled, expect no speedup")
+
+            # Started here, so they inherit this thread's affinity, and not the control loop's
+            # once it is pinned
+            for index in range(max(1, workers)):
+                work = queue.SimpleQueue()
+                thread = threading.Thread(target=self._worker, args=(work, settings),
+                                          name=f"Tick Worker {index}", daemon=True)
+                self._queues.append(work)
+                self._threads.append(thread)
+                thread.start()
+
+                pool = worker_pool()
+                if pool:
+                    pool.add(thread)
+
+        logger.info(f"Tick work runs {'in parallel' if self._parallel else 'sequentially'}")
+
+    @property
+    def parallel(self) -> bool:
+        return self._parallel
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, name: str, function: Callable[[], None]) -> TickWork:
+        """ Register work to run every tick """
+        item = TickWork(name, function)
+        self._items.append(item)
+        return item
+
+    def take_periodic(self, subsystem, name: Optional[str] = None) -> TickWork:
+        """
+        Move a subsystem's periodic() from the command scheduler into this tick's work.
+        The scheduler then calls a no-op in its place.
+        """
+        item = self.add(name or f"{subsystem.getName()}.periodic()", subsystem.periodic)
+        subsystem.periodic = _noop
+        return item
+
+    def profile(self, profiler: Optional[LoopProfiler]) -> None:
+        """
+        Record each item's time in the loop profiler under its own name (the same name the
+        profiler gives a subsystem's periodic()), or stop recording with None
+        """
+        for item in self._items:
+            item.samples = profiler.samples(item.name) if profiler else None
+
+    def _worker(self, work: queue.SimpleQueue, settings: Optional[ThreadSettings]) -> None:
+        apply_thread_settings(settings)
+        done = self._done
+        while True:
+            item = work.get()
+            if item is None:
+                break
+            item.run()
+            done.put(item)
+
+    def run(self) -> None:
+        """ Run every registered item, returning once all of them are done """
+        items = self._items
+        self.ticks += 1
+
+        if not self._parallel or len(items) < 2:
+            for item in items:
+                item.run()
+        else:
+            queues = self._queues
+            count = len(queues)
+            for index in range(1, len(items)):
+                queues[(index - 1) % count].put(items[index])
+
+            items[0].run()
+            for _ in range(len(items) - 1):
+                self._done.get()
+
+        error = None
+        for item in items:
+            if item.error is not None:
+                error = error or item.error
+                item.error = None
+        if error is not None:
+            raise error
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """ Per-item run counts and times (microseconds) """
+        return {item.name: {"count": item.count,
+                            "last_us": item.last_ns / 1000.0,
+                            "mean_us": item.total_ns / item.count / 1000.0 if item.count else 0.0,
+                            "max_us": item.max_ns / 1000.0}
+                for item in self._items}
+
+    def close(self) -> None:
+        """ Stop the worker threads. Registered items then run in order on the calling thread """
+        for work in self._queues:
+            work.put(None)
+        for thread in self._threads:
+            thread.join(timeout=1)
+        self._queues.clear()
+        self._threads.clear()
+        self._parallel = False
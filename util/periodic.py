@@ -0,0 +1,188 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Drift-free periodic tasks on an asyncio event loop.
+#
+#   Each task runs at absolute times on the loop's monotonic clock:
+#
+#       start + phase + n * period
+#
+#   so a late wake-up or a slow run never pushes later runs back. A run that is
+#   not finished within its deadline (default: one period) after its scheduled
+#   time is counted as missed. If a run finishes after one or more later start
+#   times have already passed, those cycles are skipped, not run back to back,
+#   and are counted as well.
+#
+#   Callbacks may be plain functions or coroutine functions. A plain function
+#   runs on the event loop and so must be quick, anything slower should be a
+#   coroutine that hands the work off (run_in_executor, ...).
+#
+import asyncio
+import inspect
+import math
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+
+import logging
+from util.asyncio import create_task
+
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[], Union[None, Awaitable[None]]]
+
+
+class PeriodicTask:
+    """ One periodic task and its timing statistics (seconds) """
+
+    def __init__(self, name: str, callback: Callback, period: float, phase: float = 0.0,
+                 deadline: Optional[float] = None):
+        if period <= 0:
+            raise ValueError(f"Periodic task '{name}': period must be greater than zero, not {period}")
+        if not 0.0 <= phase < period:
+            raise ValueError(f"Periodic task '{name}': phase must be in [0, {period}), not {phase}")
+
+        self.name = name
+        self.callback = callback
+        self.period = period
+        self.phase = phase
+        self.deadline = period if deadline is None else deadline
+
+        self.runs = 0
+        self.missed = 0           # Runs that finished after their deadline
+        self.skipped = 0          # Cycles not run because an earlier run (or the loop) was late
+        self.errors = 0
+        self.last_start = 0.0     # Loop time the last run started at
+        self.max_lateness = 0.0   # Start time after the scheduled time
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "period": self.period,
+            "runs": self.runs,
+            "missed": self.missed,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "max_lateness_ms": self.max_lateness * 1000.0,
+            "mean_duration_ms": self.total_duration / self.runs * 1000.0 if self.runs else 0.0,
+            "max_duration_ms": self.max_duration * 1000.0,
+        }
+
+    async def _run(self, loop: asyncio.AbstractEventLoop, start: float) -> None:
+        period = self.period
+        deadline = self.deadline
+        scheduled = start + self.phase
+
+        while True:
+            delay = scheduled - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            began = loop.time()
+            try:
+                result = self.callback()
+                if inspect.isawaitable(result):
+                    await result
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Periodic task '{self.name}' failed: {e}")
+
+            finished = loop.time()
+            duration = finished - began
+            self.runs += 1
+            self.last_start = began
+            self.total_duration += duration
+            self.max_duration = max(self.max_duration, duration)
+            self.max_lateness = max(self.max_lateness, began - scheduled)
+            if finished - scheduled > deadline:
+                self.missed += 1
+
+            # Next start time, skipping any that have already gone by
+            scheduled += period
+            if finished >= scheduled:
+                cycles = math.floor((finished - scheduled) / period) + 1
+                self.skipped += cycles
+                scheduled += cycles * period
+
+
+class PeriodicScheduler:
+    """ Periodic tasks, by name, on one event loop """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._tasks: Dict[str, PeriodicTask] = {}
+        self._epoch = loop.time()
+
+    @property
+    def event_loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def add(self, name: str, callback: Callback, period: float, phase: float = 0.0,
+            deadline: Optional[float] = None) -> PeriodicTask:
+        """
+        Run 'callback' every 'period' seconds, offset by 'phase' seconds. Phases are relative
+        to when the scheduler was created so tasks with the same period keep their spacing.
+        Must be called on the scheduler's event loop thread.
+        """
+        if name in self._tasks:
+            raise ValueError(f"Periodic task '{name}' already exists")
+
+        task = PeriodicTask(name, callback, period, phase=phase, deadline=deadline)
+        loop = self._loop
+
+        # First run is the next cycle boundary, relative to the epoch, that has not passed
+        elapsed = loop.time() - self._epoch
+        start = self._epoch + math.ceil(max(0.0, elapsed - phase) / period) * period
+
+        task._task = create_task(loop, task._run(loop, start), name=f"periodic-{name}")
+        self._tasks[name] = task
+        return task
+
+    def get(self, name: str) -> Optional[PeriodicTask]:
+        return self._tasks.get(name)
+
+    def names(self) -> List[str]:
+        return list(self._tasks)
+
+    def tasks(self) -> List[PeriodicTask]:
+        return list(self._tasks.values())
+
+    def remove(self, name: str) -> Optional[PeriodicTask]:
+        task = self._tasks.pop(name, None)
+        if task and task._task:
+            task._task.cancel()
+        return task
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {name: task.stats() for name, task in self._tasks.items()}
+
+    async def stop(self) -> None:
+        """ Cancel every task and wait for them to finish """
+        tasks = [task._task for task in self._tasks.values() if task._task]
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,198 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Loop-time profiler for the command-based scheduler.
+#
+#   Each profiled item (subsystem periodic(), command execute(), button poll, ...)
+#   owns a preallocated ring buffer of elapsed times in nanoseconds. Recording a
+#   sample is a pair of perf_counter_ns() calls and an array store, and nothing is
+#   wrapped at all until the profiler is enabled.
+#
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 1024          # Samples kept per item (~20 seconds at 50 Hz)
+
+
+class ProfileSamples:
+    """ Ring buffer of elapsed times (nS) for a single profiled item """
+    __slots__ = ("name", "count", "_buffer", "_capacity", "_index")
+
+    def __init__(self, name: str, capacity: int = DEFAULT_CAPACITY):
+        self.name = name
+        self.count = 0
+        self._capacity = capacity
+        self._buffer = array('q', [0]) * capacity
+        self._index = 0
+
+    def add(self, elapsed_ns: int) -> None:
+        index = self._index
+        self._buffer[index] = elapsed_ns
+        index += 1
+        self._index = index if index < self._capacity else 0
+        self.count += 1
+
+    def clear(self) -> None:
+        self.count = 0
+        self._index = 0
+
+    def samples(self) -> List[int]:
+        """ Samples currently held, oldest first """
+        if self.count < self._capacity:
+            return self._buffer[:self._index].tolist()
+        return self._buffer[self._index:].tolist() + self._buffer[:self._index].tolist()
+
+    def stats(self) -> Dict[str, float]:
+        """ p50/p99/max (in microseconds) over the samples currently held """
+        values = sorted(self.samples())
+        held = len(values)
+        if not held:
+            return {"count": self.count, "p50": 0.0, "p99": 0.0, "max": 0.0}
+
+        return {
+            "count": self.count,
+            "p50": values[(held - 1) // 2] / 1000.0,
+            "p99": values[int(0.99 * (held - 1))] / 1000.0,
+            "max": values[-1] / 1000.0,
+        }
+
+
+def _timed(samples: ProfileSamples, func: Callable) -> Callable:
+    perf_counter_ns = time.perf_counter_ns
+
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            samples.add(perf_counter_ns() - start)
+
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+class _TimedEventLoop:
+    """ Stand-in for the scheduler's active button loop that times each poll() """
+
+    def __init__(self, event_loop, samples: ProfileSamples):
+        self._event_loop = event_loop
+        self.poll = _timed(samples, event_loop.poll)
+
+    def __getattr__(self, name: str):
+        return getattr(self._event_loop, name)
+
+
+class LoopProfiler:
+    """
+    Times each subsystem periodic(), each scheduled command's execute(), the button
+    poll and the scheduler run() as a whole.
+
+    Instrumentation is done by shadowing the bound methods with timed wrappers on the
+    individual instances, so disabling the profiler removes every trace of it from the
+    control loop.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._capacity = capacity
+        self._items: Dict[str, ProfileSamples] = {}
+        self._wrapped: List[Tuple[object, str]] = []
+        self._scheduler = None
+        self._button_loop = None
+        self._enabled = False
+        self._hooked = False
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def samples(self, name: str) -> ProfileSamples:
+        """ Get (or create) the sample buffer for a profiled item """
+        samples = self._items.get(name)
+        if samples is None:
+            samples = self._items[name] = ProfileSamples(name, self._capacity)
+        return samples
+
+    def instrument(self, obj, method: str, name: Optional[str] = None) -> None:
+        """ Time every call of obj.method() under the given item name """
+        if not self._enabled or method in vars(obj):
+            return      # Not profiling, or already instrumented
+
+        name = name or f"{type(obj).__name__}.{method}()"
+        setattr(obj, method, _timed(self.samples(name), getattr(obj, method)))
+        self._wrapped.append((obj, method))
+
+    def enable(self, scheduler) -> None:
+        """ Instrument the command scheduler and everything registered with it """
+        if self._enabled:
+            return
+
+        self._enabled = True
+        self._scheduler = scheduler
+        self.instrument(scheduler, "run", "scheduler.run()")
+
+        for subsystem in getattr(scheduler, "_subsystems", {}):
+            self.instrument(subsystem, "periodic", f"{subsystem.getName()}.periodic()")
+
+        self._button_loop = scheduler.getActiveButtonLoop()
+        scheduler.setActiveButtonLoop(_TimedEventLoop(self._button_loop, self.samples("buttons.poll()")))
+
+        # Commands already running (default commands, ...) and any scheduled later on
+        for command in list(getattr(scheduler, "_scheduledCommands", {})):
+            self._instrument_command(command)
+
+        if not self._hooked:
+            # The scheduler has no way to remove an action, so this is registered once
+            scheduler.onCommandInitialize(self._instrument_command)
+            self._hooked = True
+
+    def disable(self) -> None:
+        """ Remove all instrumentation. Collected samples are kept until clear() """
+        if not self._enabled:
+            return
+
+        self._enabled = False
+        wrapped, self._wrapped = self._wrapped, []
+        for obj, method in wrapped:
+            vars(obj).pop(method, None)
+
+        if self._button_loop is not None:
+            self._scheduler.setActiveButtonLoop(self._button_loop)
+            self._button_loop = None
+
+    def _instrument_command(self, command) -> None:
+        if self._enabled:
+            self.instrument(command, "execute", f"{command.getName()}.execute()")
+
+    def clear(self) -> None:
+        for samples in self._items.values():
+            samples.clear()
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """ Per-item statistics, most expensive (p99) first """
+        stats = {name: samples.stats() for name, samples in self._items.items()}
+        return dict(sorted(stats.items(), key=lambda item: item[1]["p99"], reverse=True))
+
+    def dump(self, output: Callable[[str], None] = print) -> None:
+        """ Write a p50/p99/max table (microseconds) of all profiled items """
+        output(f"{'Loop profile':<48} {'count':>8} {'p50 uS':>10} {'p99 uS':>10} {'max uS':>10}")
+        for name, stats in self.report().items():
+            output(f"{name:<48} {stats['count']:>8} {stats['p50']:>10.1f} {stats['p99']:>10.1f} {stats['max']:>10.1f}")
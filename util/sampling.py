@@ -0,0 +1,237 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# High-rate sensor sampling.
+#
+#   SensorSampler reads registered sensors on its own thread at a fixed rate and
+#   stores timestamped samples in SampleRing buffers. A ring has exactly one writer
+#   (the sampler thread): each sample is written into preallocated arrays before
+#   the head counter is advanced, so readers never take a lock. A reader that finds
+#   the head moved far enough to overwrite what it read simply retries.
+#
+#   Anything that must not interleave with a sample (resetting the sensors, and
+#   clearing their rings) holds the sampler's lock, which it holds while it reads,
+#   stores and hands out each sample.
+#
+import threading
+import time
+from array import array
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 256
+
+Listener = Callable[[float, Sequence[float]], None]
+
+
+class SampleRing:
+    """ Lock-free (single writer) ring of timestamped multi-channel samples """
+
+    def __init__(self, name: str, channels: int, capacity: int = DEFAULT_CAPACITY):
+        self.name = name
+        self._channels = channels
+        self._capacity = capacity
+        self._timestamps = array('d', [0.0]) * capacity
+        self._values = [array('d', [0.0]) * capacity for _ in range(channels)]
+        self._head = 0          # Total samples written. Slot of sample n is n % capacity
+
+    @property
+    def count(self) -> int:
+        return self._head
+
+    def clear(self) -> None:
+        """ Drop every sample. Writer only, or with the sampler's lock held """
+        self._head = 0
+
+    def append(self, timestamp: float, values: Sequence[float]) -> None:
+        """ Writer only """
+        head = self._head
+        slot = head % self._capacity
+        self._timestamps[slot] = timestamp
+        for channel, value in zip(self._values, values):
+            channel[slot] = value
+        self._head = head + 1   # Publish
+
+    def latest(self) -> Optional[Tuple[float, Tuple[float, ...]]]:
+        """ (timestamp, values) of the newest sample, or None if nothing sampled yet """
+        while True:
+            head = self._head
+            if head == 0:
+                return None
+            slot = (head - 1) % self._capacity
+            sample = self._timestamps[slot], tuple(channel[slot] for channel in self._values)
+            if self._head - head < self._capacity - 1:
+                return sample
+
+    def latest_value(self, channel: int = 0) -> float:
+        """ Newest value of one channel (0.0 before the first sample) """
+        head = self._head
+        return self._values[channel][(head - 1) % self._capacity] if head else 0.0
+
+    def oldest_timestamp(self) -> Optional[float]:
+        """ Timestamp of the oldest sample still held, or None if nothing sampled yet """
+        while True:
+            head = self._head
+            if head == 0:
+                return None
+            oldest = max(0, head - self._capacity + 1)
+            timestamp = self._timestamps[oldest % self._capacity]
+            if self._head - oldest < self._capacity:
+                return timestamp
+
+    def window(self, start: float, end: float = float("inf")) -> List[Tuple[float, Tuple[float, ...]]]:
+        """ All held samples with start <= timestamp <= end, oldest first """
+        while True:
+            head = self._head
+            oldest = max(0, head - self._capacity + 1)
+            index = self._search(start, oldest, head)
+            samples = []
+            while index < head:
+                slot = index % self._capacity
+                timestamp = self._timestamps[slot]
+                if timestamp > end:
+                    break
+                samples.append((timestamp, tuple(channel[slot] for channel in self._values)))
+                index += 1
+
+            if self._head - oldest < self._capacity:
+                return samples
+
+    def value_at(self, timestamp: float, channel: int = 0) -> Optional[float]:
+        """ Channel value linearly interpolated at 'timestamp'. Clamped to the held samples """
+        while True:
+            head = self._head
+            if head == 0:
+                return None
+            oldest = max(0, head - self._capacity + 1)
+            index = self._search(timestamp, oldest, head)
+
+            capacity = self._capacity
+            values = self._values[channel]
+            if index >= head:
+                value = values[(head - 1) % capacity]
+            elif index == oldest:
+                value = values[oldest % capacity]
+            else:
+                before, after = (index - 1) % capacity, index % capacity
+                t0, t1 = self._timestamps[before], self._timestamps[after]
+                fraction = (timestamp - t0) / (t1 - t0) if t1 > t0 else 1.0
+                value = values[before] + (values[after] - values[before]) * fraction
+
+            if self._head - oldest < self._capacity:
+                return value
+
+    def sample_at(self, timestamp: float) -> Optional[Tuple[float, ...]]:
+        """ All channels linearly interpolated at 'timestamp'. Clamped to the held samples """
+        while True:
+            head = self._head
+            if head == 0:
+                return None
+            oldest = max(0, head - self._capacity + 1)
+            index = self._search(timestamp, oldest, head)
+
+            capacity = self._capacity
+            if index >= head or index == oldest:
+                slot = (head - 1) % capacity if index >= head else oldest % capacity
+                values = tuple(channel[slot] for channel in self._values)
+            else:
+                before, after = (index - 1) % capacity, index % capacity
+                t0, t1 = self._timestamps[before], self._timestamps[after]
+                fraction = (timestamp - t0) / (t1 - t0) if t1 > t0 else 1.0
+                values = tuple(channel[before] + (channel[after] - channel[before]) * fraction
+                               for channel in self._values)
+
+            if self._head - oldest < self._capacity:
+                return values
+
+    def _search(self, timestamp: float, low: int, high: int) -> int:
+        """ First sample index in [low, high) with a timestamp >= 'timestamp' """
+        timestamps = self._timestamps
+        capacity = self._capacity
+        while low < high:
+            middle = (low + high) // 2
+            if timestamps[middle % capacity] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+class SensorSampler(threading.Thread):
+    """
+    Samples every registered sensor group at 'rate' Hz. Deadlines are absolute so the
+    rate does not drift; a cycle that overruns its deadline is counted and skipped.
+    """
+
+    def __init__(self, rate: float, clock: Callable[[], float] = time.monotonic, name: str = "Sensor Sampler"):
+        super().__init__(name=name, daemon=True)
+        self._period = 1.0 / rate
+        self._clock = clock
+        self._groups: List[Tuple[SampleRing, Tuple[Callable[[], float], ...], Optional[Listener]]] = []
+        self._stop_event = threading.Event()
+        self.lock = threading.Lock()       # Held while each sample is taken and handed out
+        self.overruns = 0
+
+    @property
+    def rate(self) -> float:
+        return 1.0 / self._period
+
+    def register(self, name: str, readers: Sequence[Callable[[], float]],
+                 capacity: int = DEFAULT_CAPACITY, listener: Optional[Listener] = None) -> SampleRing:
+        """
+        Sample the readers together into a new ring. Register before start(). The optional
+        listener is called on the sampler thread with (timestamp, values) of each sample.
+        """
+        ring = SampleRing(name, len(readers), capacity)
+        self._groups.append((ring, tuple(readers), listener))
+        return ring
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        logger.info(f"START: {self.name}: sampling {len(self._groups)} sensor groups at {self.rate:.0f} Hz")
+        period = self._period
+        clock = self._clock
+        deadline = time.monotonic()
+
+        while not self._stop_event.is_set():
+            for ring, readers, listener in self._groups:
+                with self.lock:
+                    try:
+                        timestamp = clock()
+                        values = [read() for read in readers]
+                        ring.append(timestamp, values)
+                        if listener:
+                            listener(timestamp, values)
+
+                    except Exception as e:
+                        logger.debug(f"{self.name}: {ring.name} read failed: {e}")
+
+            deadline += period
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                # Overran, skip the missed cycles rather than bursting to catch up
+                missed = int(-delay // period) + 1
+                self.overruns += missed
+                deadline += missed * period
+                delay += missed * period
+
+            self._stop_event.wait(delay)
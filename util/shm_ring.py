@@ -0,0 +1,135 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Shared-memory ring of fixed-size image frames, for passing camera frames between
+# processes without copying them.
+#
+#   One process creates the ring and any other process attaches to it by name. There is
+#   a single producer: it fills the pixels of frame_view(next_slot()) in place and then
+#   publish()es the frame, which writes the slot's sequence number and timestamp before
+#   advancing the head. Consumers pick up latest() and work directly on the slot's
+#   memory. Because the producer never waits, a consumer that is too slow can have its
+#   slot reused underneath it, so it checks overwritten() once done with the frame and
+#   discards its result if the frame was overwritten. This is the same single-writer
+#   scheme as util.sampling.SampleRing.
+#
+#   Layout:  header  'Q head, I slots, I width, I height' padded to 64 bytes
+#            slots * (16 byte 'Q sequence, d timestamp' + width * height pixels, padded to 64 bytes)
+#
+import struct
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<QIII")
+_HEAD = struct.Struct("<Q")
+_SLOT_HEADER = struct.Struct("<Qd")
+_ALIGN = 64
+
+
+def _aligned(size: int) -> int:
+    return (size + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class SharedFrameRing:
+    """ Single producer ring of 8-bit single channel frames in shared memory """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        _head, self.slots, self.width, self.height = _HEADER.unpack_from(shm.buf, 0)
+        self.frame_size = self.width * self.height
+
+        self._slot_size = _aligned(_SLOT_HEADER.size + self.frame_size)
+        self._offsets = [_ALIGN + slot * self._slot_size for slot in range(self.slots)]
+        self._views: List[memoryview] = [
+            shm.buf[offset + _SLOT_HEADER.size:offset + _SLOT_HEADER.size + self.frame_size]
+            for offset in self._offsets
+        ]
+
+    @classmethod
+    def create(cls, slots: int, width: int, height: int) -> "SharedFrameRing":
+        """ Create a new ring. The creator unlinks it in close() """
+        if slots < 2:
+            raise ValueError("A frame ring needs at least two slots")
+
+        size = _ALIGN + slots * _aligned(_SLOT_HEADER.size + width * height)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        _HEADER.pack_into(shm.buf, 0, 0, slots, width, height)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedFrameRing":
+        """ Attach to a ring created by another process """
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def head(self) -> int:
+        """ Number of frames published. Frame 'n' (1 based) is in slot (n - 1) % slots """
+        return _HEAD.unpack_from(self._shm.buf, 0)[0]
+
+    def frame_view(self, slot: int) -> memoryview:
+        """ Writable view of a slot's pixels, row-major width * height bytes """
+        return self._views[slot]
+
+    def next_slot(self) -> int:
+        """ Producer only: the slot the next frame is to be written into """
+        return self.head % self.slots
+
+    def publish(self, timestamp: float) -> int:
+        """ Producer only: publish the frame written into next_slot(). Returns its sequence number """
+        buf = self._shm.buf
+        sequence = _HEAD.unpack_from(buf, 0)[0] + 1
+        _SLOT_HEADER.pack_into(buf, self._offsets[(sequence - 1) % self.slots], sequence, timestamp)
+        _HEAD.pack_into(buf, 0, sequence)
+        return sequence
+
+    def latest(self) -> Optional[Tuple[int, float, int]]:
+        """ (sequence, timestamp, slot) of the newest frame, or None if nothing is published yet """
+        head = self.head
+        if head == 0:
+            return None
+
+        slot = (head - 1) % self.slots
+        sequence, timestamp = _SLOT_HEADER.unpack_from(self._shm.buf, self._offsets[slot])
+        if sequence != head:
+            return None     # Overwritten between reading the head and the slot, very unlikely
+        return sequence, timestamp, slot
+
+    def overwritten(self, sequence: int) -> bool:
+        """ True if the producer may have started reusing the slot of frame 'sequence' """
+        return self.head >= sequence + self.slots - 1
+
+    def close(self) -> None:
+        """ Detach, and remove the ring if this process created it. All frame views must be released """
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._shm.close()
+
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
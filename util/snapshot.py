@@ -0,0 +1,78 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Per-loop sensor snapshot.
+#
+#   Every registered sensor is read exactly once per scheduler tick by capture(),
+#   and the values are kept in a preallocated array. For the rest of the tick,
+#   subsystems and commands read that array instead of going back to the HAL, so
+#   everything in a tick sees the same values.
+#
+#   capture() and the readers run on the control loop thread only, or on the
+#   parallel tick workers (util/parallel.py) while the control loop waits on them.
+#
+from array import array
+from typing import Callable, List, Optional
+
+DEFAULT_CAPACITY = 16
+
+Reader = Callable[[], float]
+
+
+class SensorSnapshot:
+    """ One read of every registered sensor, taken at the start of each tick """
+
+    __slots__ = ("values", "timestamp", "captures", "_names", "_readers", "_clock", "_capacity")
+
+    def __init__(self, clock: Optional[Callable[[], float]] = None, capacity: int = DEFAULT_CAPACITY):
+        self.values = array('d', [0.0]) * capacity
+        self.timestamp = 0.0
+        self.captures = 0
+        self._names: List[str] = []
+        self._readers: List[Reader] = []
+        self._clock = clock
+        self._capacity = capacity
+
+    def register(self, name: str, reader: Reader) -> int:
+        """ Add a sensor, returning the channel its value is read from """
+        channel = len(self._readers)
+        if channel >= self._capacity:
+            raise ValueError(f"Sensor snapshot is full ({self._capacity} sensors), unable to add '{name}'")
+
+        self._names.append(name)
+        self._readers.append(reader)
+        return channel
+
+    def capture(self) -> None:
+        """ Read every sensor. Call once at the start of each tick """
+        values = self.values
+        for channel, reader in enumerate(self._readers):
+            values[channel] = reader()
+
+        if self._clock is not None:
+            self.timestamp = self._clock()
+        self.captures += 1
+
+    def refresh(self, channel: int) -> None:
+        """ Read one sensor again, after something (e.g. an encoder reset) changed it mid-tick """
+        self.values[channel] = self._readers[channel]()
+
+    def get(self, channel: int) -> float:
+        return self.values[channel]
+
+    def as_dict(self) -> dict:
+        return {name: self.values[channel] for channel, name in enumerate(self._names)}
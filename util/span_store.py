@@ -0,0 +1,195 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Store-and-forward span export.
+#
+#   FileSpanExporter writes spans to size-capped, rotating local files so that traces
+#   can be captured at competitions where there is no network. It is driven by the
+#   SDK's BatchSpanProcessor, so the control thread only ever appends finished spans to
+#   the processor's queue; encoding and file writes happen on the processor's thread.
+#
+#   Each file starts with FILE_MAGIC followed by records of a 4-byte big-endian length
+#   and a serialized OTLP ExportTraceServiceRequest (one per exported batch).
+#
+#   Replay the files later with:
+#
+#       python -m util.span_store [--endpoint host:4317 | --console] <file-or-directory> ...
+#
+#   This module imports the OpenTelemetry SDK, only import it when tracing is enabled.
+#
+import argparse
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+
+import logging
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+logger = logging.getLogger(__name__)
+
+FILE_MAGIC = b"OTLPSPN1"
+FILE_SUFFIX = ".otlp"
+
+DEFAULT_MAX_FILE_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_FILES = 16
+DEFAULT_WRITE_BUFFER = 256 * 1024
+
+_record_length = struct.Struct(">I")
+
+
+class FileSpanExporter(SpanExporter):
+    """ Appends batches of spans to rotating local files """
+
+    def __init__(self, directory: str, max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+                 max_files: int = DEFAULT_MAX_FILES, prefix: str = "spans"):
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_file_bytes = max_file_bytes
+        self._max_files = max_files
+        self._prefix = prefix
+        self._file = None
+        self._file_bytes = 0
+        self._sequence = 0
+        self._dropped = 0
+
+    @property
+    def dropped(self) -> int:
+        """ Number of span batches that could not be written """
+        return self._dropped
+
+    def _files(self) -> List[Path]:
+        return sorted(self._directory.glob(f"{self._prefix}-*{FILE_SUFFIX}"))
+
+    def _rotate(self) -> None:
+        if self._file:
+            self._file.close()
+
+        # Oldest files go first once the cap on the number of files is reached
+        files = self._files()
+        while len(files) >= self._max_files:
+            files.pop(0).unlink(missing_ok=True)
+
+        self._sequence += 1
+        name = f"{self._prefix}-{time.strftime('%Y%m%d-%H%M%S')}-{self._sequence:04d}{FILE_SUFFIX}"
+        self._file = open(self._directory / name, "ab", buffering=DEFAULT_WRITE_BUFFER)
+        self._file.write(FILE_MAGIC)
+        self._file_bytes = len(FILE_MAGIC)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        try:
+            payload = encode_spans(spans).SerializeToString()
+
+            if self._file is None or self._file_bytes + len(payload) > self._max_file_bytes:
+                self._rotate()
+
+            self._file.write(_record_length.pack(len(payload)))
+            self._file.write(payload)
+            self._file_bytes += _record_length.size + len(payload)
+            return SpanExportResult.SUCCESS
+
+        except Exception as e:
+            self._dropped += 1
+            logger.warning(f"OpenTelemetry: Failed to store {len(spans)} spans: {e}")
+            return SpanExportResult.FAILURE
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        if self._file:
+            self._file.flush()
+        return True
+
+    def shutdown(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def read_span_file(path: Path) -> Iterator[ExportTraceServiceRequest]:
+    """ Yield each stored batch. A truncated final record (power loss) is ignored """
+    with open(path, "rb") as f:
+        if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+            raise ValueError(f"{path} is not a stored span file")
+
+        while header := f.read(_record_length.size):
+            if len(header) < _record_length.size:
+                break
+            (length,) = _record_length.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                break
+            yield ExportTraceServiceRequest.FromString(payload)
+
+
+def span_files(paths: Sequence[str]) -> List[Path]:
+    """ Expand files and directories into the list of span files, oldest first """
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob(f"*{FILE_SUFFIX}")) if path.is_dir() else [path])
+    return files
+
+
+def replay(paths: Sequence[str], endpoint: Optional[str] = None, insecure: bool = True) -> int:
+    """
+    Send stored spans to an OTLP/gRPC endpoint, or print them as JSON if no endpoint is
+    given (a local stand-in collector). Returns the number of batches replayed.
+    """
+    if endpoint:
+        import grpc
+        from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import TraceServiceStub
+
+        target = endpoint.split("://", 1)[-1]
+        channel = grpc.insecure_channel(target) if insecure else grpc.secure_channel(target, grpc.ssl_channel_credentials())
+        stub = TraceServiceStub(channel)
+        send = stub.Export
+    else:
+        from google.protobuf.json_format import MessageToJson
+
+        def send(request: ExportTraceServiceRequest) -> None:
+            print(MessageToJson(request))
+
+    batches = 0
+    for path in span_files(paths):
+        for request in read_span_file(path):
+            send(request)
+            batches += 1
+
+    return batches
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay stored OpenTelemetry span files",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="Span files or directories of span files")
+    parser.add_argument("--endpoint", default=os.environ.get("OTEL_OLTP_ENDPOINT"),
+                        help="OTLP/gRPC collector 'hostname:port'")
+    parser.add_argument("--console", action="store_true",
+                        help="Print the spans as JSON instead of sending them to a collector")
+    parser.add_argument("--secure", action="store_true", help="Use TLS to connect to the collector")
+    args = parser.parse_args(argv)
+
+    batches = replay(args.paths, endpoint=None if args.console else args.endpoint, insecure=not args.secure)
+    print(f"Replayed {batches} span batches", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Boot-time accounting.
+#
+#   Import this module before anything else so that the timer starts as early as
+#   possible, then mark or wrap each startup phase. The report breaks the time to a
+#   running robot into its phases so that slow restarts (brownout, code deploy) can
+#   be tracked down.
+#
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Tuple
+
+
+class StartupTimer:
+    """ Records the duration of each named startup phase """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._last = self._start
+        self._phases: List[Tuple[str, float]] = []
+
+    @property
+    def phases(self) -> List[Tuple[str, float]]:
+        return list(self._phases)
+
+    def mark(self, name: str) -> None:
+        """ Record the time since the previous mark (or timer creation) as phase 'name' """
+        now = time.perf_counter()
+        self._phases.append((name, now - self._last))
+        self._last = now
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """ Record the time spent inside the 'with' block as phase 'name' """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._last = time.perf_counter()
+            self._phases.append((name, self._last - start))
+
+    def total(self) -> float:
+        return time.perf_counter() - self._start
+
+    def report(self, output: Callable[[str], None] = print) -> None:
+        output(f"START: Boot time {self.total() * 1000.0:.1f} mS")
+        for name, elapsed in self._phases:
+            output(f"       {name:<32} {elapsed * 1000.0:>9.1f} mS")
+
+
+startup_timer = StartupTimer()
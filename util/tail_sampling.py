@@ -0,0 +1,137 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Tail sampling of scheduler ticks.
+#
+#   Every span is recorded, but spans are held in memory per trace until the trace's
+#   local root span ends: one with no parent, or whose parent is in another process.
+#   A trace whose root is a scheduler tick is only handed on to the exporting
+#   processor if the tick overran its budget, ended in error, or was slower than the
+#   configured percentile of recent ticks. Other traces are passed through.
+#
+#   This module imports the OpenTelemetry SDK, only import it when tracing is enabled.
+#
+import threading
+from array import array
+from collections import OrderedDict
+from typing import List, Optional
+
+import logging
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.trace import StatusCode
+
+logger = logging.getLogger(__name__)
+
+TICK_SPAN_NAME = "robotPeriodic"
+
+DEFAULT_BUDGET = 0.020          # Seconds
+DEFAULT_PERCENTILE = 99.0
+DEFAULT_WINDOW = 512            # Recent ticks used for the latency percentile
+DEFAULT_MAX_TRACES = 64         # Traces buffered while waiting on their root span
+DEFAULT_MAX_SPANS = 1024        # Spans buffered per trace
+RECOMPUTE_EVERY = 64            # Ticks between percentile threshold updates
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """ Buffers each tick's spans and forwards only the interesting ticks to 'downstream' """
+
+    def __init__(self, downstream: SpanProcessor, budget: float = DEFAULT_BUDGET,
+                 percentile: float = DEFAULT_PERCENTILE, window: int = DEFAULT_WINDOW,
+                 max_traces: int = DEFAULT_MAX_TRACES, max_spans: int = DEFAULT_MAX_SPANS,
+                 tick_name: str = TICK_SPAN_NAME):
+        self._downstream = downstream
+        self._budget_ns = int(budget * 1e9)
+        self._percentile = percentile
+        self._max_traces = max_traces
+        self._max_spans = max_spans
+        self._tick_name = tick_name
+        self._lock = threading.Lock()
+        self._traces: "OrderedDict[int, List[ReadableSpan]]" = OrderedDict()
+
+        # Recent tick durations and the current 'slow' threshold derived from them
+        self._window = window
+        self._durations = array('q', [0]) * window
+        self._ticks = 0
+        self._threshold_ns = self._budget_ns
+
+        # Statistics
+        self.kept = 0
+        self.dropped = 0
+        self.evicted = 0
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        pass
+
+    def on_end(self, span: ReadableSpan) -> None:
+        trace_id = span.context.trace_id
+
+        with self._lock:
+            spans = self._traces.get(trace_id)
+            if spans is None:
+                spans = self._traces[trace_id] = []
+                if len(self._traces) > self._max_traces:
+                    # Root never ended (or is very long lived), give up on the oldest trace
+                    self._traces.popitem(last=False)
+                    self.evicted += 1
+
+            if len(spans) < self._max_spans:
+                spans.append(span)
+
+            if span.parent is not None and not span.parent.is_remote:
+                return
+
+            # Local root span ended (its parent, if any, is in another process), the whole
+            # trace as seen by this process is now available
+            del self._traces[trace_id]
+            keep = span.name != self._tick_name or self._keep_tick(span, spans)
+
+        if keep:
+            for buffered in spans:
+                self._downstream.on_end(buffered)
+
+    def _keep_tick(self, root: ReadableSpan, spans: List[ReadableSpan]) -> bool:
+        duration = root.end_time - root.start_time
+
+        self._durations[self._ticks % self._window] = duration
+        self._ticks += 1
+        if self._ticks % RECOMPUTE_EVERY == 0:
+            held = sorted(self._durations[:min(self._ticks, self._window)])
+            self._threshold_ns = held[int(self._percentile / 100.0 * (len(held) - 1))]
+
+        keep = (duration > self._budget_ns or
+                (self._ticks >= RECOMPUTE_EVERY and duration >= self._threshold_ns) or
+                any(self._failed(s) for s in spans))
+
+        if keep:
+            self.kept += 1
+        else:
+            self.dropped += 1
+        return keep
+
+    @staticmethod
+    def _failed(span: ReadableSpan) -> bool:
+        return (span.status.status_code == StatusCode.ERROR or
+                any(event.name == "exception" for event in span.events))
+
+    def shutdown(self) -> None:
+        logger.info(f"OpenTelemetry: Tail sampling kept {self.kept} ticks, dropped {self.dropped}, "
+                    f"evicted {self.evicted} incomplete traces")
+        self._downstream.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._downstream.force_flush(timeout_millis)
@@ -17,6 +17,7 @@
 
 import json
 import logging
+import struct
 from typing import Union, Optional, Sequence, Dict, Tuple, Any
 
 logger = logging.getLogger(__name__)
@@ -54,24 +55,58 @@ def tracing_enabled() -> bool:
     return _global_tracer is not None
 
 
-from opentelemetry import trace, context
-from opentelemetry.context import get_current as otel_get_current_context
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.sdk.resources import SERVICE_NAME, Resource
-from opentelemetry.sdk.trace import Tracer, TracerProvider
-from opentelemetry.sdk.trace.export import (
-    BatchSpanProcessor,
-)
-from opentelemetry.sdk.trace.sampling import ParentBasedTraceIdRatio, ALWAYS_ON
-from opentelemetry.trace.propagation import set_span_in_context as otel_set_span_in_context
-from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+# The OpenTelemetry API/SDK, gRPC exporter and propagators are only imported by
+# telemetry_init(). A robot running without tracing never pays to load them (or
+# grpc/protobuf), and every helper below is a no-op until tracing is initialized.
+trace = None
+context = None
+otel_get_current_context = None
+otel_set_span_in_context = None
+TraceContextTextMapPropagator = None
+_propagator = None
 
+FILE_EXPORTER_PREFIX = "file:"
 
-def telemetry_init(exporter: str, sample_rate: Optional[float] = 1.0) -> None:
+# Binary W3C traceparent: version, trace-id (as high/low 64 bits), parent span-id, trace-flags
+_binary_traceparent = struct.Struct(">BQQQB")
+TRACEPARENT_SIZE = _binary_traceparent.size    # 26 bytes
+_TRACEPARENT_VERSION = 0
+_UINT64_MASK = (1 << 64) - 1
+
+
+def telemetry_init(exporter: str, sample_rate: Optional[float] = 1.0, service_name: str = "cyberjagzz",
+                   tail_percentile: Optional[float] = 0.0, tick_budget: Optional[float] = 0.020) -> None:
+    """
+    Initialize tracing. 'exporter' is either the OTLP/gRPC collector endpoint or
+    'file:<directory>' to store spans locally for later replay.
+
+    A non-zero 'tail_percentile' enables tail sampling: every span is recorded, but a
+    scheduler tick's spans are only exported if the tick took longer than 'tick_budget'
+    seconds, failed, or was slower than that percentile of recent ticks.
+    """
+    global trace, context, otel_get_current_context, otel_set_span_in_context, TraceContextTextMapPropagator
+    global _propagator
     try:
+        from opentelemetry import trace, context
+        from opentelemetry.context import get_current as otel_get_current_context
+        from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+        )
+        from opentelemetry.sdk.trace.sampling import ParentBasedTraceIdRatio, ALWAYS_ON
+        from opentelemetry.trace.propagation import set_span_in_context as otel_set_span_in_context
+        from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+
+        _propagator = TraceContextTextMapPropagator()
+
         # Setup tracing
 
-        if 0.0 < sample_rate < 1.0:
+        if tail_percentile:
+            # The decision is made once the tick is over, so everything has to be recorded
+            sampler = ALWAYS_ON
+
+        elif 0.0 < sample_rate < 1.0:
             # Sampler that respects its parent span's sampling decision, but otherwise samples
             # probabilistically based on `rate`.
             sampler = ParentBasedTraceIdRatio(sample_rate)
@@ -81,7 +116,7 @@ def telemetry_init(exporter: str, sample_rate: Optional[float] = 1.0) -> None:
 
         logger.info(f"penTelemetry: Attempting to connect to OLTP exporter at {exporter}")
 
-        provider = TracerProvider(resource=Resource.create({SERVICE_NAME: "tibit-ponauto"}),
+        provider = TracerProvider(resource=Resource.create({SERVICE_NAME: service_name}),
                                   sampler=sampler)
         trace.set_tracer_provider(provider)
 
@@ -89,11 +124,27 @@ def telemetry_init(exporter: str, sample_rate: Optional[float] = 1.0) -> None:
         _global_tracer = trace.get_tracer(__name__)
         logger.info(f"OpenTelemetry: Global tracer initialized. Sample Rate: {(sample_rate * 100):.1f}%")
 
-        oltp_exporter = OTLPSpanExporter(endpoint=exporter)
-        span_processor = BatchSpanProcessor(oltp_exporter)
+        if exporter.startswith(FILE_EXPORTER_PREFIX):
+            # Store-and-forward to local files, replayed later with 'python -m util.span_store'
+            from util.span_store import FileSpanExporter
+            span_exporter = FileSpanExporter(exporter[len(FILE_EXPORTER_PREFIX):])
+        else:
+            # gRPC (and its exporter) is only loaded when spans go over the network
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+            span_exporter = OTLPSpanExporter(endpoint=exporter)
+
+        span_processor = BatchSpanProcessor(span_exporter)
+
+        if tail_percentile:
+            from util.tail_sampling import TailSamplingSpanProcessor
+            span_processor = TailSamplingSpanProcessor(span_processor, budget=tick_budget,
+                                                       percentile=tail_percentile)
+            logger.info(f"OpenTelemetry: Tail sampling ticks over {tick_budget * 1000:.1f} mS "
+                        f"or the {tail_percentile:.1f} percentile")
+
         trace.get_tracer_provider().add_span_processor(span_processor)
 
-        logger.info("OpenTelemetry: OLTP exporter and span processing enabled successfully")
+        logger.info(f"OpenTelemetry: {type(span_exporter).__name__} and span processing enabled successfully")
 
         #
         # Save off a ROOT context that can be used to guarantee we start a new trace when required
@@ -127,24 +178,57 @@ def add_trace_event(name: str,
             span.add_event(name, attributes=attributes, timestamp=timestamp)
 
 
+def encode_span_context(span: Optional['trace_api.Span'] = None) -> bytes:
+    """
+    Encode the span's (default: current span's) context as a fixed-size, 26 byte
+    binary traceparent. Returns b"" if tracing is disabled or there is no valid span.
+
+    Work handed to another thread in this process (RobotService.submit(), the
+    util.asyncio helpers, ...) already carries the caller's context with it, this
+    is for messages that leave the process or are queued as plain data.
+    """
+    if not _global_tracer:
+        return b""
+
+    span_context = (span or trace.get_current_span()).get_span_context()
+    if not span_context.is_valid:
+        return b""
+
+    trace_id = span_context.trace_id
+    return _binary_traceparent.pack(_TRACEPARENT_VERSION, trace_id >> 64, trace_id & _UINT64_MASK,
+                                    span_context.span_id, span_context.trace_flags)
+
+
+def decode_span_context(data: bytes) -> Optional['Context']:
+    """ Context with the remote parent span from an encode_span_context() traceparent """
+    if not _global_tracer or len(data) != TRACEPARENT_SIZE:
+        return None
+
+    version, trace_id_high, trace_id_low, span_id, flags = _binary_traceparent.unpack(data)
+    if version != _TRACEPARENT_VERSION:
+        return None
+
+    span_context = trace.SpanContext(trace_id=(trace_id_high << 64) | trace_id_low, span_id=span_id,
+                                     is_remote=True, trace_flags=trace.TraceFlags(flags))
+    return otel_set_span_in_context(trace.NonRecordingSpan(span_context))
+
+
 def extract_span_context(span: 'trace_api.Span') -> Tuple[Dict[str, Any], bytes]:
     """
     Helper function to extract the current trace context and provide it as
-    a dictionary and a binary string that can be attached to a message and sent
-    to another thread/process.
+    a dictionary (W3C 'traceparent' header) and a binary traceparent that can be
+    attached to a message and sent to another thread/process.
 
     Actual attachment of the context to the message and the extraction is up
     to the caller
     """
-    if span and _global_tracer:
-        context = otel_set_span_in_context(span)
-        carrier = {}
-        TraceContextTextMapPropagator().inject(carrier, context=context)
-        header = {"traceparent": carrier["traceparent"]}
-        trace_context = bytes(json.dumps(header, separators=(",", ":")), "utf-8")
+    trace_context = encode_span_context(span) if span else b""
+    if trace_context:
+        span_context = span.get_span_context()
+        header = {"traceparent": f"00-{span_context.trace_id:032x}-{span_context.span_id:016x}-"
+                                 f"{span_context.trace_flags:02x}"}
     else:
         header = {}
-        trace_context = b""
 
     return header, trace_context
 
@@ -161,13 +245,17 @@ def restore_span_context(otel_context):
 
     if isinstance(otel_context, dict):
         carrier = otel_context
-    elif isinstance(otel_context, bytes):
-        carrier = json.loads(otel_context.decode("utf-8"))
+    elif isinstance(otel_context, (bytes, bytearray, memoryview)):
+        if len(otel_context) == TRACEPARENT_SIZE:
+            return decode_span_context(bytes(otel_context))
+
+        # Older JSON encoded header
+        carrier = json.loads(bytes(otel_context).decode("utf-8")) if otel_context else None
     else:
         # Allows it to be called with 'None' and start up a brand new trace span
         carrier = None
 
-    return TraceContextTextMapPropagator().extract(carrier) if carrier else None
+    return _propagator.extract(carrier) if carrier else None
 
 
 def get_current_span() -> 'trace_api.Span':
@@ -0,0 +1,131 @@
+# ------------------------------------------------------------------------ #
+#      o-o      o                o                                         #
+#     /         |                |                                         #
+#    O     o  o O-o  o-o o-o     |  oo o--o o-o o-o                        #
+#     \    |  | |  | |-' |   \   o | | |  |  /   /                         #
+#      o-o o--O o-o  o-o o    o-o  o-o-o--O o-o o-o                        #
+#             |                           |                                #
+#          o--o                        o--o                                #
+#                        o--o      o         o                             #
+#                        |   |     |         |  o                          #
+#                        O-Oo  o-o O-o  o-o -o-    o-o o-o                 #
+#                        |  \  | | |  | | |  |  | |     \                  #
+#                        o   o o-o o-o  o-o  o  |  o-o o-o                 #
+#                                                                          #
+#    Jemison High School - Huntsville Alabama                              #
+# ------------------------------------------------------------------------ #
+#
+# Named pool of worker threads.
+#
+#   The roboRIO has two cores. Worker threads (and the control thread) are kept
+#   in one named pool so each can be given its own CPU affinity and priority,
+#   moving background work such as logging, telemetry export and vision off the
+#   core that runs the CommandScheduler. CPU time used by each thread is
+#   accounted for so the split can be checked on the robot.
+#
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import logging
+from util.worker_thread import AsyncioWorkerThread, ThreadSettings, apply_thread_settings, thread_cpu_time
+
+logger = logging.getLogger(__name__)
+
+_worker_pool: Union['WorkerPool', None] = None
+
+
+def worker_pool() -> Union['WorkerPool', None]:
+    return _worker_pool
+
+
+def worker_pool_init() -> 'WorkerPool':
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = WorkerPool()
+    return _worker_pool
+
+
+class WorkerPool:
+    """ Threads by name, with affinity/priority settings and CPU-time accounting """
+
+    def __init__(self):
+        self._threads: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+        self._original_cpus: Optional[Tuple[int, ...]] = None
+
+    def __iter__(self) -> Iterator[threading.Thread]:
+        with self._lock:
+            return iter(list(self._threads.values()))
+
+    def __len__(self) -> int:
+        return len(self._threads)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._threads)
+
+    def get(self, name: str) -> Optional[threading.Thread]:
+        return self._threads.get(name)
+
+    def add(self, thread: threading.Thread, name: Optional[str] = None) -> threading.Thread:
+        """ Track an existing thread. Asyncio workers apply their own settings when started """
+        name = name or thread.name
+        with self._lock:
+            if name in self._threads and self._threads[name] is not thread:
+                raise ValueError(f"Worker '{name}' is already in the pool")
+            self._threads[name] = thread
+        return thread
+
+    def create(self, name: str, settings: Optional[ThreadSettings] = None,
+               debug: Optional[bool] = False) -> AsyncioWorkerThread:
+        """ Start a new, general purpose, asyncio worker thread """
+        worker = AsyncioWorkerThread(name, debug=debug, settings=settings)
+        self.add(worker)
+        worker.start()
+        return worker
+
+    def pin_startup(self, cpus: Optional[Tuple[int, ...]]) -> None:
+        """
+        Run the calling thread on 'cpus' while it starts everything else up, remembering its
+        original CPUs so that pin_current() can return it to them.
+        """
+        if cpus is None:
+            return
+        try:
+            self._original_cpus = tuple(sorted(os.sched_getaffinity(0)))
+        except (AttributeError, OSError):
+            self._original_cpus = None
+        apply_thread_settings(ThreadSettings(cpus=cpus), "Robot startup")
+
+    def pin_current(self, name: str, settings: Optional[ThreadSettings]) -> threading.Thread:
+        """
+        Apply settings to the calling thread (such as the control loop) and track it. Without
+        CPUs of its own, a thread moved by pin_startup() goes back to its original CPUs.
+        """
+        settings = settings or ThreadSettings()
+        if settings.cpus is None and self._original_cpus is not None:
+            settings = settings._replace(cpus=self._original_cpus)
+        self._original_cpus = None
+        apply_thread_settings(settings, name)
+        return self.add(threading.current_thread(), name)
+
+    def cpu_times(self) -> Dict[str, float]:
+        """ CPU seconds used by each live thread in the pool """
+        times = {}
+        for name, thread in list(self._threads.items()):
+            used = thread_cpu_time(thread)
+            if used is not None:
+                times[name] = used
+        return times
+
+    def report(self) -> str:
+        times = self.cpu_times()
+        total = sum(times.values()) or 1.0
+        return ", ".join(f"{name}: {used:.3f}s ({100.0 * used / total:.1f}%)" for name, used in times.items())
+
+    def stop(self, timeout: Optional[Union[int, float]] = 1) -> None:
+        """ Stop every asyncio worker in the pool """
+        for thread in self:
+            if isinstance(thread, AsyncioWorkerThread) and thread.is_alive():
+                thread.stop(timeout=timeout)
@@ -17,21 +17,101 @@
 
 import asyncio
 import logging
+import os
 import threading
-from typing import Optional, Union
+import time
+from typing import NamedTuple, Optional, Tuple, Union
+
+from util.asyncio import new_event_loop
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_SHUTDOWN_DELAY = 0.1
 
 
+class ThreadSettings(NamedTuple):
+    """ CPU affinity and scheduling priority for a thread. None leaves the OS default """
+    cpus: Optional[Tuple[int, ...]] = None      # CPUs the thread may run on
+    nice: Optional[int] = None                  # Nice value (-20..19) under normal scheduling
+    realtime: Optional[int] = None              # SCHED_FIFO priority (1..99), overrides nice
+
+
+def parse_cpus(spec: Optional[str]) -> Optional[Tuple[int, ...]]:
+    """
+    CPU list such as '1' or '0,2-3' into a tuple of CPU numbers. Empty means no affinity.
+    Raises ValueError if the list is not valid.
+    """
+    if not spec:
+        return None
+
+    cpus = set()
+    for part in spec.split(","):
+        first, dash, last = part.strip().partition("-")
+        first, last = int(first), int(last if dash else first)
+        if first < 0 or last < first:
+            raise ValueError(f"'{part.strip()}' is not a CPU number or range")
+        cpus.update(range(first, last + 1))
+    return tuple(sorted(cpus))
+
+
+def apply_thread_settings(settings: Optional[ThreadSettings], name: Optional[str] = None) -> None:
+    """
+    Apply affinity and priority to the calling thread.
+
+    On Linux these calls act on a single thread, not the whole process. Threads started
+    afterward by this thread inherit its affinity. Platforms (or users) that do not support
+    a setting log a warning and continue with the OS default.
+    """
+    if settings is None:
+        return
+
+    name = name or threading.current_thread().name
+
+    if settings.cpus is not None:
+        try:
+            os.sched_setaffinity(0, settings.cpus)
+            logger.info(f"{name}: pinned to CPUs {sorted(os.sched_getaffinity(0))}")
+
+        except (AttributeError, OSError, ValueError) as e:
+            logger.warning(f"{name}: unable to set CPU affinity {settings.cpus}: {e}")
+
+    if settings.realtime:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(settings.realtime))
+            logger.info(f"{name}: SCHED_FIFO priority {settings.realtime}")
+
+        except (AttributeError, OSError) as e:
+            logger.warning(f"{name}: unable to set real-time priority {settings.realtime}: {e}")
+
+    elif settings.nice is not None:
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), settings.nice)
+            logger.info(f"{name}: nice {settings.nice}")
+
+        except (AttributeError, OSError) as e:
+            logger.warning(f"{name}: unable to set nice value {settings.nice}: {e}")
+
+
+def thread_cpu_time(thread: threading.Thread) -> Optional[float]:
+    """ CPU seconds consumed so far by a running thread, or None if unavailable """
+    if not thread.is_alive() or thread.ident is None:
+        return None
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread.ident))
+
+    except (AttributeError, OSError):
+        return time.thread_time() if thread is threading.current_thread() else None
+
+
 class AsyncioWorkerThread(threading.Thread):
     """ Asyncio capable worker threads """
 
-    def __init__(self, name: str, shutdown_delay: float = DEFAULT_SHUTDOWN_DELAY, debug: Optional[bool] = False):
+    def __init__(self, name: str, shutdown_delay: float = DEFAULT_SHUTDOWN_DELAY, debug: Optional[bool] = False,
+                 settings: Optional[ThreadSettings] = None):
         super().__init__(name=name)
         self._log_prefix = f"AsyncWorker {name}"
         self._debug = debug
+        self._settings = settings
 
         # Event loop, shutdown, async_lock, and thread_id is set at start of main thread loop
         self._event_loop = None
@@ -39,6 +119,7 @@ class AsyncioWorkerThread(threading.Thread):
         self._shutdown_delay = shutdown_delay
         self._thread_id = None
         self._async_lock = None
+        self._ready = threading.Event()
 
     def __str__(self):
         return self.name
@@ -47,6 +128,15 @@ class AsyncioWorkerThread(threading.Thread):
     def debug(self):
         return self._debug
 
+    @property
+    def settings(self) -> Optional[ThreadSettings]:
+        """ Affinity and priority applied when the thread starts """
+        return self._settings
+
+    def cpu_time(self) -> Optional[float]:
+        """ CPU seconds this worker thread has used """
+        return thread_cpu_time(self)
+
     def _check_thread(self):
         """
         Check that the current thread is the thread running the event loop.
@@ -80,6 +170,14 @@ class AsyncioWorkerThread(threading.Thread):
             raise RuntimeError(f"{self.name}: Shutdown Event is not available")
         return self._shutdown
 
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the event loop is set and on_run() has completed (or the thread has
+        exited). Returns True if the worker is running.
+        """
+        self._ready.wait(timeout)
+        return self._event_loop is not None and self.is_running
+
     @property
     def is_running(self):
         return self.is_alive() and not self._shutdown.is_set()
@@ -121,10 +219,11 @@ class AsyncioWorkerThread(threading.Thread):
         canceling any remaining tasks.
         """
         self._thread_id = threading.get_ident()
+        apply_thread_settings(self._settings, self.name)
 
         # Set the event loop
         logger.info(f"START: {self.name}: Starting worker thread main loop. Thread ID: {self._thread_id:08x}")
-        loop = asyncio.new_event_loop()
+        loop = new_event_loop()
         asyncio.set_event_loop(loop)
 
         self._shutdown = asyncio.Event()
@@ -139,6 +238,7 @@ class AsyncioWorkerThread(threading.Thread):
             # Any extra work to do before we wait for the end
             if not await self.on_run():
                 self._shutdown.set()
+            self._ready.set()
 
             # Wait until shutdown is signalled
             await self._shutdown.wait()
@@ -174,4 +274,5 @@ class AsyncioWorkerThread(threading.Thread):
 
         finally:
             self._shutdown.set()
+            self._ready.set()       # Never leave anyone waiting on a thread that has exited
             logger.info(f"DONE : {self.name}: Worker thread done")